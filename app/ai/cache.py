@@ -0,0 +1,249 @@
+"""
+Suggestion Cache: Content-addressed cache in front of AISuggester.suggest.
+
+Repeated dictation (recurring reminders, re-sent messages) would otherwise
+cost one paid provider call per repeat. Keys hash the PII-redacted input
+together with the prompt version, provider and model, so a prompt or model
+change never serves a stale answer.
+
+Auditability is unchanged: a cached suggestion flows through the worker's
+normal persistence path, which writes an ai_suggestions evidence row
+(tagged with the same input_hash) for every suggestion it uses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from app.ai.contract import AISuggestion, suggestion_to_dict, validate_suggestion
+from app.ai.prompts import CURRENT_PROMPT_VERSION
+from app.ai.protocol import AISuggester
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime of a cached suggestion (seconds)
+DEFAULT_TTL = 24 * 3600
+
+
+def cache_key(
+    text: str, provider: str, model: str, prompt_version: str = CURRENT_PROMPT_VERSION
+) -> str:
+    """Content address for a suggestion request.
+
+    Args:
+        text: PII-redacted input text (exactly what is sent to the provider)
+        provider: Provider name (e.g., 'openai')
+        model: Model name (e.g., 'gpt-4o-mini')
+        prompt_version: Prompt template version
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = "\x1f".join((prompt_version, provider, model, text))
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class SuggestionCacheBackend(Protocol):
+    """Storage for cached suggestions, keyed by cache_key()."""
+
+    def get(self, key: str) -> dict | None: ...
+
+    def set(self, key: str, value: dict) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: int = DEFAULT_TTL) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisCacheBackend:
+    """Redis cache shared by every worker process; entries expire via SET EX."""
+
+    KEY_PREFIX = "lifeos:ai_cache:"
+
+    def __init__(self, client=None, ttl: int = DEFAULT_TTL) -> None:
+        if client is None:
+            from app.core.queue import redis_client as client
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key: str) -> dict | None:
+        data = self.client.get(self.KEY_PREFIX + key)
+        return json.loads(data) if data else None
+
+    def set(self, key: str, value: dict) -> None:
+        self.client.set(self.KEY_PREFIX + key, json.dumps(value), ex=self.ttl)
+
+
+class DatabaseCacheBackend:
+    """Reuse the most recent matching row in the ai_suggestions evidence table.
+
+    Writes are no-ops: the worker already stores each suggestion with its
+    input_hash, which is what this backend looks up.
+    """
+
+    def __init__(self, session_factory=None, ttl: int = DEFAULT_TTL) -> None:
+        if session_factory is None:
+            from app.core.db import SessionLocal as session_factory
+        self.session_factory = session_factory
+        self.ttl = ttl
+
+    def get(self, key: str) -> dict | None:
+        from app.models.ai_suggestion import AISuggestion as AISuggestionModel
+
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(AISuggestionModel.suggestion_json)
+                .filter(
+                    AISuggestionModel.input_hash == key,
+                    AISuggestionModel.created_at >= datetime.utcnow() - timedelta(seconds=self.ttl),
+                )
+                .order_by(AISuggestionModel.created_at.desc())
+                .first()
+            )
+            return dict(row[0]) if row else None
+        finally:
+            db.close()
+
+    def set(self, key: str, value: dict) -> None:
+        pass
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one CachedSuggester."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    errors: int = 0
+
+
+class CachedSuggester:
+    """AISuggester wrapper that consults a cache before calling the provider.
+
+    Cache failures never break suggestion: a backend error counts as a miss
+    and the wrapped provider is called as usual.
+    """
+
+    def __init__(
+        self, suggester: AISuggester, backend: SuggestionCacheBackend, bypass: bool = False
+    ) -> None:
+        self.suggester = suggester
+        self.provider_name = suggester.provider_name
+        self.model_name = suggester.model_name
+        self.backend = backend
+        self.bypass = bypass
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def suggest(self, text: str) -> AISuggestion | None:
+        """Return a cached suggestion for identical input, else ask the provider.
+
+        Args:
+            text: Input text (already PII-redacted)
+
+        Returns:
+            AISuggestion if successful, None on failure
+        """
+        if self.bypass:
+            self._count("bypassed")
+            return self.suggester.suggest(text)
+
+        key = cache_key(text, self.provider_name, self.model_name)
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"AI cache lookup failed: {e}")
+            self._count("errors")
+            cached = None
+
+        if cached is not None:
+            # Cached data passes the same contract check as fresh provider output
+            suggestion = validate_suggestion(cached)
+            if suggestion:
+                self._count("hits")
+                logger.info(f"AI cache hit: {suggestion.title}")
+                return suggestion
+
+        self._count("misses")
+        suggestion = self.suggester.suggest(text)
+        if suggestion:
+            try:
+                self.backend.set(key, suggestion_to_dict(suggestion))
+            except Exception as e:
+                logger.warning(f"AI cache store failed: {e}")
+                self._count("errors")
+        return suggestion
+
+
+def wrap_with_cache(suggester: AISuggester) -> AISuggester:
+    """Wrap a suggester with the cache configured in the environment.
+
+    Environment Variables:
+        - AI_CACHE_BACKEND: 'memory' | 'redis' | 'db' | 'none' (default: 'memory')
+        - AI_CACHE_TTL: Entry lifetime in seconds (default: 86400)
+        - AI_CACHE_MAX_ENTRIES: Memory backend capacity (default: 1024)
+        - AI_CACHE_BYPASS: 'true' to always call the provider (default: 'false')
+
+    Returns:
+        CachedSuggester, or the suggester unchanged if caching is disabled
+    """
+    backend_name = os.getenv("AI_CACHE_BACKEND", "memory").lower()
+    ttl = int(os.getenv("AI_CACHE_TTL", str(DEFAULT_TTL)))
+    bypass = os.getenv("AI_CACHE_BYPASS", "false").lower() in ("1", "true", "yes")
+
+    backend: SuggestionCacheBackend
+    if backend_name == "none":
+        return suggester
+    elif backend_name == "memory":
+        max_entries = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1024"))
+        backend = MemoryCacheBackend(max_entries=max_entries, ttl=ttl)
+    elif backend_name == "redis":
+        backend = RedisCacheBackend(ttl=ttl)
+    elif backend_name == "db":
+        backend = DatabaseCacheBackend(ttl=ttl)
+    else:
+        logger.warning(
+            f"Unknown AI cache backend: {backend_name}. Valid options: memory, redis, db, none"
+        )
+        return suggester
+
+    logger.info(f"AI suggestion cache enabled (backend: {backend_name}, ttl: {ttl}s)")
+    return CachedSuggester(suggester, backend, bypass=bypass)
@@ -7,11 +7,19 @@ Handles missing dependencies and configuration gracefully.
 
 import logging
 import os
+import threading
+from typing import Literal, overload
 
-from app.ai.protocol import AISuggester
+from app.ai.cache import wrap_with_cache
+from app.ai.protocol import AISuggester, AsyncAISuggester
 
 logger = logging.getLogger(__name__)
 
+# Process-wide suggester shared by worker threads (see get_shared_suggester)
+_shared_lock = threading.Lock()
+_shared_suggester: AISuggester | None = None
+_shared_loaded = False
+
 
 def get_suggester() -> AISuggester | None:
     """Get AI suggester based on environment config.
@@ -27,9 +35,10 @@ def get_suggester() -> AISuggester | None:
         - AI_MODEL: Model name (provider-specific defaults)
         - OPENAI_API_KEY: Required if provider=openai
         - ANTHROPIC_API_KEY: Required if provider=anthropic
+        - AI_CACHE_BACKEND: Suggestion cache, see app.ai.cache.wrap_with_cache
 
     Returns:
-        AISuggester instance or None
+        AISuggester instance (wrapped in CachedSuggester unless caching is off) or None
 
     Examples:
         >>> # AI disabled
@@ -41,6 +50,34 @@ def get_suggester() -> AISuggester | None:
         >>> os.environ['OPENAI_API_KEY'] = 'sk-...'
         >>> suggester = get_suggester()  # Returns OpenAISuggester
     """
+    suggester = _create_suggester(use_async=False)
+    if suggester is None:
+        return None
+    return wrap_with_cache(suggester)
+
+
+def get_async_suggester() -> AsyncAISuggester | None:
+    """Get asyncio-native AI suggester based on environment config.
+
+    Same selection rules and environment variables as get_suggester(), but
+    returns AsyncOpenAISuggester / AsyncClaudeSuggester, whose `suggest` is
+    a coroutine backed by openai.AsyncOpenAI / anthropic.AsyncAnthropic.
+
+    Returns:
+        AsyncAISuggester instance or None
+    """
+    return _create_suggester(use_async=True)
+
+
+@overload
+def _create_suggester(use_async: Literal[False]) -> AISuggester | None: ...
+
+
+@overload
+def _create_suggester(use_async: Literal[True]) -> AsyncAISuggester | None: ...
+
+
+def _create_suggester(use_async: bool) -> AISuggester | AsyncAISuggester | None:
     provider = os.getenv("AI_PROVIDER", "none").lower()
 
     if provider == "none":
@@ -48,20 +85,29 @@ def get_suggester() -> AISuggester | None:
         return None
 
     try:
-        suggester: AISuggester
+        suggester: AISuggester | AsyncAISuggester
+        kind = "async " if use_async else ""
 
         if provider == "openai":
-            from app.ai.providers.openai_suggester import OpenAISuggester
+            from app.ai.providers import openai_suggester
 
-            suggester = OpenAISuggester()
-            logger.info(f"Initialized OpenAI suggester (model: {suggester.model_name})")
+            suggester = (
+                openai_suggester.AsyncOpenAISuggester()
+                if use_async
+                else openai_suggester.OpenAISuggester()
+            )
+            logger.info(f"Initialized {kind}OpenAI suggester (model: {suggester.model_name})")
             return suggester
 
         elif provider == "anthropic":
-            from app.ai.providers.claude_suggester import ClaudeSuggester
+            from app.ai.providers import claude_suggester
 
-            suggester = ClaudeSuggester()
-            logger.info(f"Initialized Claude suggester (model: {suggester.model_name})")
+            suggester = (
+                claude_suggester.AsyncClaudeSuggester()
+                if use_async
+                else claude_suggester.ClaudeSuggester()
+            )
+            logger.info(f"Initialized {kind}Claude suggester (model: {suggester.model_name})")
             return suggester
 
         else:
@@ -82,3 +128,41 @@ def get_suggester() -> AISuggester | None:
     except Exception as e:
         logger.error(f"Failed to initialize AI provider '{provider}': {e}")
         return None
+
+
+def get_shared_suggester() -> AISuggester | None:
+    """Get the process-wide AI suggester, building it on first use.
+
+    Reusing one instance keeps the provider client's HTTP connection pool
+    (and its keep-alive connections) alive across events instead of
+    re-reading env vars and rebuilding the client for every call.
+
+    Returns:
+        AISuggester instance or None (same rules as get_suggester)
+    """
+    global _shared_suggester, _shared_loaded
+
+    if not _shared_loaded:
+        with _shared_lock:
+            if not _shared_loaded:
+                _shared_suggester = get_suggester()
+                _shared_loaded = True
+    return _shared_suggester
+
+
+def reload_suggester() -> AISuggester | None:
+    """Rebuild the shared suggester from current environment variables.
+
+    Call after changing AI_PROVIDER / AI_MODEL / API keys at runtime
+    (the worker does this on SIGHUP).
+
+    Returns:
+        The new shared AISuggester instance or None
+    """
+    global _shared_suggester, _shared_loaded
+
+    suggester = get_suggester()
+    with _shared_lock:
+        _shared_suggester = suggester
+        _shared_loaded = True
+    return suggester
@@ -6,7 +6,8 @@ PII redaction is applied before any AI call.
 """
 
 import logging
-import re
+
+from app.ai.redaction import default_engine
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +73,9 @@ def redact_pii(text: str) -> str:
         - Email addresses
         - Phone numbers (US format)
 
+    Patterns are precompiled and applied in priority order (see
+    app.ai.redaction); add new PII types with app.ai.redaction.register_rule.
+
     Args:
         text: Raw input text
 
@@ -89,30 +93,10 @@ def redact_pii(text: str) -> str:
         >>> redact_pii("Email me@example.com")
         'Email [EMAIL-REDACTED]'
     """
-    redacted = text
-
-    # SSN pattern (XXX-XX-XXXX)
-    redacted = re.sub(r"\b\d{3}-\d{2}-\d{4}\b", "[SSN-REDACTED]", redacted)
-
-    # Credit card numbers (simple: 16 digits with optional spaces/dashes)
-    redacted = re.sub(r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b", "[CC-REDACTED]", redacted)
-
-    # Email addresses
-    redacted = re.sub(
-        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "[EMAIL-REDACTED]", redacted
-    )
-
-    # US phone numbers (multiple formats)
-    # Matches: (555) 123-4567, 555-123-4567, 555.123.4567, 5551234567
-    redacted = re.sub(
-        r"\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b",
-        "[PHONE-REDACTED]",
-        redacted,
-    )
+    redacted, num_redactions = default_engine.redact(text)
 
     # Log if any redactions occurred
-    if redacted != text:
-        num_redactions = len(re.findall(r"\[.*?-REDACTED\]", redacted))
+    if num_redactions:
         logger.info(f"Redacted {num_redactions} PII pattern(s) from input")
 
     return redacted
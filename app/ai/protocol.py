@@ -44,3 +44,33 @@ class AISuggester(Protocol):
             - Must log all failures
         """
         ...
+
+
+class AsyncAISuggester(Protocol):
+    """Protocol for asyncio-native AI task suggestion providers.
+
+    Same contract as AISuggester, but `suggest` is a coroutine so one event
+    loop can keep many provider calls in flight at once.
+
+    Attributes:
+        provider_name: Human-readable provider identifier (e.g., 'openai')
+        model_name: Specific model being used (e.g., 'gpt-4o-mini')
+    """
+
+    provider_name: str
+    model_name: str
+
+    async def suggest(self, text: str) -> AISuggestion | None:
+        """Extract a task suggestion from text.
+
+        Args:
+            text: Raw input text (already PII-redacted)
+
+        Returns:
+            AISuggestion if successful, None on any failure
+
+        Implementation Requirements:
+            Identical to AISuggester.suggest (10 s timeout, 2 retries max,
+            validate_suggestion(), never raise, log all failures).
+        """
+        ...
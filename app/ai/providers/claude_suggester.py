@@ -14,6 +14,65 @@ from app.ai.prompts import CURRENT_PROMPT_VERSION, get_prompt
 logger = logging.getLogger(__name__)
 
 
+def _load_config() -> tuple[str, str]:
+    """Read model name and API key from the environment.
+
+    Returns:
+        (model_name, api_key)
+
+    Raises:
+        ValueError: If ANTHROPIC_API_KEY is not set
+    """
+    model_name = os.getenv("AI_MODEL", "claude-3-5-sonnet-20241022")
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+
+    return model_name, api_key
+
+
+def _build_request(model_name: str, text: str) -> dict:
+    """Build Messages API request arguments for the given (redacted) text."""
+    prompt = get_prompt(CURRENT_PROMPT_VERSION).format(text=text)
+
+    return {
+        "model": model_name,
+        "max_tokens": 500,
+        "temperature": 0.3,  # Low temperature for consistency
+        "system": "You are a task extraction assistant. Return only valid JSON with no additional text.",
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def _parse_response(message) -> AISuggestion | None:
+    """Parse and validate a Messages API response against the contract."""
+    # Extract text content from Claude's response
+    if not message.content or len(message.content) == 0:
+        logger.warning("Claude returned empty content")
+        return None
+
+    content = (
+        message.content[0].text if hasattr(message.content[0], "text") else str(message.content[0])
+    )
+
+    # Parse JSON response
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Claude response not valid JSON: {e}")
+        return None
+
+    # Validate against contract
+    suggestion = validate_suggestion(data)
+    if not suggestion:
+        logger.warning(f"Claude response failed validation: {data}")
+        return None
+
+    logger.info(f"Claude suggestion: {suggestion.title} (confidence: {suggestion.confidence})")
+    return suggestion
+
+
 class ClaudeSuggester:
     """Anthropic Claude-based task suggester.
 
@@ -24,11 +83,7 @@ class ClaudeSuggester:
 
     def __init__(self):
         self.provider_name = "anthropic"
-        self.model_name = os.getenv("AI_MODEL", "claude-3-5-sonnet-20241022")
-        self.api_key = os.getenv("ANTHROPIC_API_KEY")
-
-        if not self.api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        self.model_name, self.api_key = _load_config()
 
         # Lazy import to allow optional dependency
         try:
@@ -54,44 +109,52 @@ class ClaudeSuggester:
             AISuggestion if successful, None on failure
         """
         try:
-            prompt = get_prompt(CURRENT_PROMPT_VERSION).format(text=text)
-
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=500,
-                temperature=0.3,  # Low temperature for consistency
-                system="You are a task extraction assistant. Return only valid JSON with no additional text.",
-                messages=[{"role": "user", "content": prompt}],
-            )
+            message = self.client.messages.create(**_build_request(self.model_name, text))
+            return _parse_response(message)
 
-            # Extract text content from Claude's response
-            if not message.content or len(message.content) == 0:
-                logger.warning("Claude returned empty content")
-                return None
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            return None
 
-            content = (
-                message.content[0].text
-                if hasattr(message.content[0], "text")
-                else str(message.content[0])
-            )
 
-            # Parse JSON response
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Claude response not valid JSON: {e}")
-                return None
-
-            # Validate against contract
-            suggestion = validate_suggestion(data)
-            if not suggestion:
-                logger.warning(f"Claude response failed validation: {data}")
-                return None
-
-            logger.info(
-                f"Claude suggestion: {suggestion.title} (confidence: {suggestion.confidence})"
+class AsyncClaudeSuggester:
+    """Anthropic Claude-based task suggester using the native asyncio client.
+
+    Environment Variables Required:
+        - ANTHROPIC_API_KEY: Anthropic API key
+        - AI_MODEL: Model name (default: claude-3-5-sonnet-20241022)
+    """
+
+    def __init__(self):
+        self.provider_name = "anthropic"
+        self.model_name, self.api_key = _load_config()
+
+        # Lazy import to allow optional dependency
+        try:
+            import anthropic
+
+            self.client = anthropic.AsyncAnthropic(
+                api_key=self.api_key,
+                timeout=10.0,  # 10 second timeout
+                max_retries=2,  # 2 retries max
             )
-            return suggestion
+        except ImportError:
+            raise ImportError(
+                "anthropic package not installed. Install with: pip install anthropic"
+            )
+
+    async def suggest(self, text: str) -> AISuggestion | None:
+        """Extract task suggestion using Anthropic API without blocking the event loop.
+
+        Args:
+            text: Input text (already PII-redacted)
+
+        Returns:
+            AISuggestion if successful, None on failure
+        """
+        try:
+            message = await self.client.messages.create(**_build_request(self.model_name, text))
+            return _parse_response(message)
 
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
@@ -14,6 +14,66 @@ from app.ai.prompts import CURRENT_PROMPT_VERSION, get_prompt
 logger = logging.getLogger(__name__)
 
 
+def _load_config() -> tuple[str, str]:
+    """Read model name and API key from the environment.
+
+    Returns:
+        (model_name, api_key)
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    model_name = os.getenv("AI_MODEL", "gpt-4o-mini")
+    api_key = os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+
+    return model_name, api_key
+
+
+def _build_request(model_name: str, text: str) -> dict:
+    """Build Chat Completions request arguments for the given (redacted) text."""
+    prompt = get_prompt(CURRENT_PROMPT_VERSION).format(text=text)
+
+    return {
+        "model": model_name,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a task extraction assistant. Return only valid JSON.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.3,  # Low temperature for consistency
+        "response_format": {"type": "json_object"},
+    }
+
+
+def _parse_response(response) -> AISuggestion | None:
+    """Parse and validate a Chat Completions response against the contract."""
+    content = response.choices[0].message.content
+    if not content:
+        logger.warning("OpenAI returned empty content")
+        return None
+
+    # Parse JSON response
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        logger.warning(f"OpenAI response not valid JSON: {e}")
+        return None
+
+    # Validate against contract
+    suggestion = validate_suggestion(data)
+    if not suggestion:
+        logger.warning(f"OpenAI response failed validation: {data}")
+        return None
+
+    logger.info(f"OpenAI suggestion: {suggestion.title} (confidence: {suggestion.confidence})")
+    return suggestion
+
+
 class OpenAISuggester:
     """OpenAI-based task suggester.
 
@@ -24,11 +84,7 @@ class OpenAISuggester:
 
     def __init__(self):
         self.provider_name = "openai"
-        self.model_name = os.getenv("AI_MODEL", "gpt-4o-mini")
-        self.api_key = os.getenv("OPENAI_API_KEY")
-
-        if not self.api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
+        self.model_name, self.api_key = _load_config()
 
         # Lazy import to allow optional dependency
         try:
@@ -52,43 +108,52 @@ class OpenAISuggester:
             AISuggestion if successful, None on failure
         """
         try:
-            prompt = get_prompt(CURRENT_PROMPT_VERSION).format(text=text)
-
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a task extraction assistant. Return only valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,  # Low temperature for consistency
-                response_format={"type": "json_object"},
+            response = self.client.chat.completions.create(**_build_request(self.model_name, text))
+            return _parse_response(response)
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            return None
+
+
+class AsyncOpenAISuggester:
+    """OpenAI-based task suggester using the native asyncio client.
+
+    Environment Variables Required:
+        - OPENAI_API_KEY: OpenAI API key
+        - AI_MODEL: Model name (default: gpt-4o-mini)
+    """
+
+    def __init__(self):
+        self.provider_name = "openai"
+        self.model_name, self.api_key = _load_config()
+
+        # Lazy import to allow optional dependency
+        try:
+            import openai
+
+            self.client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=10.0,  # 10 second timeout
+                max_retries=2,  # 2 retries max
             )
+        except ImportError:
+            raise ImportError("openai package not installed. Install with: pip install openai")
+
+    async def suggest(self, text: str) -> AISuggestion | None:
+        """Extract task suggestion using OpenAI API without blocking the event loop.
+
+        Args:
+            text: Input text (already PII-redacted)
 
-            content = response.choices[0].message.content
-            if not content:
-                logger.warning("OpenAI returned empty content")
-                return None
-
-            # Parse JSON response
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.warning(f"OpenAI response not valid JSON: {e}")
-                return None
-
-            # Validate against contract
-            suggestion = validate_suggestion(data)
-            if not suggestion:
-                logger.warning(f"OpenAI response failed validation: {data}")
-                return None
-
-            logger.info(
-                f"OpenAI suggestion: {suggestion.title} (confidence: {suggestion.confidence})"
+        Returns:
+            AISuggestion if successful, None on failure
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                **_build_request(self.model_name, text)
             )
-            return suggestion
+            return _parse_response(response)
 
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
@@ -0,0 +1,218 @@
+"""
+PII Redaction Engine: precompiled pattern replacement with a rule registry.
+
+Rules apply in registration order, exactly like the sequential re.sub
+passes they replaced: each rule only sees the text that earlier rules left
+unredacted, so a higher-priority match (a card number) is never split by a
+lower-priority one (a phone-shaped prefix of it).
+
+Every rule is folded into one compiled alternation, and redact() makes a
+single pass with it, substituting and counting each match as it goes;
+registering a rule adds a branch, not a pass. The alternation picks the
+leftmost match, which agrees with the sequential passes unless a
+higher-priority rule starts inside or right at the end of it, a match of
+another rule touches it, or it ends against a word character. Text from
+the first such span on is finished with the ordered per-rule passes.
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+_WORD = re.compile(r"\w")
+
+# Longest match whose overlap probe is compiled and cached (see _overlapped)
+_PROBE_CACHE_SPAN = 64
+
+
+@dataclass(frozen=True)
+class RedactionRule:
+    """One PII type handled by a RedactionEngine.
+
+    Attributes:
+        name: Identifier, used as the regex group name (e.g., 'ssn')
+        pattern: Regex matched at a word boundary (the engine adds the
+            leading \\b). Must not start with whitespace, use lookbehind or
+            use numbered backreferences.
+        replacement: Literal token substituted for each match
+    """
+
+    name: str
+    pattern: str
+    replacement: str
+
+
+# Order matters: earlier rules redact first and later rules cannot overlap them
+DEFAULT_RULES = (
+    # SSN (XXX-XX-XXXX)
+    RedactionRule("ssn", r"\d{3}-\d{2}-\d{4}\b", "[SSN-REDACTED]"),
+    # Credit card numbers (simple: 16 digits with optional spaces/dashes)
+    RedactionRule("cc", r"\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b", "[CC-REDACTED]"),
+    # Email addresses (possessive local part: it can never contain '@')
+    RedactionRule(
+        "email", r"[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "[EMAIL-REDACTED]"
+    ),
+    # US phone numbers: (555) 123-4567, 555-123-4567, 555.123.4567, 5551234567
+    RedactionRule(
+        "phone",
+        r"(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b",
+        "[PHONE-REDACTED]",
+    ),
+)
+
+
+class RedactionEngine:
+    """Registry of redaction rules, applied in priority order."""
+
+    def __init__(self, rules: Iterable[RedactionRule] = ()) -> None:
+        self._lock = threading.Lock()
+        self._rules: tuple[RedactionRule, ...] = ()
+        self._combined: re.Pattern[str] | None = None
+        # group name -> (replacement, alternation of the higher-priority rules)
+        self._branches: dict[str, tuple[str, str | None]] = {}
+        # (group name, match length) -> overlap probe; registering a rule
+        # never changes the rules ahead of an existing one, so these stay valid
+        self._probes: dict[tuple[str, int], re.Pattern[str]] = {}
+        self._passes: tuple[tuple[re.Pattern[str], str], ...] = ()
+        for rule in rules:
+            self.register(rule)
+
+    @property
+    def rules(self) -> tuple[RedactionRule, ...]:
+        return self._rules
+
+    def register(self, rule: RedactionRule) -> None:
+        """Add a rule and recompile the patterns.
+
+        Args:
+            rule: Rule to append (lowest priority)
+
+        Raises:
+            ValueError: If the name is not an identifier or already registered
+            re.error: If the pattern does not compile
+        """
+        if not rule.name.isidentifier():
+            raise ValueError(f"Redaction rule name must be an identifier: {rule.name!r}")
+
+        with self._lock:
+            if any(r.name == rule.name for r in self._rules):
+                raise ValueError(f"Redaction rule already registered: {rule.name}")
+
+            rules = self._rules + (rule,)
+            passes = tuple((re.compile(rf"\b(?:{r.pattern})"), r.replacement) for r in rules)
+            higher = "|".join(r.pattern for r in self._rules) or None
+            branches = {**self._branches, rule.name: (rule.replacement, higher)}
+            alternation = "|".join(f"(?P<{r.name}>{r.pattern})" for r in rules)
+            # (?=\S) skips the word boundary at the end of every word cheaply
+            combined = re.compile(rf"\b(?=\S)(?:{alternation})")
+
+            # Swap in the new state together; redact() reads it without locking
+            self._passes = passes
+            self._branches = branches
+            self._combined = combined
+            self._rules = rules
+
+    def redact(self, text: str) -> tuple[str, int]:
+        """Replace every rule match, earlier rules first.
+
+        Args:
+            text: Raw input text
+
+        Returns:
+            (redacted_text, number_of_redactions)
+        """
+        combined, branches = self._combined, self._branches
+        if combined is None:
+            return text, 0
+
+        pieces: list[str] = []
+        count = 0
+        pos = 0  # text before pos is already in pieces
+        # Touching matches of one rule form a run; a fallback restarts at the
+        # run's first match, whose left neighbour is plain text
+        run_from = run_start = run_pieces = run_count = 0
+        last_rule = None
+        for m in combined.finditer(text):
+            start, end = m.span()
+            replacement, higher = branches[m.lastgroup]  # type: ignore[index]
+            touching = count > 0 and start == pos
+            if (
+                # Only the same rule's pass sees the text right after its token
+                (touching and m.lastgroup != last_rule)
+                # Nor can a later rule start there, unless that is a word character
+                or (end < len(text) and _WORD.match(text, end))
+                or (higher and self._overlapped(text, start, end, m.lastgroup, higher))  # type: ignore[arg-type]
+            ):
+                del pieces[run_pieces:]
+                count = run_count
+                pieces.append(text[run_from:run_start])
+                rest, rest_count = self._redact_ordered(text, run_start)
+                pieces.append(rest)
+                return "".join(pieces), count + rest_count
+            if not touching:
+                run_from, run_start, run_pieces, run_count = pos, start, len(pieces), count
+            pieces += [text[pos:start], replacement]
+            count += 1
+            pos = end
+            last_rule = m.lastgroup
+
+        if not count:
+            return text, 0
+        pieces.append(text[pos:])
+        return "".join(pieces), count
+
+    def _overlapped(self, text: str, start: int, end: int, name: str, higher: str) -> bool:
+        """Whether a higher-priority rule matches at any position in (start, end]."""
+        span = end - start
+        if not span:
+            return False
+        probe = self._probes.get((name, span))
+        if probe is None:
+            # Greedy skip of up to span - 1 characters, then a zero-width test,
+            # so the whole window is tried in one call into the regex engine
+            probe = re.compile(rf"[\s\S]{{0,{span - 1}}}(?=\b(?:{higher}))")
+            if span <= _PROBE_CACHE_SPAN:
+                self._probes[(name, span)] = probe
+        return probe.match(text, start + 1) is not None
+
+    def _redact_ordered(self, text: str, start: int = 0) -> tuple[str, int]:
+        """One pass per rule over text[start:], each skipping earlier rules' tokens.
+
+        Returns:
+            (redacted text[start:], number_of_redactions)
+        """
+        # Unredacted text at even indexes, replacement tokens at odd ones.
+        # Tokens are bracketed, so a segment's ends are word boundaries just
+        # as they were next to the token in the sequential passes. The first
+        # segment keeps text[:start] so matches at start see the real
+        # preceding character.
+        segments = [text]
+        count = 0
+        for pattern, replacement in self._passes:
+            split: list[str] = []
+            for i, segment in enumerate(segments):
+                if i % 2:
+                    split.append(segment)
+                    continue
+                pos = 0
+                for m in pattern.finditer(segment, 0 if i else start):
+                    split += [segment[pos : m.start()], replacement]
+                    pos = m.end()
+                    count += 1
+                split.append(segment[pos:])
+            segments = split
+        return "".join(segments)[start:], count
+
+
+# Process-wide engine used by app.ai.prompts.redact_pii
+default_engine = RedactionEngine(DEFAULT_RULES)
+
+
+def register_rule(rule: RedactionRule) -> None:
+    """Add a PII type to the engine used by redact_pii.
+
+    Examples:
+        >>> register_rule(RedactionRule("mrn", r"MRN\\d{8}\\b", "[MRN-REDACTED]"))
+    """
+    default_engine.register(rule)
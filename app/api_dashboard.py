@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api_inbox import list_inbox
+from app.api_review import get_recently_approved, get_review_queue
+from app.api_tasks import list_tasks
+from app.core.dashboard import dashboard_etag, dashboard_version
+from app.core.db import get_async_sessionmaker
+
+router = APIRouter()
+
+# Items per list on the dashboard; each list's next_cursor continues on its
+# own endpoint (/api/inbox, /api/review, /api/tasks)
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "20"))
+
+
+@router.get("/api/dashboard")
+async def get_dashboard(
+    response: Response,
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
+    if_none_match: str | None = Header(None),
+):
+    """Inbox, review queue, recent approvals and active tasks in one response.
+
+    The four queries run concurrently, each on its own session. The ETag is
+    the dashboard version (app.core.dashboard): a matching If-None-Match is
+    answered 304 from Redis alone.
+
+    Returns {"inbox", "review", "tasks"} pages of DASHBOARD_PAGE_SIZE items
+    (items + next_cursor) and the "approved" list (last 10)
+    """
+    # Read before querying: a write landing meanwhile bumps past this version,
+    # so the next request refetches rather than keeping a stale copy
+    version = await run_in_threadpool(dashboard_version)
+    if version is not None:
+        etag = dashboard_etag(version)
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        # Cache, but revalidate on every load
+        response.headers["Cache-Control"] = "no-cache"
+
+    async def view(fetch):
+        async with sessionmaker() as db:
+            return jsonable_encoder(await fetch(db))
+
+    inbox, review, approved, tasks = await asyncio.gather(
+        view(lambda db: list_inbox(db=db, limit=DASHBOARD_PAGE_SIZE)),
+        view(lambda db: get_review_queue(db=db, limit=DASHBOARD_PAGE_SIZE)),
+        view(lambda db: get_recently_approved(db=db)),
+        view(lambda db: list_tasks(db=db, limit=DASHBOARD_PAGE_SIZE, status="active")),
+    )
+    return {
+        "inbox": inbox,
+        "review": review,
+        "approved": approved,
+        "tasks": tasks,
+    }
@@ -1,10 +1,23 @@
 ﻿from datetime import datetime
 import json
+import os
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.archive import (
+    ArchiveConflictError,
+    ArchiveError,
+    archive_format,
+    bulk_import,
+    iter_archive_records,
+)
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import SessionLocal, get_async_db, get_db
 from app.models.raw_event import RawEvent
 from app.models.task import Task
 from app.models.task_candidate import TaskCandidate
@@ -22,233 +35,359 @@ def serialize_datetime(v):
     return str(v)
 
 
-@router.get("/api/export")
-def export_all(db: Session = Depends(get_db)):
-    """Export raw events, candidates, tasks, review actions and AI suggestions as JSON."""
-    raw = [
-        {
-            "id": r.id,
-            "source": r.source,
-            "received_at": serialize_datetime(r.received_at),
-            "payload": r.payload,
-            "processed": bool(r.processed),
-        }
-        for r in db.query(RawEvent).order_by(RawEvent.received_at.asc()).all()
-    ]
-
-    candidates = [
-        {
-            "id": c.id,
-            "raw_event_id": c.raw_event_id,
-            "created_at": serialize_datetime(c.created_at),
-            "title": c.title,
-            "description": c.description,
-            "priority": c.priority,
-            "status": c.status,
-            "ai_suggestion_id": c.ai_suggestion_id,
-        }
-        for c in db.query(TaskCandidate).order_by(TaskCandidate.created_at.asc()).all()
-    ]
-
-    tasks = [
-        {
-            "id": t.id,
-            "created_at": serialize_datetime(t.created_at),
-            "title": t.title,
-            "description": t.description,
-            "priority": t.priority,
-            "status": t.status,
-            "completed_at": serialize_datetime(t.completed_at),
-            "raw_event_id": t.raw_event_id,
-        }
-        for t in db.query(Task).order_by(Task.created_at.asc()).all()
-    ]
-
-    reviews = [
-        {
-            "id": r.id,
-            "candidate_id": r.candidate_id,
-            "action": r.action,
-            "timestamp": serialize_datetime(r.timestamp),
-            "raw_event_id": r.raw_event_id,
-        }
-        for r in db.query(ReviewAction).order_by(ReviewAction.timestamp.asc()).all()
-    ]
-
-    ais = [
-        {
-            "id": a.id,
-            "provider": a.provider,
-            "model": a.model,
-            "rationale": a.rationale,
-            "suggestion_json": a.suggestion_json,
-            "created_at": serialize_datetime(a.created_at),
-        }
-        for a in db.query(AISuggestion).order_by(AISuggestion.created_at.asc()).all()
-    ]
-
-    payload = {
-        "raw_events": raw,
-        "task_candidates": candidates,
-        "tasks": tasks,
-        "review_actions": reviews,
-        "ai_suggestions": ais,
-        "exported_at": datetime.utcnow().isoformat(),
+def _raw_event_record(r):
+    return {
+        "id": r.id,
+        "source": r.source,
+        "received_at": serialize_datetime(r.received_at),
+        "payload": r.payload,
+        "processed": bool(r.processed),
+        "dedup_key": r.dedup_key,
     }
 
+
+def _candidate_record(c):
+    return {
+        "id": c.id,
+        "raw_event_id": c.raw_event_id,
+        "created_at": serialize_datetime(c.created_at),
+        "title": c.title,
+        "description": c.description,
+        "priority": c.priority,
+        "status": c.status,
+        "ai_suggestion_id": c.ai_suggestion_id,
+    }
+
+
+def _task_record(t):
+    return {
+        "id": t.id,
+        "created_at": serialize_datetime(t.created_at),
+        "title": t.title,
+        "description": t.description,
+        "priority": t.priority,
+        "status": t.status,
+        "completed_at": serialize_datetime(t.completed_at),
+        "raw_event_id": t.raw_event_id,
+    }
+
+
+def _review_record(r):
+    return {
+        "id": r.id,
+        "candidate_id": r.candidate_id,
+        "action": r.action,
+        "timestamp": serialize_datetime(r.timestamp),
+        "raw_event_id": r.raw_event_id,
+    }
+
+
+def _ai_suggestion_record(a):
+    return {
+        "id": a.id,
+        "raw_event_id": a.raw_event_id,
+        "provider": a.provider,
+        "model": a.model,
+        "prompt_version": a.prompt_version,
+        "input_hash": a.input_hash,
+        "input_excerpt": a.input_excerpt,
+        "rationale": a.rationale,
+        "suggestion_json": a.suggestion_json,
+        "created_at": serialize_datetime(a.created_at),
+    }
+
+
+# (archive key, model, sort column, row serializer) in export order
+EXPORT_TABLES = [
+    ("raw_events", RawEvent, RawEvent.received_at, _raw_event_record),
+    ("task_candidates", TaskCandidate, TaskCandidate.created_at, _candidate_record),
+    ("tasks", Task, Task.created_at, _task_record),
+    ("review_actions", ReviewAction, ReviewAction.timestamp, _review_record),
+    ("ai_suggestions", AISuggestion, AISuggestion.created_at, _ai_suggestion_record),
+]
+
+# Rows fetched per server-side cursor round trip (and per streamed chunk)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+def iter_ndjson_export(session_factory=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield the archive as NDJSON text chunks without materializing any table.
+
+    The first line is a header ({"exported_at": ..., "tables": [...]}); every
+    following line is {"table": <archive key>, "record": {...}}. Rows are read
+    with yield_per, which uses a server-side cursor on PostgreSQL, so memory
+    stays bounded by batch_size regardless of table size.
+
+    Uses its own session: the response body is produced after the request's
+    dependency-managed session may already be closed. This is a plain
+    generator on the sync engine; StreamingResponse iterates it in a worker
+    thread, so the event loop is never blocked on the cursor.
+    """
+    header = {"exported_at": datetime.utcnow().isoformat(), "tables": [t[0] for t in EXPORT_TABLES]}
+    yield json.dumps(header) + "\n"
+
+    db = (session_factory or SessionLocal)()
+    try:
+        for name, model, sort_column, serialize in EXPORT_TABLES:
+            lines = []
+            # Plain column rows (no ORM identity map) read in batch_size partitions
+            query = select(*model.__table__.columns).order_by(sort_column.asc())
+            for row in db.execute(query, execution_options={"yield_per": batch_size}):
+                lines.append(json.dumps({"table": name, "record": serialize(row)}))
+                if len(lines) >= batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+    finally:
+        db.close()
+
+
+@router.get("/api/export")
+async def export_all(
+    format: Literal["json", "ndjson"] = "json", db: AsyncSession = Depends(get_async_db)
+):
+    """Export raw events, candidates, tasks, review actions and AI suggestions.
+
+    format=json (default) returns a single JSON document. format=ndjson
+    streams one record per line (see iter_ndjson_export) with flat memory use,
+    which is the mode to use for large databases.
+    """
+    if format == "ndjson":
+        return StreamingResponse(
+            iter_ndjson_export(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="lifeos-export.ndjson"'},
+        )
+
+    payload: dict[str, Any] = {}
+    for name, model, sort_column, serialize in EXPORT_TABLES:
+        result = await db.execute(select(*model.__table__.columns).order_by(sort_column.asc()))
+        payload[name] = [serialize(row) for row in result]
+    payload["exported_at"] = datetime.utcnow().isoformat()
+
     return payload
 
 
+def parse_dt(v):
+    """Parse an ISO datetime from an archive, returning None if absent or invalid."""
+    if not v:
+        return None
+    try:
+        return datetime.fromisoformat(v)
+    except Exception:
+        return None
+
+
+def _raw_event_values(r):
+    return {
+        "id": r.get("id"),
+        "source": r.get("source"),
+        "received_at": parse_dt(r.get("received_at")),
+        "payload": r.get("payload"),
+        "processed": bool(r.get("processed", False)),
+        "dedup_key": r.get("dedup_key"),
+    }
+
+
+def _candidate_values(c):
+    return {
+        "id": c.get("id"),
+        "raw_event_id": c.get("raw_event_id"),
+        "created_at": parse_dt(c.get("created_at")),
+        "title": c.get("title"),
+        "description": c.get("description"),
+        "priority": c.get("priority"),
+        "status": c.get("status"),
+        "ai_suggestion_id": c.get("ai_suggestion_id"),
+    }
+
+
+def _task_values(t):
+    return {
+        "id": t.get("id"),
+        "created_at": parse_dt(t.get("created_at")),
+        "title": t.get("title"),
+        "description": t.get("description"),
+        "priority": t.get("priority"),
+        "status": t.get("status"),
+        "completed_at": parse_dt(t.get("completed_at")),
+        "raw_event_id": t.get("raw_event_id"),
+    }
+
+
+def _review_values(r):
+    return {
+        "id": r.get("id"),
+        "candidate_id": r.get("candidate_id"),
+        "action": r.get("action"),
+        "timestamp": parse_dt(r.get("timestamp")),
+        "raw_event_id": r.get("raw_event_id"),
+    }
+
+
+def _ai_suggestion_values(a):
+    return {
+        "id": a.get("id"),
+        "raw_event_id": a.get("raw_event_id"),
+        "provider": a.get("provider"),
+        "model": a.get("model"),
+        "prompt_version": a.get("prompt_version"),
+        "input_hash": a.get("input_hash"),
+        "input_excerpt": a.get("input_excerpt"),
+        "rationale": a.get("rationale"),
+        "suggestion_json": a.get("suggestion_json"),
+        "created_at": parse_dt(a.get("created_at")),
+    }
+
+
+# archive key -> (model, archive record -> column values)
+IMPORT_TABLES = {
+    "raw_events": (RawEvent, _raw_event_values),
+    "task_candidates": (TaskCandidate, _candidate_values),
+    "tasks": (Task, _task_values),
+    "review_actions": (ReviewAction, _review_values),
+    "ai_suggestions": (AISuggestion, _ai_suggestion_values),
+}
+
+# Rows per upsert statement and per commit
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+
+
+def _upload_format(file):
+    fmt = archive_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="file must be JSON or NDJSON")
+    return fmt
+
+
 @router.post("/api/import")
-async def import_all(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    """Import data from a JSON archive produced by `/api/export`.
+def import_all(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Import data from a JSON or NDJSON archive produced by `/api/export`.
+
+    The upload is parsed incrementally and upserted in batches
+    (INSERT ... ON CONFLICT DO UPDATE), committing every IMPORT_CHUNK_SIZE
+    rows. Existing primary keys are updated rather than duplicated, so
+    importing the same archive twice is a no-op.
 
-    This endpoint will attempt to insert records. It uses `merge` semantics so existing
-    primary keys are preserved and not duplicated.
+    Kept synchronous (like import_preview): the upload is consumed by a
+    blocking parser, so FastAPI runs it in the threadpool, off the event loop.
+
+    Raises:
+        HTTPException: 400 for an unreadable archive, 409 for rows that
+            violate a constraint; either way the detail reports how many
+            rows were committed before the failure
     """
-    if file.content_type not in ("application/json", "text/json"):
-        raise HTTPException(status_code=400, detail="file must be JSON")
+    fmt = _upload_format(file)
+    committed: dict[str, int] = {}
 
-    raw_body = await file.read()
     try:
-        payload = json.loads(raw_body.decode())
-    except Exception:
-        raise HTTPException(status_code=400, detail="invalid JSON")
-
-    count = {"raw_events": 0, "task_candidates": 0, "tasks": 0, "review_actions": 0, "ai_suggestions": 0}
-
-    # Helper to parse iso datetimes safely
-    def parse_dt(v):
-        if not v:
-            return None
-        try:
-            return datetime.fromisoformat(v)
-        except Exception:
-            return None
-
-    # Import raw events
-    for r in payload.get("raw_events", []):
-        obj = RawEvent(
-            id=r.get("id"),
-            source=r.get("source"),
-            received_at=parse_dt(r.get("received_at")),
-            payload=r.get("payload"),
-            processed=bool(r.get("processed", False)),
-        )
-        db.merge(obj)
-        count["raw_events"] += 1
-
-    for c in payload.get("task_candidates", []):
-        obj = TaskCandidate(
-            id=c.get("id"),
-            raw_event_id=c.get("raw_event_id"),
-            created_at=parse_dt(c.get("created_at")),
-            title=c.get("title"),
-            description=c.get("description"),
-            priority=c.get("priority"),
-            status=c.get("status"),
-            ai_suggestion_id=c.get("ai_suggestion_id"),
-        )
-        db.merge(obj)
-        count["task_candidates"] += 1
-
-    for t in payload.get("tasks", []):
-        obj = Task(
-            id=t.get("id"),
-            created_at=parse_dt(t.get("created_at")),
-            title=t.get("title"),
-            description=t.get("description"),
-            priority=t.get("priority"),
-            status=t.get("status"),
-            completed_at=parse_dt(t.get("completed_at")),
-            raw_event_id=t.get("raw_event_id"),
+        count = bulk_import(
+            db,
+            iter_archive_records(file.file, fmt),
+            IMPORT_TABLES,
+            chunk_size=IMPORT_CHUNK_SIZE,
+            on_progress=committed.update,
         )
-        db.merge(obj)
-        count["tasks"] += 1
-
-    for r in payload.get("review_actions", []):
-        obj = ReviewAction(
-            id=r.get("id"),
-            candidate_id=r.get("candidate_id"),
-            action=r.get("action"),
-            timestamp=parse_dt(r.get("timestamp")),
-            raw_event_id=r.get("raw_event_id"),
-        )
-        db.merge(obj)
-        count["review_actions"] += 1
-
-    for a in payload.get("ai_suggestions", []):
-        obj = AISuggestion(
-            id=a.get("id"),
-            provider=a.get("provider"),
-            model=a.get("model"),
-            rationale=a.get("rationale"),
-            suggestion_json=a.get("suggestion_json"),
-            created_at=parse_dt(a.get("created_at")),
-        )
-        db.merge(obj)
-        count["ai_suggestions"] += 1
-
-    db.commit()
+    except ArchiveError as e:
+        db.rollback()
+        status = 409 if isinstance(e, ArchiveConflictError) else 400
+        rows = sum(committed.values())
+        raise HTTPException(status_code=status, detail=f"{e} ({rows} rows committed)")
+    finally:
+        # Chunks committed before a failure are visible too
+        bump_dashboard_version()
 
     return {"status": "imported", "counts": count}
 
 
+# Ids per collision lookup; keeps each IN (...) well under driver parameter limits
+PREVIEW_LOOKUP_CHUNK = int(os.getenv("PREVIEW_LOOKUP_CHUNK", "500"))
+PREVIEW_COLLISION_LIMIT = 100
+MAX_PREVIEW_COLLISION_LIMIT = 1000
+PREVIEW_SAMPLE_SIZE = 5
+
+# archive key -> fields shown for the first few incoming records
+PREVIEW_SAMPLE_FIELDS = {
+    "task_candidates": ("id", "title"),
+    "tasks": ("id", "title"),
+    "raw_events": ("id", "source"),
+}
+
+
 @router.post("/api/import/preview")
-async def import_preview(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def import_preview(
+    file: UploadFile = File(...),
+    collision_limit: Annotated[
+        int, Query(ge=1, le=MAX_PREVIEW_COLLISION_LIMIT)
+    ] = PREVIEW_COLLISION_LIMIT,
+    collision_offset: Annotated[int, Query(ge=0)] = 0,
+    db: Session = Depends(get_db),
+):
     """Return a preview summary of an import file: counts and existing ID collisions.
 
     The preview helps the user decide whether to proceed with the full import.
+    The upload is parsed incrementally and incoming ids are checked against
+    the database PREVIEW_LOOKUP_CHUNK at a time, selecting only the id column,
+    so memory stays bounded by the chunk size rather than the archive size.
+
+    Query parameters:
+        collision_limit: Max colliding ids returned per table
+        collision_offset: Skip this many colliding ids per table (file order)
+
+    Returns:
+        preview (counts, samples), collisions (capped id lists per table),
+        collision_counts (totals per table) and collision_page, whose
+        next_offset is None once every table's list is complete
     """
-    if file.content_type not in ("application/json", "text/json"):
-        raise HTTPException(status_code=400, detail="file must be JSON")
+    fmt = _upload_format(file)
+
+    counts = dict.fromkeys(IMPORT_TABLES, 0)
+    collision_counts = dict.fromkeys(IMPORT_TABLES, 0)
+    collisions: dict[str, list[str]] = {name: [] for name in IMPORT_TABLES}
+    samples: dict[str, list[dict]] = {name: [] for name in PREVIEW_SAMPLE_FIELDS}
+    pending: dict[str, list[str]] = {name: [] for name in IMPORT_TABLES}
+
+    def lookup(name):
+        model, _ = IMPORT_TABLES[name]
+        ids, pending[name] = pending[name], []
+        existing = {row.id for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+        for id_ in ids:
+            if id_ not in existing:
+                continue
+            if collision_offset <= collision_counts[name] < collision_offset + collision_limit:
+                collisions[name].append(id_)
+            collision_counts[name] += 1
 
-    raw_body = await file.read()
     try:
-        payload = json.loads(raw_body.decode())
-    except Exception:
-        raise HTTPException(status_code=400, detail="invalid JSON")
-
-    def ids_of(collection_name):
-        return {item.get("id") for item in payload.get(collection_name, []) if item.get("id")}
-
-    preview = {}
-    preview["counts"] = {k: len(payload.get(k, [])) for k in ["raw_events", "task_candidates", "tasks", "review_actions", "ai_suggestions"]}
-
-    # Check existing IDs in DB to surface collisions
-    collisions = {}
-    # helper to query existing ids
-    def existing_ids(model, ids):
-        if not ids:
-            return set()
-        rows = db.query(model).filter(model.id.in_(list(ids))).all()
-        return {getattr(r, 'id') for r in rows}
-
-    raw_ids = ids_of("raw_events")
-    cand_ids = ids_of("task_candidates")
-    task_ids = ids_of("tasks")
-    review_ids = ids_of("review_actions")
-    ai_ids = ids_of("ai_suggestions")
-
-    collisions["raw_events"] = list(existing_ids(RawEvent, raw_ids))
-    collisions["task_candidates"] = list(existing_ids(TaskCandidate, cand_ids))
-    collisions["tasks"] = list(existing_ids(Task, task_ids))
-    collisions["review_actions"] = list(existing_ids(ReviewAction, review_ids))
-    collisions["ai_suggestions"] = list(existing_ids(AISuggestion, ai_ids))
-
-    # Provide a small sample of incoming items to help the user confirm
-    def sample(collection_name, field_keys=("id", "title")):
-        arr = payload.get(collection_name, [])
-        sample_items = []
-        for i, it in enumerate(arr[:5]):
-            entry = {k: it.get(k) for k in field_keys if k in it}
-            sample_items.append(entry)
-        return sample_items
-
-    preview["samples"] = {
-        "task_candidates": sample("task_candidates", ("id", "title")),
-        "tasks": sample("tasks", ("id", "title")),
-        "raw_events": sample("raw_events", ("id", "source")),
+        for name, record in iter_archive_records(file.file, fmt):
+            if name not in counts:
+                continue
+            counts[name] += 1
+            if name in samples and len(samples[name]) < PREVIEW_SAMPLE_SIZE:
+                samples[name].append(
+                    {k: record.get(k) for k in PREVIEW_SAMPLE_FIELDS[name] if k in record}
+                )
+            if record.get("id"):
+                pending[name].append(record["id"])
+                if len(pending[name]) >= PREVIEW_LOOKUP_CHUNK:
+                    lookup(name)
+    except ArchiveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    for name in IMPORT_TABLES:
+        if pending[name]:
+            lookup(name)
+
+    next_offset = collision_offset + collision_limit
+    has_more = any(n > next_offset for n in collision_counts.values())
+    return {
+        "preview": {"counts": counts, "samples": samples},
+        "collisions": collisions,
+        "collision_counts": collision_counts,
+        "collision_page": {
+            "offset": collision_offset,
+            "limit": collision_limit,
+            "next_offset": next_offset if has_more else None,
+        },
     }
-
-    return {"preview": preview, "collisions": collisions}
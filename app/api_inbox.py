@@ -0,0 +1,144 @@
+import logging
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import false, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import get_async_db
+from app.core.lanes import lane_for
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.queue import enqueue_raw_event
+from app.core.routing import needs_processing
+from app.models.raw_event import RawEvent
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Characters of each payload the inbox list returns; full payloads can be
+# megabytes of transcript and are only needed by the worker and export
+INBOX_PREVIEW_CHARS = 280
+
+# Sources a person can file through POST /api/inbox
+INBOX_SOURCES = ("manual", "dictation", "slack")
+
+
+def _preview(payload: str | None) -> tuple[str, bool]:
+    # The query reads one character past the preview to detect truncation
+    payload = payload or ""
+    if len(payload) <= INBOX_PREVIEW_CHARS:
+        return payload, False
+    return payload[:INBOX_PREVIEW_CHARS], True
+
+
+@router.get("/api/inbox")
+async def list_inbox(
+    db: AsyncSession = Depends(get_async_db),
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    source: str | None = None,
+    processed: bool | None = None,
+):
+    """Get a page of raw events, newest first.
+
+    Query parameters:
+    - limit: page size (default 50, max 200)
+    - cursor: next_cursor from the previous page
+    - source: dictation | slack | manual | ...
+    - processed: true | false
+
+    Returns {"items": [...], "next_cursor": str | None}. Payloads are cut to
+    INBOX_PREVIEW_CHARS in SQL; payload_truncated marks the ones that were.
+    """
+    query = select(
+        RawEvent.id,
+        RawEvent.source,
+        RawEvent.received_at,
+        RawEvent.processed,
+        # substr reads only the start of a large (TOASTed) payload
+        func.substr(RawEvent.payload, 1, INBOX_PREVIEW_CHARS + 1).label("preview"),
+    )
+
+    # processed=false is served by the partial idx_raw_events_unprocessed,
+    # source by idx_raw_events_inbox_source, the rest by idx_raw_events_inbox
+    if source:
+        query = query.where(RawEvent.source == source)
+    if processed is False:
+        query = query.where(RawEvent.processed == false())
+    elif processed:
+        query = query.where(RawEvent.processed.is_(True))
+
+    if cursor:
+        after_received_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(RawEvent.received_at, RawEvent.id) < (after_received_at, after_id)
+        )
+
+    result = await db.execute(
+        query.order_by(RawEvent.received_at.desc(), RawEvent.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = []
+    for row in rows:
+        payload, truncated = _preview(row.preview)
+        items.append(
+            {
+                "id": row.id,
+                "source": row.source,
+                "payload": payload,
+                "payload_truncated": truncated,
+                "received_at": row.received_at.isoformat(),
+                "processed": bool(row.processed),
+            }
+        )
+
+    next_cursor = encode_cursor(rows[-1].received_at, rows[-1].id) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/api/inbox")
+async def add_inbox_event(body: dict, db: AsyncSession = Depends(get_async_db)):
+    """File a note into the inbox from {"payload", "source"?}.
+
+    The event is routed like ingested ones (see app.core.routing): sources
+    the worker processes are enqueued, the rest are stored processed.
+
+    Raises:
+        HTTPException: 400 if the payload is missing or the source is unknown
+    """
+    payload = body.get("payload")
+    if not isinstance(payload, str) or not payload.strip():
+        raise HTTPException(status_code=400, detail="payload is required")
+    source = body.get("source") or "manual"
+    if source not in INBOX_SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {INBOX_SOURCES}")
+
+    process = needs_processing(source)
+    event = RawEvent(
+        source=source, payload=payload, received_at=datetime.utcnow(), processed=not process
+    )
+    db.add(event)
+    await db.commit()
+    await run_in_threadpool(bump_dashboard_version)
+
+    if process:
+        # The Redis client is synchronous; keep its round trip off the event loop
+        await run_in_threadpool(enqueue_raw_event, event.id, lane_for(source, interactive=True))
+        logger.info(f"Inbox event {event.id} ({source}) enqueued")
+
+    preview, truncated = _preview(payload)
+    return {
+        "id": event.id,
+        "source": source,
+        "payload": preview,
+        "payload_truncated": truncated,
+        "received_at": event.received_at.isoformat(),
+        "processed": event.processed,
+    }
@@ -1,64 +1,154 @@
-from typing import Any
+import os
+import uuid
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends
+import redis.asyncio
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.bulk import insert_new_rows
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import get_async_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.review_events import get_async_redis, iter_review_events, publish_review_events
 from app.models.ai_suggestion import AISuggestion
 from app.models.review_action import ReviewAction
-from app.models.task import Task
+from app.models.task import FROM_RAW_EVENT, Task
 from app.models.task_candidate import TaskCandidate
 
 router = APIRouter()
 
+# Most items accepted by one POST /api/review/bulk
+REVIEW_BULK_MAX_ITEMS = int(os.getenv("REVIEW_BULK_MAX_ITEMS", "500"))
+
+# Bulk action -> candidate status it sets
+BULK_ACTIONS = {"approve": "approved", "reject": "rejected"}
+
 
 @router.get("/api/review")
-def get_review_queue(db: Session = Depends(get_db)):
-    """Get pending task candidates with AI metadata.
+async def get_review_queue(
+    db: AsyncSession = Depends(get_async_db),
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    priority: Literal["low", "medium", "high"] | None = None,
+    origin: Literal["ai", "manual"] | None = None,
+    provider: str | None = None,
+    min_confidence: Annotated[float | None, Query(ge=0.0, le=1.0)] = None,
+):
+    """Get a page of pending task candidates with AI metadata, newest first.
+
+    Query parameters:
+    - limit: page size (default 50, max 200)
+    - cursor: next_cursor from the previous page
+    - priority: low | medium | high
+    - origin: 'ai' (has an AI suggestion) or 'manual'
+    - provider: AI provider name (implies AI candidates)
+    - min_confidence: minimum AI confidence, 0.0-1.0 (implies AI candidates)
 
-    Returns list of candidates with optional AI suggestion metadata:
+    Returns {"items": [...], "next_cursor": str | None}. Each item carries
+    optional AI suggestion metadata:
     - If ai_suggestion_id is present, includes provider, model, rationale, confidence
     - If manual candidate, ai_metadata is None
     """
-    candidates = (
-        db.query(TaskCandidate)
-        .filter(TaskCandidate.status == "pending")
-        .order_by(TaskCandidate.created_at.desc())
-        .all()
+    confidence = func.coalesce(AISuggestion.suggestion_json["confidence"].as_float(), 0.0)
+
+    # One query: candidates LEFT JOIN their AI evidence, selecting only the
+    # columns the queue shows (confidence is pulled out of the JSONB in SQL)
+    query = (
+        select(
+            TaskCandidate.id,
+            TaskCandidate.title,
+            TaskCandidate.description,
+            TaskCandidate.priority,
+            TaskCandidate.created_at,
+            AISuggestion.provider.label("ai_provider"),
+            AISuggestion.model.label("ai_model"),
+            AISuggestion.rationale.label("ai_rationale"),
+            confidence.label("ai_confidence"),
+        )
+        .outerjoin(AISuggestion, AISuggestion.id == TaskCandidate.ai_suggestion_id)
+        .where(TaskCandidate.status == "pending")
     )
 
-    result: list[dict[str, Any]] = []
-    for c in candidates:
+    if priority:
+        query = query.where(TaskCandidate.priority == priority)
+    if origin == "ai":
+        query = query.where(TaskCandidate.ai_suggestion_id.is_not(None))
+    elif origin == "manual":
+        query = query.where(TaskCandidate.ai_suggestion_id.is_(None))
+    if provider:
+        query = query.where(AISuggestion.provider == provider)
+    if min_confidence is not None:
+        query = query.where(AISuggestion.id.is_not(None), confidence >= min_confidence)
+
+    # Keyset pagination on (created_at, id), served by idx_task_candidates_review
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(TaskCandidate.created_at, TaskCandidate.id) < (after_created_at, after_id)
+        )
+
+    result = await db.execute(
+        query.order_by(TaskCandidate.created_at.desc(), TaskCandidate.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items: list[dict[str, Any]] = []
+    for row in rows:
         item: dict[str, Any] = {
-            "id": c.id,
-            "title": c.title,
-            "description": c.description,
-            "priority": c.priority,
-            "created_at": c.created_at.isoformat(),
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            "priority": row.priority,
+            "created_at": row.created_at.isoformat(),
             "ai_metadata": None,
         }
 
-        # Fetch AI metadata if this is an AI-generated candidate
-        if c.ai_suggestion_id:
-            ai_record = db.query(AISuggestion).filter(AISuggestion.id == c.ai_suggestion_id).first()
+        # Joined columns are NULL for manual candidates (or a missing AI record)
+        if row.ai_provider is not None:
+            item["ai_metadata"] = {
+                "provider": row.ai_provider,
+                "model": row.ai_model,
+                "rationale": row.ai_rationale,
+                "confidence": row.ai_confidence,
+            }
+
+        items.append(item)
 
-            if ai_record:
-                item["ai_metadata"] = {
-                    "provider": ai_record.provider,
-                    "model": ai_record.model,
-                    "rationale": ai_record.rationale,
-                    "confidence": ai_record.suggestion_json.get("confidence", 0.0),
-                }
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
 
-        result.append(item)
 
-    return result
+@router.get("/api/review/events")
+async def review_events(
+    client: redis.asyncio.Redis = Depends(get_async_redis),
+    last_event_id: str | None = Header(None),
+):
+    """Server-Sent Events stream of review queue changes.
+
+    Events: candidate_created (a GET /api/review item), approved
+    ({candidate_id, task_id}), rejected ({candidate_id}) and reset (the
+    Last-Event-ID is too old to resume from; reload the queue). Browsers
+    send Last-Event-ID on reconnect and receive what they missed.
+    """
+    return StreamingResponse(
+        iter_review_events(client, last_event_id),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx would otherwise hold events in its buffer
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/api/review/{candidate_id}/approve")
-def approve(candidate_id: str, db: Session = Depends(get_db)):
-    c = db.query(TaskCandidate).filter(TaskCandidate.id == candidate_id).first()
+async def approve(candidate_id: str, db: AsyncSession = Depends(get_async_db)):
+    c = await db.get(TaskCandidate, candidate_id)
     if not c:
         return {"error": "Not found", "message": "Candidate not found"}
 
@@ -72,14 +162,19 @@ def approve(candidate_id: str, db: Session = Depends(get_db)):
     db.add(task)
 
     try:
-        db.commit()
-        db.refresh(task)
+        await db.commit()
+        await db.refresh(task)
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         # Idempotency violation: task already exists for this raw_event
         if "idx_tasks_raw_event_unique" in str(e):
             return {"error": "Duplicate", "message": "Task already exists for this event"}
         raise
+    await run_in_threadpool(bump_dashboard_version)
+    await run_in_threadpool(
+        publish_review_events,
+        [{"type": "approved", "candidate_id": c.id, "task_id": task.id}],
+    )
 
     return {
         "status": "approved",
@@ -90,8 +185,8 @@ def approve(candidate_id: str, db: Session = Depends(get_db)):
 
 
 @router.post("/api/review/{candidate_id}/reject")
-def reject(candidate_id: str, db: Session = Depends(get_db)):
-    c = db.query(TaskCandidate).filter(TaskCandidate.id == candidate_id).first()
+async def reject(candidate_id: str, db: AsyncSession = Depends(get_async_db)):
+    c = await db.get(TaskCandidate, candidate_id)
     if not c:
         return {"error": "Not found", "message": "Candidate not found"}
 
@@ -100,17 +195,175 @@ def reject(candidate_id: str, db: Session = Depends(get_db)):
     db.add(audit)
 
     c.status = "rejected"
-    db.commit()
+    await db.commit()
+    await run_in_threadpool(bump_dashboard_version)
+    await run_in_threadpool(publish_review_events, [{"type": "rejected", "candidate_id": c.id}])
 
     return {"status": "rejected", "candidate_id": c.id, "message": "Candidate dismissed"}
 
 
+def _invalid_bulk_item(item: Any) -> str | None:
+    if not isinstance(item, dict):
+        return "Item must be an object"
+    if not isinstance(item.get("id"), str) or not item["id"]:
+        return "id is required"
+    if item.get("action") not in BULK_ACTIONS:
+        return f"action must be one of {tuple(BULK_ACTIONS)}"
+    return None
+
+
+@router.post("/api/review/bulk")
+async def bulk_review(body: Annotated[list, Body()], db: AsyncSession = Depends(get_async_db)):
+    """Approve or reject many candidates in one transaction.
+
+    Accepts a JSON array of {"id": candidate_id, "action": "approve" | "reject"}.
+    Candidates are locked with FOR UPDATE SKIP LOCKED, so a candidate another
+    request is reviewing is skipped instead of waited on. Tasks and audit
+    records are written with one multi-row INSERT each; an approval whose
+    raw event already has a task (idx_tasks_raw_event_unique) is reported as
+    a duplicate and leaves the candidate pending, as single approve does,
+    without failing the rest of the batch.
+
+    Returns:
+        Counts and, per item in request order, its index, id, status
+        (approved | rejected | duplicate | skipped | not_found | invalid),
+        the task_id of approvals and the error of the others
+
+    Raises:
+        HTTPException: 413 if the batch has more than REVIEW_BULK_MAX_ITEMS items
+    """
+    if len(body) > REVIEW_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {REVIEW_BULK_MAX_ITEMS} items per batch"
+        )
+
+    results: list[dict[str, Any]] = []
+    requested: dict[str, dict[str, Any]] = {}  # candidate id -> its result
+    actions: dict[str, str] = {}  # candidate id -> approve | reject
+    for index, item in enumerate(body):
+        error = _invalid_bulk_item(item)
+        if not error and item["id"] in requested:
+            error = "Candidate appears more than once"
+        if error:
+            results.append({"index": index, "status": "invalid", "error": error})
+            continue
+        result = {"index": index, "id": item["id"], "status": "not_found"}
+        results.append(result)
+        requested[item["id"]] = result
+        actions[item["id"]] = item["action"]
+
+    # Only pending candidates are reviewable; rows locked by a concurrent
+    # review are left out rather than blocking this batch
+    candidates = (
+        await db.execute(
+            select(
+                TaskCandidate.id,
+                TaskCandidate.raw_event_id,
+                TaskCandidate.title,
+                TaskCandidate.description,
+            )
+            .where(TaskCandidate.id.in_(requested), TaskCandidate.status == "pending")
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+
+    now = datetime.utcnow()
+    task_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": c.title,
+            "description": c.description,
+            "raw_event_id": c.raw_event_id,
+            "created_at": now,
+        }
+        for c in candidates
+        if actions[c.id] == "approve"
+    ]
+    # ON CONFLICT DO NOTHING on the partial unique index: a raw event that
+    # already has a task (or gets two approvals here) yields one task, and
+    # the losing rows are simply not returned
+    inserted = set(
+        await db.run_sync(insert_new_rows, Task, task_rows, ["raw_event_id"], FROM_RAW_EVENT)
+    )
+
+    tasks = iter(task_rows)
+    reviewed: dict[str, list[str]] = {"approved": [], "rejected": []}
+    audits = []
+    events = []
+    for c in candidates:
+        result = requested[c.id]
+        status = BULK_ACTIONS[actions[c.id]]
+        event = {"type": status, "candidate_id": c.id}
+        if status == "approved":
+            task_id = next(tasks)["id"]
+            if task_id not in inserted:
+                result.update(status="duplicate", error="Task already exists for this event")
+                continue
+            result["task_id"] = event["task_id"] = task_id
+        result["status"] = status
+        reviewed[status].append(c.id)
+        events.append(event)
+        audits.append(
+            {
+                "id": str(uuid.uuid4()),
+                "candidate_id": c.id,
+                "action": status,
+                "actor": "system",
+                "timestamp": now,
+                "raw_event_id": c.raw_event_id,
+            }
+        )
+
+    if audits:
+        await db.execute(insert(ReviewAction), audits)
+    for status, ids in reviewed.items():
+        if ids:
+            await db.execute(
+                update(TaskCandidate).where(TaskCandidate.id.in_(ids)).values(status=status)
+            )
+    await db.commit()
+
+    # Requested candidates the locking read did not return
+    missing = [i for i, r in requested.items() if r["status"] == "not_found"]
+    if missing:
+        current = dict(
+            (
+                await db.execute(
+                    select(TaskCandidate.id, TaskCandidate.status).where(
+                        TaskCandidate.id.in_(missing)
+                    )
+                )
+            ).all()
+        )
+        for candidate_id, status in current.items():
+            error = (
+                "Candidate is being reviewed by another request"
+                if status == "pending"
+                else f"Candidate is {status}"
+            )
+            requested[candidate_id].update(status="skipped", error=error)
+        for candidate_id in missing:
+            if candidate_id not in current:
+                requested[candidate_id]["error"] = "Candidate not found"
+
+    if events:
+        await run_in_threadpool(bump_dashboard_version)
+        await run_in_threadpool(publish_review_events, events)
+
+    counts = dict.fromkeys(
+        ("approved", "rejected", "duplicate", "skipped", "not_found", "invalid"), 0
+    )
+    for result in results:
+        counts[result["status"]] += 1
+    return {"ok": True, **counts, "items": results}
+
+
 @router.get("/api/review/approved")
-def get_recently_approved(db: Session = Depends(get_db)):
-    return (
-        db.query(TaskCandidate)
-        .filter(TaskCandidate.status == "approved")
+async def get_recently_approved(db: AsyncSession = Depends(get_async_db)):
+    result = await db.scalars(
+        select(TaskCandidate)
+        .where(TaskCandidate.status == "approved")
         .order_by(TaskCandidate.created_at.desc())
         .limit(10)
-        .all()
     )
+    return result.all()
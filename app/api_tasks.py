@@ -0,0 +1,187 @@
+from datetime import datetime
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import get_async_db
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_status_cursor,
+    encode_status_cursor,
+)
+from app.models.raw_event import RawEvent
+from app.models.task import Task
+
+router = APIRouter()
+
+PRIORITIES = ("low", "medium", "high")
+
+# Columns the task list shows; RawEvent.source is a primary-key lookup per row
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.priority,
+    Task.status,
+    Task.created_at,
+    Task.completed_at,
+    Task.raw_event_id,
+)
+
+# The task's raw event source, for statements that cannot join raw_events
+# (UPDATE ... RETURNING)
+TASK_SOURCE = (
+    select(RawEvent.source)
+    .where(RawEvent.id == Task.raw_event_id)
+    .scalar_subquery()
+    .label("source")
+)
+
+# status the transition requires -> status it sets
+TRANSITIONS = {
+    "complete": ("active", "completed"),
+    "reactivate": ("completed", "active"),
+}
+
+
+def _task_item(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "priority": row.priority,
+        "status": row.status,
+        "created_at": row.created_at.isoformat(),
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        "raw_event_id": row.raw_event_id,
+        "source": getattr(row, "source", None) or "manual",
+    }
+
+
+@router.get("/api/tasks")
+async def list_tasks(
+    db: AsyncSession = Depends(get_async_db),
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: Literal["active", "completed", "archived"] | None = None,
+    priority: Literal["low", "medium", "high"] | None = None,
+):
+    """Get a page of tasks ordered by status, then newest first.
+
+    Query parameters:
+    - limit: page size (default 50, max 200)
+    - cursor: next_cursor from the previous page
+    - status: active | completed | archived
+    - priority: low | medium | high
+
+    Returns {"items": [...], "next_cursor": str | None}
+    """
+    query = select(*TASK_COLUMNS, RawEvent.source).outerjoin(
+        RawEvent, RawEvent.id == Task.raw_event_id
+    )
+
+    # status=active is served by the partial idx_tasks_active(_priority);
+    # other statuses by idx_tasks_list(_priority)
+    if status:
+        query = query.where(Task.status == status)
+    if priority:
+        query = query.where(Task.priority == priority)
+
+    # Keyset pagination on (status, created_at, id)
+    if cursor:
+        after_status, after_created_at, after_id = decode_status_cursor(cursor)
+        query = query.where(
+            or_(
+                Task.status > after_status,
+                and_(
+                    Task.status == after_status,
+                    tuple_(Task.created_at, Task.id) < (after_created_at, after_id),
+                ),
+            )
+        )
+
+    result = await db.execute(
+        query.order_by(Task.status, Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_status_cursor(last.status, last.created_at, last.id)
+    return {"items": [_task_item(row) for row in rows], "next_cursor": next_cursor}
+
+
+@router.post("/api/tasks")
+async def create_task(body: dict, db: AsyncSession = Depends(get_async_db)):
+    """Create a manual task from {"title", "description"?, "priority"?}.
+
+    Raises:
+        HTTPException: 400 if the title is missing or the priority is unknown
+    """
+    title = body.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise HTTPException(status_code=400, detail="title is required")
+    priority = body.get("priority") or "medium"
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {PRIORITIES}")
+
+    task = Task(
+        title=title.strip(),
+        description=str(body.get("description") or ""),
+        priority=priority,
+        status="active",
+        created_at=datetime.utcnow(),
+    )
+    db.add(task)
+    await db.commit()
+    await run_in_threadpool(bump_dashboard_version)
+    return _task_item(task)
+
+
+async def _transition(db: AsyncSession, task_id: str, action: str) -> dict:
+    from_status, to_status = TRANSITIONS[action]
+
+    # One statement: the status check, the write and the read-back; a
+    # concurrent transition of the same task matches no row instead of racing
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.status == from_status)
+        .values(
+            status=to_status,
+            completed_at=datetime.utcnow() if to_status == "completed" else None,
+        )
+        .returning(*TASK_COLUMNS, TASK_SOURCE)
+    )
+    row = result.first()
+    await db.commit()
+
+    if row is None:
+        current = await db.scalar(select(Task.status).where(Task.id == task_id))
+        if current is None:
+            return {"error": "Not found", "message": "Task not found"}
+        return {"error": "Invalid transition", "message": f"Task is {current}"}
+    await run_in_threadpool(bump_dashboard_version)
+
+    return {
+        "status": to_status,
+        "task": _task_item(row),
+        "message": f"Task {'completed' if action == 'complete' else 'reactivated'}",
+    }
+
+
+@router.post("/api/tasks/{task_id}/complete")
+async def complete_task(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    return await _transition(db, task_id, "complete")
+
+
+@router.post("/api/tasks/{task_id}/reactivate")
+async def reactivate_task(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    return await _transition(db, task_id, "reactivate")
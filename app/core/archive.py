@@ -0,0 +1,195 @@
+"""
+Archive I/O for /api/import: incremental parsing and bulk upserts.
+
+Archives come in the two shapes /api/export produces:
+
+    json     {"raw_events": [...], "task_candidates": [...], ..., "exported_at": ...}
+    ndjson   header line, then one {"table": ..., "record": {...}} per line
+
+NDJSON is parsed line by line. JSON documents are parsed incrementally with
+ijson when it is installed (pip install -e ".[import]"); otherwise they fall
+back to json.load, which holds the whole document in memory.
+
+Rows are written with INSERT ... ON CONFLICT (id) DO UPDATE, so re-importing
+the same archive is idempotent and costs one statement per batch instead of
+a SELECT plus INSERT/UPDATE per row. A record repeated within a batch is
+written once, with its last value (PostgreSQL rejects an upsert that touches
+the same row twice).
+"""
+
+import json
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.bulk import upsert_rows
+
+logger = logging.getLogger(__name__)
+
+JSON_CONTENT_TYPES = ("application/json", "text/json")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+class ArchiveError(ValueError):
+    """Raised when an upload is not a readable export archive."""
+
+
+class ArchiveConflictError(ArchiveError):
+    """Raised when archive rows violate a constraint of the existing data."""
+
+
+def archive_format(filename: str | None, content_type: str | None) -> str | None:
+    """Detect the archive format of an upload.
+
+    Returns:
+        'ndjson', 'json', or None if the upload is neither
+    """
+    if content_type in NDJSON_CONTENT_TYPES or (filename or "").lower().endswith(NDJSON_SUFFIXES):
+        return "ndjson"
+    if content_type in JSON_CONTENT_TYPES:
+        return "json"
+    return None
+
+
+def iter_archive_records(fileobj: IO[bytes], fmt: str) -> Iterator[tuple[str, dict]]:
+    """Yield (table, record) pairs from an archive without loading it whole.
+
+    Args:
+        fileobj: Binary file object positioned at the start of the archive
+        fmt: 'json' or 'ndjson' (see archive_format)
+
+    Raises:
+        ArchiveError: If the content is not valid JSON / NDJSON
+    """
+    if fmt == "ndjson":
+        yield from _iter_ndjson(fileobj)
+    else:
+        yield from _iter_json_document(fileobj)
+
+
+def _iter_ndjson(fileobj: IO[bytes]) -> Iterator[tuple[str, dict]]:
+    for line_no, line in enumerate(fileobj, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            raise ArchiveError(f"invalid NDJSON on line {line_no}: {e}")
+        if not isinstance(item, dict):
+            raise ArchiveError(f"invalid NDJSON on line {line_no}: expected an object")
+        # Header and any other non-record lines carry no "table"
+        if "table" in item and isinstance(item.get("record"), dict):
+            yield item["table"], item["record"]
+
+
+def _iter_json_document(fileobj: IO[bytes]) -> Iterator[tuple[str, dict]]:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is None:
+        try:
+            payload = json.load(fileobj)
+        except ValueError as e:
+            raise ArchiveError(f"invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise ArchiveError("invalid JSON: expected an object")
+        for table, items in payload.items():
+            if isinstance(items, list):
+                for item in items:
+                    if isinstance(item, dict):
+                        yield table, item
+        return
+
+    # Build one array element at a time from the parser's event stream
+    builder = None
+    table = ""
+    try:
+        for prefix, event, value in ijson.parse(fileobj, use_float=True):
+            if builder is None:
+                if event == "start_map" and prefix.count(".") == 1 and prefix.endswith(".item"):
+                    table = prefix[: -len(".item")]
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                continue
+            builder.event(event, value)
+            if event == "end_map" and prefix == f"{table}.item":
+                yield table, builder.value
+                builder = None
+    except ijson.JSONError as e:
+        raise ArchiveError(f"invalid JSON: {e}")
+
+
+def bulk_import(
+    db: Session,
+    records: Iterable[tuple[str, dict]],
+    tables: dict[str, tuple[Any, Callable[[dict], dict]]],
+    chunk_size: int = 1000,
+    on_progress: Callable[[dict[str, int]], None] | None = None,
+) -> dict[str, int]:
+    """Upsert archive records in batches, committing after each chunk.
+
+    Args:
+        db: Database session
+        records: (table, record) pairs, e.g. from iter_archive_records
+        tables: archive key -> (model, record-to-column-values converter),
+            parents before the tables that reference them; records for other
+            keys are skipped
+        chunk_size: Rows per upsert statement and per commit
+        on_progress: Called with running committed counts after each commit
+
+    Returns:
+        Rows imported per archive key
+
+    Raises:
+        ArchiveError: If the archive cannot be parsed
+        ArchiveConflictError: If a chunk violates a constraint (the chunk is
+            rolled back)
+
+    A failure leaves earlier chunks committed; since every write is an
+    upsert, re-running the same import converges to the same state. A full
+    chunk is written together with the buffered rows of every table listed
+    before it, so child rows never reach the database ahead of the parent
+    rows they reference.
+    """
+    counts = dict.fromkeys(tables, 0)
+    order = list(tables)
+    # id -> row, so a chunk never upserts the same row twice
+    buffers: dict[str, dict[Any, dict]] = {name: {} for name in tables}
+
+    def flush(name: str) -> None:
+        model, _ = tables[name]
+        rows = list(buffers[name].values())
+        buffers[name] = {}
+        try:
+            upsert_rows(db, model, rows)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise ArchiveConflictError(f"{name} rows conflict with existing data: {e.orig}")
+        counts[name] += len(rows)
+        logger.info(f"Import progress: {sum(counts.values())} rows committed ({name})")
+        if on_progress:
+            on_progress(dict(counts))
+
+    for name, record in records:
+        if name not in tables:
+            continue
+        _, convert = tables[name]
+        row = convert(record)
+        buffers[name][row.get("id")] = row
+        if len(buffers[name]) >= chunk_size:
+            for parent in order[: order.index(name) + 1]:
+                if buffers[parent]:
+                    flush(parent)
+
+    for name in tables:
+        if buffers[name]:
+            flush(name)
+
+    return counts
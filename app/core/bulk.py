@@ -0,0 +1,73 @@
+"""
+Dialect-native bulk INSERT helpers (PostgreSQL and SQLite ON CONFLICT).
+"""
+
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Dialects with INSERT ... ON CONFLICT support
+_DIALECT_INSERT: dict[str, Callable[[Any], Any]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _insert_for(db: Session, model: Any) -> Any:
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERT:
+        raise NotImplementedError(f"ON CONFLICT inserts not supported for dialect {dialect}")
+    return _DIALECT_INSERT[dialect](model)
+
+
+def upsert_rows(db: Session, model: Any, rows: list[dict]) -> None:
+    """INSERT rows, updating every supplied column when the primary key exists.
+
+    Uses the dialect's native upsert (PostgreSQL and SQLite both support
+    ON CONFLICT ... DO UPDATE). All rows must have the same keys.
+    """
+    if not rows:
+        return
+
+    stmt = _insert_for(db, model)
+    pk = [c.name for c in model.__table__.primary_key.columns]
+    update = {key: stmt.excluded[key] for key in rows[0] if key not in pk}
+    if update:
+        stmt = stmt.on_conflict_do_update(index_elements=pk, set_=update)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=pk)
+    db.execute(stmt, rows)
+
+
+def insert_new_rows(
+    db: Session,
+    model: Any,
+    rows: list[dict],
+    conflict_columns: Sequence[str] | None = None,
+    conflict_where: Any = None,
+) -> list[Any]:
+    """INSERT rows, silently skipping any that conflict (ON CONFLICT DO NOTHING).
+
+    Args:
+        db: Database session
+        model: Mapped class with a single-column primary key
+        rows: Column values; all rows must have the same keys
+        conflict_columns: Unique columns to check (default: the primary key)
+        conflict_where: Predicate of a partial unique index on conflict_columns
+
+    Returns:
+        Primary keys of the rows actually inserted
+    """
+    if not rows:
+        return []
+
+    pk = model.__table__.primary_key.columns
+    index_elements = list(conflict_columns or [c.name for c in pk])
+    stmt = (
+        _insert_for(db, model)
+        .on_conflict_do_nothing(index_elements=index_elements, index_where=conflict_where)
+        .returning(*pk)
+    )
+    return list(db.execute(stmt, rows).scalars())
@@ -0,0 +1,62 @@
+"""
+Dashboard version: a Redis counter bumped after every write the dashboard shows.
+
+GET /api/dashboard uses it as its ETag, so a client whose copy is current
+gets 304 Not Modified from one Redis round trip, without touching the
+database.
+
+The counter lives in a hash next to a random epoch, and the version is
+"{epoch}-{count}". If Redis loses the hash (a flush, or a restart without
+persistence) the next access seeds a new epoch, so counts starting over
+never reissue an ETag a client cached for different content.
+
+Writers call bump_dashboard_version() after committing: ingest routes, the
+persister, the worker, review and task actions, inbox entries and import.
+Both helpers fail open: while Redis is down the dashboard is served without
+an ETag, and a bump lost to an outage leaves cached copies stale only until
+the next write.
+"""
+
+import logging
+import uuid
+
+import redis
+
+from app.core import queue
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_VERSION_KEY = "lifeos:dashboard:version"
+
+
+def _seed_epoch(pipe) -> None:
+    # No-op while the hash exists; a missing hash gets a fresh epoch
+    pipe.hsetnx(DASHBOARD_VERSION_KEY, "epoch", uuid.uuid4().hex[:12])
+
+
+def bump_dashboard_version() -> None:
+    """Invalidate cached dashboards; call after committing a visible change."""
+    try:
+        pipe = queue.redis_client.pipeline()
+        _seed_epoch(pipe)
+        pipe.hincrby(DASHBOARD_VERSION_KEY, "count", 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not bump dashboard version: {e}")
+
+
+def dashboard_version() -> str | None:
+    """Current dashboard version ("{epoch}-{count}"), or None if Redis is unavailable."""
+    try:
+        pipe = queue.redis_client.pipeline()
+        _seed_epoch(pipe)
+        pipe.hmget(DASHBOARD_VERSION_KEY, ["epoch", "count"])
+        _, (epoch, count) = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not read dashboard version: {e}")
+        return None
+    return f"{epoch}-{count or 0}"
+
+
+def dashboard_etag(version: str) -> str:
+    return f'W/"dashboard-{version}"'
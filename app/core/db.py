@@ -1,15 +1,16 @@
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.pool import build_engine
+
 DATABASE_URL = os.environ["DATABASE_URL"]
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-)
+# Pool size/overflow/recycle/timeout come from DB_ROLE and DB_* (see app.core.pool)
+engine = build_engine(DATABASE_URL, "sync")
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -25,3 +26,55 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# -------------------------------------------------
+# Async engine (API request path)
+# -------------------------------------------------
+# Backend -> async driver used for DATABASE_URL when ASYNC_DATABASE_URL is unset
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Return the async-driver equivalent of a sync database URL.
+
+    postgresql:// and postgresql+psycopg:// map to psycopg 3's async mode;
+    sqlite:// maps to aiosqlite. Other URLs are returned unchanged.
+    """
+    driver = ASYNC_DRIVERS.get(make_url(url).get_backend_name())
+    if driver is None:
+        return url
+    # Swap only the scheme so the rest of the URL is kept verbatim
+    return driver + url[url.index("://") :]
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Return the async session factory, creating the engine on first use.
+
+    Created lazily so processes that only use the sync engine (the worker,
+    scripts) never import the async driver.
+    """
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_engine = build_engine(ASYNC_DATABASE_URL, "async", is_async=True)
+        # expire_on_commit=False: attributes stay readable after commit
+        # without an implicit (and, under asyncio, illegal) lazy refresh
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that provides an async database session."""
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,129 @@
+"""
+Idempotent ingest: dedup keys, a Redis fast path and the database backstop.
+
+Every ingested event gets a dedup key:
+
+    {source}:{key}                    an explicit key: the client's
+                                      Idempotency-Key header, Slack's event_id
+    {source}:sha256:{hex}             otherwise, a hash of the normalized
+                                      payload and the current time bucket
+
+The key is stored in raw_events.dedup_key (unique index, migration 005) and
+also determines raw_events.id (raw_event_id_for), so a duplicate that gets
+past the fast path still conflicts on insert instead of becoming a second
+row.
+
+The fast path is a SET NX with a short TTL: a duplicate arriving within
+IDEMPOTENCY_TTL is rejected before it reaches Postgres or the queue. If
+Redis is unavailable the check fails open and the unique index decides.
+
+Content hashes only dedupe within one IDEMPOTENCY_WINDOW bucket, so the same
+dictation sent again later (or across a bucket boundary) is a new event.
+Clients that need exact-once semantics should send an Idempotency-Key.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import unicodedata
+
+import redis
+
+from app.core import queue
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_PREFIX = "lifeos:idempotency:"
+
+# Seconds a dedup key is held in Redis (the fast path)
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "600"))
+
+# Width in seconds of the time bucket folded into content hashes
+IDEMPOTENCY_WINDOW = int(os.getenv("IDEMPOTENCY_WINDOW", "300"))
+
+# Longest accepted Idempotency-Key header
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def normalize_payload(payload: str | dict) -> str:
+    """Canonical form of a payload for hashing.
+
+    Text is NFC-normalized with whitespace runs collapsed; dicts are
+    serialized as sorted, compact JSON.
+    """
+    if isinstance(payload, dict):
+        return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return " ".join(unicodedata.normalize("NFC", payload).split())
+
+
+def dedup_key(
+    source: str, payload: str | dict, key: str | None = None, now: float | None = None
+) -> str:
+    """Dedup key for one ingested event.
+
+    Args:
+        source: raw_events.source
+        payload: Request payload (text or parsed JSON)
+        key: Explicit idempotency key; takes precedence over the content hash
+        now: Unix time used for the content-hash bucket (default: now)
+    """
+    if key:
+        return f"{source}:{key}"
+
+    bucket = int((time.time() if now is None else now) // IDEMPOTENCY_WINDOW)
+    content = f"{source}\0{normalize_payload(payload)}\0{bucket}"
+    return f"{source}:sha256:{hashlib.sha256(content.encode()).hexdigest()}"
+
+
+def claim(key: str) -> bool:
+    """Fast-path check: claim a dedup key for IDEMPOTENCY_TTL seconds.
+
+    Returns:
+        False if the key was already claimed (a duplicate), True otherwise,
+        including when Redis is unreachable
+    """
+    try:
+        return bool(
+            queue.redis_client.set(f"{IDEMPOTENCY_PREFIX}{key}", 1, nx=True, ex=IDEMPOTENCY_TTL)
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Idempotency fast path unavailable, relying on the database: {e}")
+        return True
+
+
+def release(key: str) -> None:
+    """Drop a claim so a retry of a failed request is not rejected."""
+    try:
+        queue.redis_client.delete(f"{IDEMPOTENCY_PREFIX}{key}")
+    except redis.RedisError as e:
+        logger.warning(f"Could not release idempotency key {key}: {e}")
+
+
+def claim_many(keys: list[str]) -> list[bool]:
+    """claim() for many keys in one pipelined round trip.
+
+    Returns:
+        One flag per key, in order (all True when Redis is unreachable)
+    """
+    if not keys:
+        return []
+    try:
+        pipe = queue.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(f"{IDEMPOTENCY_PREFIX}{key}", 1, nx=True, ex=IDEMPOTENCY_TTL)
+        return [bool(claimed) for claimed in pipe.execute()]
+    except redis.RedisError as e:
+        logger.warning(f"Idempotency fast path unavailable, relying on the database: {e}")
+        return [True] * len(keys)
+
+
+def release_many(keys: list[str]) -> None:
+    """release() for many keys in one round trip."""
+    if not keys:
+        return
+    try:
+        queue.redis_client.delete(*(f"{IDEMPOTENCY_PREFIX}{key}" for key in keys))
+    except redis.RedisError as e:
+        logger.warning(f"Could not release {len(keys)} idempotency keys: {e}")
@@ -0,0 +1,165 @@
+"""
+Queue lanes: named sub-queues of the raw-event queue with weighted fair dequeue.
+
+QUEUE_LANES lists the lanes and their weights, e.g.
+
+    QUEUE_LANES=interactive:8,dictation:4,slack:2,backfill:1
+
+Producers pick a lane with lane_for(): single dictation posts go to
+"interactive", other traffic to its source's lane, and bulk uploads marked
+as backfill to "backfill". The "default" lane is always present. It is the
+original un-laned queue key, so jobs enqueued before lanes existed (and
+sources without a lane) still drain.
+
+Workers share a LaneScheduler per process. It hands out dequeue slots by
+smooth weighted round robin over the lanes that currently have work, so
+with the weights above a backlog of 100k backfill jobs gets 1 slot in 9
+while only interactive work is also waiting (1 in 16, counting the default
+lane, when every lane is busy), and every slot when nothing else is. A lane
+found empty forfeits its banked credit, so it cannot starve the others when
+it refills.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+
+DEFAULT_LANE = "default"
+
+QUEUE_LANES = os.getenv("QUEUE_LANES", "interactive:8,dictation:4,slack:2,backfill:1")
+
+INTERACTIVE_LANE = "interactive"
+BACKFILL_LANE = "backfill"
+
+
+def parse_lanes(spec: str) -> dict[str, int]:
+    """Parse "name:weight,..." into {name: weight}, adding the default lane.
+
+    A lane without a weight gets 1. The default lane keeps weight 1 unless
+    listed.
+
+    Raises:
+        ValueError: On a malformed entry or a weight below 1
+    """
+    lanes: dict[str, int] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = entry.partition(":")
+        try:
+            lanes[name.strip()] = int(weight) if weight else 1
+        except ValueError:
+            raise ValueError(f"Invalid QUEUE_LANES entry: {entry!r}") from None
+        if lanes[name.strip()] < 1:
+            raise ValueError(f"Lane weight must be >= 1: {entry!r}")
+    lanes.setdefault(DEFAULT_LANE, 1)
+    return lanes
+
+
+LANE_WEIGHTS = parse_lanes(QUEUE_LANES)
+
+
+def lane_for(source: str, interactive: bool = False, backfill: bool = False) -> str:
+    """Pick the lane for a job from its source and how it arrived.
+
+    Args:
+        source: raw_events.source ('dictation', 'slack', ...)
+        interactive: A person is waiting on this one event (single dictation post)
+        backfill: Bulk or historical load that may wait behind live traffic
+
+    Returns:
+        A configured lane name (DEFAULT_LANE if the preferred one is not)
+    """
+    if backfill:
+        preferred = BACKFILL_LANE
+    elif interactive:
+        preferred = INTERACTIVE_LANE
+    else:
+        preferred = source
+    return preferred if preferred in LANE_WEIGHTS else DEFAULT_LANE
+
+
+class LaneScheduler:
+    """Smooth weighted round robin over lanes, skipping lanes with no work.
+
+    Thread-safe; one instance is shared by all worker threads of a process.
+    """
+
+    def __init__(self, weights: dict[str, int] | None = None) -> None:
+        self.weights = dict(weights or LANE_WEIGHTS)
+        self._credit = dict.fromkeys(self.weights, 0)
+        self._lock = threading.Lock()
+
+    def allocate(self, slots: int, depths: dict[str, int]) -> dict[str, int]:
+        """Split `slots` dequeue slots across lanes by weight.
+
+        Args:
+            slots: Jobs wanted
+            depths: Jobs ready per lane; a lane gets at most its depth
+
+        Returns:
+            {lane: jobs to take}, omitting lanes that get none
+        """
+        remaining = {lane: depths.get(lane, 0) for lane in self.weights}
+        quotas: dict[str, int] = {}
+        with self._lock:
+            for lane, depth in remaining.items():
+                if depth <= 0:
+                    self._credit[lane] = 0
+            for _ in range(slots):
+                ready = [lane for lane, depth in remaining.items() if depth > 0]
+                if not ready:
+                    break
+                for lane in ready:
+                    self._credit[lane] += self.weights[lane]
+                chosen = max(ready, key=lambda lane: self._credit[lane])
+                self._credit[chosen] -= sum(self.weights[lane] for lane in ready)
+                remaining[chosen] -= 1
+                quotas[chosen] = quotas.get(chosen, 0) + 1
+        return quotas
+
+    def preference(self) -> list[str]:
+        """Lanes in the order the next slot would favor them (for blocking waits)."""
+        with self._lock:
+            return sorted(
+                self.weights,
+                key=lambda lane: (self._credit[lane] + self.weights[lane], self.weights[lane]),
+                reverse=True,
+            )
+
+
+@dataclass
+class LaneWait:
+    """Queue wait observed by this process's workers for one lane."""
+
+    popped: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class LaneMetrics:
+    """Per-lane counts and enqueue-to-pop wait times, recorded at dequeue."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lanes: dict[str, LaneWait] = {}
+
+    def record(self, lane: str, wait_seconds: float) -> None:
+        wait_seconds = max(0.0, wait_seconds)
+        with self._lock:
+            stats = self._lanes.setdefault(lane, LaneWait())
+            stats.popped += 1
+            stats.wait_seconds_total += wait_seconds
+            stats.wait_seconds_max = max(stats.wait_seconds_max, wait_seconds)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                lane: {
+                    "popped": s.popped,
+                    "wait_ms_avg": round(1000 * s.wait_seconds_total / s.popped, 3),
+                    "wait_ms_max": round(1000 * s.wait_seconds_max, 3),
+                }
+                for lane, s in self._lanes.items()
+            }
+
+
+lane_metrics = LaneMetrics()
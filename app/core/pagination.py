@@ -0,0 +1,70 @@
+"""
+Keyset pagination helpers.
+
+List endpoints page by (created_at, id) descending. The cursor is an opaque
+URL-safe token holding the sort key of the last row returned; the next page
+asks for rows strictly "older" than it, which stays fast and stable no
+matter how deep the client pages or how many rows arrive meanwhile.
+
+Lists that span several statuses (GET /api/tasks) sort by status first and
+carry it in the cursor too (encode_status_cursor / decode_status_cursor).
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _encode(values: list) -> str:
+    data = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(values, list):
+        raise ValueError("cursor is not a list")
+    return values
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Build the cursor pointing just past the given row."""
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Parse a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the token is malformed
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_status_cursor(status: str, created_at: datetime, row_id: str) -> str:
+    """Build a (status, created_at, id) cursor pointing just past the given row."""
+    return _encode([status, created_at.isoformat(), row_id])
+
+
+def decode_status_cursor(cursor: str) -> tuple[str, datetime, str]:
+    """Parse a cursor produced by encode_status_cursor.
+
+    Raises:
+        HTTPException: 400 if the token is malformed
+    """
+    try:
+        status, created_at, row_id = _decode(cursor)
+        return str(status), datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
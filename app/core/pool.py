@@ -0,0 +1,244 @@
+"""
+Connection pool configuration and instrumentation for app.core.db.
+
+Pool settings are resolved per process role (DB_ROLE: api | worker), so the
+API and the worker can size their pools independently. Each setting is read
+from, in order:
+
+    {ROLE}_DB_POOL_SIZE   e.g. WORKER_DB_POOL_SIZE
+    DB_POOL_SIZE
+    the role default (ROLE_DEFAULTS)
+
+and likewise for DB_MAX_OVERFLOW, DB_POOL_RECYCLE and DB_POOL_TIMEOUT.
+
+DB_POOLING=pgbouncer selects transaction-pooling mode for deployments behind
+PgBouncer: the app keeps no pool of its own (NullPool, PgBouncer does the
+pooling) and psycopg's automatic server-side prepared statements are
+disabled, since consecutive transactions may land on different backends.
+
+Engines created with build_engine() record checkouts, checkout wait time,
+timeouts, new connections, pre-ping failures and invalidations;
+pool_metrics() returns them with live pool gauges for /metrics/db and the
+worker's periodic log line.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from sqlalchemy import create_engine, event, exc, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+DB_ROLE = os.getenv("DB_ROLE", "api")
+
+# default | pgbouncer
+DB_POOLING = os.getenv("DB_POOLING", "default")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Sizing for one engine's connection pool."""
+
+    pool_size: int
+    max_overflow: int
+    pool_recycle: int  # seconds before a connection is replaced; -1 disables
+    pool_timeout: float  # seconds to wait for a free connection
+
+
+# The API serves bursts of short requests; the worker holds roughly one
+# connection per WORKER_CONCURRENCY thread
+ROLE_DEFAULTS = {
+    "api": PoolSettings(pool_size=10, max_overflow=20, pool_recycle=1800, pool_timeout=10.0),
+    "worker": PoolSettings(pool_size=5, max_overflow=5, pool_recycle=1800, pool_timeout=30.0),
+}
+
+_ENV_NAMES = {
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_recycle": "DB_POOL_RECYCLE",
+    "pool_timeout": "DB_POOL_TIMEOUT",
+}
+
+
+def pool_settings(role: str = DB_ROLE) -> PoolSettings:
+    """Resolve pool settings for a process role from the environment.
+
+    Raises:
+        ValueError: If role is not one of ROLE_DEFAULTS
+    """
+    if role not in ROLE_DEFAULTS:
+        raise ValueError(f"Unknown DB_ROLE: {role} (expected one of {sorted(ROLE_DEFAULTS)})")
+
+    defaults = ROLE_DEFAULTS[role]
+    values: dict[str, Any] = {}
+    for f in fields(PoolSettings):
+        env = _ENV_NAMES[f.name]
+        raw = os.getenv(f"{role.upper()}_{env}", os.getenv(env))
+        default = getattr(defaults, f.name)
+        values[f.name] = type(default)(raw) if raw is not None else default
+    return PoolSettings(**values)
+
+
+def engine_options(url: str, role: str = DB_ROLE, is_async: bool = False) -> dict[str, Any]:
+    """Return create_engine / create_async_engine keyword arguments.
+
+    SQLite keeps SQLAlchemy's default pool (sizing does not apply to it);
+    PostgreSQL gets the role's QueuePool settings, or NullPool in pgbouncer
+    mode.
+    """
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {"pool_pre_ping": True}
+
+    if DB_POOLING == "pgbouncer":
+        options: dict[str, Any] = {"poolclass": NullPool}
+        if backend == "postgresql":
+            options["connect_args"] = {"prepare_threshold": None}
+        return options
+
+    settings = pool_settings(role)
+    return {
+        "poolclass": AsyncAdaptedQueuePool if is_async else QueuePool,
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_recycle": settings.pool_recycle,
+        "pool_timeout": settings.pool_timeout,
+        "pool_pre_ping": True,
+    }
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one engine's pool, updated from pool events."""
+
+    name: str
+    role: str
+    checkouts: int = 0
+    connects: int = 0
+    timeouts: int = 0
+    pre_ping_failures: int = 0
+    invalidations: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    waits: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        """Counters plus live gauges (checked out, overflow in use) from pool."""
+        with self._lock:
+            data: dict[str, Any] = {
+                "role": self.role,
+                "pooling": DB_POOLING,
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+                "wait_ms_avg": round(1000 * self.wait_seconds_total / self.waits, 3)
+                if self.waits
+                else 0.0,
+                "wait_ms_max": round(1000 * self.wait_seconds_max, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data["pool_size"] = pool.size()
+            data["checked_out"] = pool.checkedout()
+            # overflow() counts down from -pool_size until the pool is full
+            data["overflow_in_use"] = max(0, pool.overflow())
+        return data
+
+
+class _TimedCheckout:
+    """Pool mixin timing how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return record
+
+
+def timed_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """Subclass a pool class so checkouts report wait time to metrics.
+
+    A class rather than an event because pools have no "waiting" hook, and
+    because Pool.recreate() (engine.dispose()) rebuilds from self.__class__,
+    which keeps the binding.
+    """
+    return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"metrics": metrics})
+
+
+def _attach_events(engine: Engine, metrics: PoolMetrics) -> None:
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        if context.is_pre_ping:
+            metrics.incr("pre_ping_failures")
+
+
+# engine name -> (engine, metrics)
+_REGISTRY: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def build_engine(url: str, name: str, role: str = DB_ROLE, is_async: bool = False) -> Any:
+    """Create an instrumented Engine (or AsyncEngine) and register its metrics.
+
+    Args:
+        url: Database URL
+        name: Key for this engine in pool_metrics(), e.g. 'sync' or 'async'
+        role: Process role whose pool settings to use
+        is_async: Build with create_async_engine
+    """
+    metrics = PoolMetrics(name=name, role=role)
+    options = engine_options(url, role, is_async)
+    if "poolclass" in options:
+        options["poolclass"] = timed_pool_class(options["poolclass"], metrics)
+
+    engine: Engine | AsyncEngine
+    if is_async:
+        engine = create_async_engine(url, **options)
+        sync_engine = engine.sync_engine
+    else:
+        engine = sync_engine = create_engine(url, **options)
+
+    _attach_events(sync_engine, metrics)
+    _REGISTRY[name] = (sync_engine, metrics)
+    return engine
+
+
+def pool_metrics() -> dict[str, dict[str, Any]]:
+    """Return a metrics snapshot for every engine built in this process."""
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in _REGISTRY.items()}
@@ -1,24 +1,735 @@
+"""
+Redis queues: the raw-event job queue and the fast-ack ingest buffer.
+
+The raw-event queue carries {"raw_event_id": ...} jobs from the ingest
+routes (and app.persister) to app.worker. QUEUE_BACKEND selects how:
+
+    list    LPUSH / BRPOP on lifeos:raw_events (default). QUEUE_RELIABLE adds
+            per-worker processing lists, a visibility timeout reaper and a
+            dead-letter list.
+    stream  XADD / XREADGROUP / XACK on lifeos:raw_events:stream with one
+            consumer group, so any number of worker nodes share the work.
+            Delivered jobs stay in the pending entries list until acked
+            (inspectable with XPENDING), stale ones are reclaimed with
+            XCLAIM, and acked entries are kept for replay until trimmed.
+
+Both backends split the queue into lanes (app.core.lanes): one list or
+stream per lane, drained by weighted fair dequeue so a backfill cannot hold
+up interactive work. The "default" lane uses the keys above.
+
+Callers use the module functions (enqueue_raw_event, pop_raw_events,
+ack_raw_event, ...), which delegate to the selected backend.
+"""
+
 import json
 import os
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any, Protocol
 
 import redis
 
+from app.core.lanes import DEFAULT_LANE, LaneScheduler, lane_metrics
+
 REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
 REDIS_PORT = os.environ.get("REDIS_PORT", "6379")
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 QUEUE_NAME = "lifeos:raw_events"
 
+# list | stream
+QUEUE_BACKEND = os.environ.get("QUEUE_BACKEND", "list")
+
+# Reliable mode: popped jobs are moved into a per-worker processing list and
+# only removed on ack, so a crash between pop and commit cannot lose an event.
+# (The stream backend is always reliable.)
+RELIABLE_QUEUE = os.environ.get("QUEUE_RELIABLE", "false").lower() in ("1", "true", "yes")
+VISIBILITY_TIMEOUT = int(os.environ.get("QUEUE_VISIBILITY_TIMEOUT", "300"))
+MAX_DELIVERY_ATTEMPTS = int(os.environ.get("QUEUE_MAX_ATTEMPTS", "5"))
+
+PROCESSING_PREFIX = f"{QUEUE_NAME}:processing:"
+INFLIGHT_KEY = f"{QUEUE_NAME}:inflight"  # zset: "<processing list>|<job>" -> claim time
+ATTEMPTS_KEY = f"{QUEUE_NAME}:attempts"  # hash: job -> failed deliveries
+DEAD_LETTER_QUEUE = f"{QUEUE_NAME}:dead"  # shared by both backends
+EVENT_CLAIM_PREFIX = f"{QUEUE_NAME}:claim:"  # raw_event_id -> held while a worker builds it
+
+QUEUE_STREAM = f"{QUEUE_NAME}:stream"
+QUEUE_STREAM_GROUP = "workers"
+STREAM_REAPER_CONSUMER = "reaper"
+
+# Stream trimming: acked entries are kept for replay for this many seconds,
+# and dropped sooner if the stream grows past QUEUE_STREAM_MAXLEN (0 = no
+# cap). Entries still pending or not yet delivered are never trimmed.
+QUEUE_STREAM_RETENTION = int(os.environ.get("QUEUE_STREAM_RETENTION", "86400"))
+QUEUE_STREAM_MAXLEN = int(os.environ.get("QUEUE_STREAM_MAXLEN", "100000"))
+
+# Max stale stream entries reclaimed per reaper pass
+STREAM_REAP_BATCH = 100
+
+# Consumers (one per worker thread) idle this long with nothing pending are
+# removed from the group, so restarts do not accumulate dead consumers
+STREAM_CONSUMER_IDLE_TIMEOUT = 3600
+
+# Reliable list mode can only block on one lane at a time (BLMOVE takes a
+# single key), so an idle worker re-checks the other lanes this often
+LANE_POLL_INTERVAL = 0.25
+
+# Fast-ack ingest: verified request bodies are buffered on a stream and
+# written to raw_events in batches by app.persister
+INGEST_STREAM = "lifeos:ingest"
+INGEST_GROUP = "persisters"
+
 redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 
 
-def enqueue_raw_event(raw_event_id: str):
-    payload = {"raw_event_id": raw_event_id}
-    redis_client.lpush(QUEUE_NAME, json.dumps(payload))
+def buffer_ingest(source: str, payload: str, dedup_key: str | None = None) -> None:
+    """Append a verified ingest payload to the ingest stream.
+
+    Args:
+        source: raw_events.source for the persisted row
+        payload: raw_events.payload
+        dedup_key: Idempotency key of the event (see app.core.idempotency);
+            the persister derives the row id from it
+    """
+    fields = {"source": source, "payload": payload}
+    if dedup_key:
+        fields["dedup_key"] = dedup_key
+    redis_client.xadd(INGEST_STREAM, fields)
+
+
+def ensure_ingest_group() -> None:
+    """Create the persister consumer group (and the stream) if missing."""
+    try:
+        redis_client.xgroup_create(INGEST_STREAM, INGEST_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def read_ingest_buffer(
+    consumer: str, count: int, block_ms: int = 1000, claim_idle_ms: int = 60_000
+) -> list[tuple[str, dict]]:
+    """Read up to `count` buffered payloads for a persister.
+
+    Entries stay pending in the consumer group until ack_ingest(), so a
+    persister that dies mid-batch loses nothing: entries pending longer than
+    claim_idle_ms are claimed by the next persister to read.
+
+    Returns:
+        (entry id, fields) pairs, oldest first
+    """
+    _, claimed, *_ = redis_client.xautoclaim(
+        INGEST_STREAM, INGEST_GROUP, consumer, min_idle_time=claim_idle_ms, count=count
+    )
+    entries = [(entry_id, fields) for entry_id, fields in claimed if fields]
+    if entries:
+        return entries
+
+    response = redis_client.xreadgroup(
+        INGEST_GROUP, consumer, {INGEST_STREAM: ">"}, count=count, block=block_ms
+    )
+    return [entry for _, stream_entries in response or [] for entry in stream_entries]
+
+
+def ack_ingest(entry_ids: list[str]) -> None:
+    """Acknowledge persisted entries and remove them from the stream."""
+    if not entry_ids:
+        return
+    pipe = redis_client.pipeline()
+    pipe.xack(INGEST_STREAM, INGEST_GROUP, *entry_ids)
+    pipe.xdel(INGEST_STREAM, *entry_ids)
+    pipe.execute()
+
+
+def processing_list(worker_id: str) -> str:
+    return f"{PROCESSING_PREFIX}{worker_id}"
+
+
+def _reply_str(reply: object) -> str:
+    """Narrow a Redis reply to str (the client uses decode_responses=True)."""
+    if not isinstance(reply, str):
+        raise TypeError(f"Expected a decoded Redis reply, got {type(reply).__name__}")
+    return reply
+
+
+def lane_key(lane: str) -> str:
+    """Redis list for a lane; the default lane is the original QUEUE_NAME."""
+    return QUEUE_NAME if lane == DEFAULT_LANE else f"{QUEUE_NAME}:lane:{lane}"
+
+
+def lane_stream(lane: str) -> str:
+    """Redis stream for a lane; the default lane is QUEUE_STREAM."""
+    return QUEUE_STREAM if lane == DEFAULT_LANE else f"{QUEUE_STREAM}:lane:{lane}"
+
+
+def _job_data(raw_event_id: str, lane: str = DEFAULT_LANE) -> str:
+    return json.dumps({"raw_event_id": raw_event_id, "lane": lane, "enqueued_at": time.time()})
+
+
+class RawEventQueue(Protocol):
+    """Backend for the raw-event job queue (see the module docstring)."""
+
+    name: str
+    scheduler: LaneScheduler
+
+    @property
+    def reliable(self) -> bool:
+        """Whether popped jobs must be acked and a reaper should run."""
+        ...
+
+    def enqueue(self, raw_event_ids: list[str], lane: str = DEFAULT_LANE) -> None: ...
+
+    def pop(self, timeout: float, worker_id: str) -> dict | None: ...
+
+    def pop_many(self, max_items: int, timeout: float, worker_id: str) -> list[dict]: ...
+
+    def ack(self, job: dict) -> None: ...
+
+    def nack(self, job: dict) -> bool: ...
+
+    def requeue_stale(self, visibility_timeout: int) -> int: ...
+
+    def trim(self) -> int: ...
+
+    def stats(self) -> dict: ...
+
+
+class ListQueueBackend:
+    """Redis lists, one per lane: LPUSH / RPOP, or LMOVE into processing lists when reliable.
+
+    Each pop reads every lane's depth and takes jobs by the scheduler's
+    weights in one pipelined round trip each. When all lanes are empty it
+    blocks with BRPOP across the lanes (or, in reliable mode, BLMOVE on the
+    preferred lane in LANE_POLL_INTERVAL slices, since BLMOVE takes one key).
+    """
+
+    name = "list"
+
+    def __init__(self, scheduler: LaneScheduler | None = None) -> None:
+        self.scheduler = scheduler or LaneScheduler()
+
+    @property
+    def reliable(self) -> bool:
+        return RELIABLE_QUEUE
+
+    def enqueue(self, raw_event_ids: list[str], lane: str = DEFAULT_LANE) -> None:
+        # One multi-value LPUSH, however many ids
+        redis_client.lpush(lane_key(lane), *(_job_data(i, lane) for i in raw_event_ids))
+
+    def _job(self, data: str, processing: str | None = None) -> dict:
+        job: dict = json.loads(data)
+        if "enqueued_at" in job:
+            lane_metrics.record(job.get("lane", DEFAULT_LANE), time.time() - job["enqueued_at"])
+        if processing:
+            job["receipt"] = data
+            job["processing_list"] = processing
+        return job
+
+    def _track(self, items: list[str], processing: str) -> list[dict]:
+        if not items:
+            return []
+        now = time.time()
+        redis_client.zadd(INFLIGHT_KEY, {f"{processing}|{data}": now for data in items})
+        return [self._job(data, processing) for data in items]
+
+    def _take(self, max_items: int, worker_id: str) -> list[dict]:
+        """Non-blocking weighted pop across lanes."""
+        lanes = list(self.scheduler.weights)
+        pipe = redis_client.pipeline(transaction=False)
+        for lane in lanes:
+            pipe.llen(lane_key(lane))
+        quotas = self.scheduler.allocate(max_items, dict(zip(lanes, pipe.execute(), strict=True)))
+        if not quotas:
+            return []
+
+        pipe = redis_client.pipeline(transaction=False)
+        if not RELIABLE_QUEUE:
+            for lane, count in quotas.items():
+                pipe.rpop(lane_key(lane), count)
+            return [self._job(data) for popped in pipe.execute() for data in popped or []]
+
+        processing = processing_list(worker_id)
+        for lane, count in quotas.items():
+            for _ in range(count):
+                pipe.lmove(lane_key(lane), processing, "RIGHT", "LEFT")
+        moved = [_reply_str(data) for data in pipe.execute() if data is not None]
+        return self._track(moved, processing)
+
+    def _block(self, timeout: float, worker_id: str) -> list[dict]:
+        """Wait up to `timeout` seconds for the first job on any lane."""
+        keys = [lane_key(lane) for lane in self.scheduler.preference()]
+        if not RELIABLE_QUEUE:
+            item = redis_client.brpop(keys, timeout=timeout)
+            return [self._job(item[1])] if item else []
+
+        processing = processing_list(worker_id)
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            moved = redis_client.blmove(
+                keys[0], processing, min(remaining, LANE_POLL_INTERVAL), "RIGHT", "LEFT"
+            )
+            if moved is not None:
+                return self._track([_reply_str(moved)], processing)
+            jobs = self._take(1, worker_id)
+            if jobs:
+                return jobs
+        return []
+
+    def pop(self, timeout: float, worker_id: str) -> dict | None:
+        jobs = self.pop_many(1, timeout, worker_id)
+        return jobs[0] if jobs else None
+
+    def pop_many(self, max_items: int, timeout: float, worker_id: str) -> list[dict]:
+        jobs = self._take(max_items, worker_id)
+        if jobs:
+            return jobs
+        jobs = self._block(timeout, worker_id)
+        if jobs and max_items > len(jobs):
+            jobs += self._take(max_items - len(jobs), worker_id)
+        return jobs
+
+    def ack(self, job: dict) -> None:
+        if "receipt" not in job:
+            return
+        data, processing = job["receipt"], job["processing_list"]
+
+        pipe = redis_client.pipeline()
+        pipe.lrem(processing, 1, data)
+        pipe.zrem(INFLIGHT_KEY, f"{processing}|{data}")
+        pipe.hdel(ATTEMPTS_KEY, data)
+        pipe.execute()
+
+    def nack(self, job: dict) -> bool:
+        if "receipt" not in job:
+            return False
+        return self._release(job["processing_list"], job["receipt"])
+
+    def _release(self, processing: str, data: str) -> bool:
+        redis_client.zrem(INFLIGHT_KEY, f"{processing}|{data}")
+
+        # Whoever removes the item from the processing list owns the re-queue;
+        # this keeps a racing reaper and worker from delivering it twice.
+        if not redis_client.lrem(processing, 1, data):
+            return False
+
+        attempts = redis_client.hincrby(ATTEMPTS_KEY, data, 1)
+        if attempts >= MAX_DELIVERY_ATTEMPTS:
+            pipe = redis_client.pipeline()
+            pipe.lpush(DEAD_LETTER_QUEUE, data)
+            pipe.hdel(ATTEMPTS_KEY, data)
+            pipe.execute()
+            return False
+
+        redis_client.lpush(lane_key(json.loads(data).get("lane", DEFAULT_LANE)), data)
+        return True
+
+    def requeue_stale(self, visibility_timeout: int) -> int:
+        # Jobs found in a processing list without a claim time (worker died
+        # between BLMOVE and ZADD) are stamped now and reaped on a later pass
+        now = time.time()
+
+        for processing in redis_client.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+            for data in redis_client.lrange(processing, 0, -1):
+                redis_client.zadd(INFLIGHT_KEY, {f"{processing}|{data}": now}, nx=True)
+
+        requeued = 0
+        for member in redis_client.zrangebyscore(INFLIGHT_KEY, "-inf", now - visibility_timeout):
+            processing, _, data = member.partition("|")
+            if self._release(processing, data):
+                requeued += 1
+        return requeued
+
+    def trim(self) -> int:
+        # Popped jobs leave the list; nothing accumulates
+        return 0
+
+    def stats(self) -> dict:
+        lanes = list(self.scheduler.weights)
+        pipe = redis_client.pipeline(transaction=False)
+        for lane in lanes:
+            pipe.llen(lane_key(lane))
+            pipe.lindex(lane_key(lane), -1)  # oldest job
+        pipe.zcard(INFLIGHT_KEY)
+        pipe.llen(DEAD_LETTER_QUEUE)
+        *per_lane, in_flight, dead = pipe.execute()
+
+        now = time.time()
+        lane_stats = {}
+        for i, lane in enumerate(lanes):
+            depth, oldest = per_lane[2 * i], per_lane[2 * i + 1]
+            enqueued_at = json.loads(oldest).get("enqueued_at") if oldest else None
+            lane_stats[lane] = {
+                "weight": self.scheduler.weights[lane],
+                "depth": depth,
+                "oldest_wait_s": round(now - enqueued_at, 3) if enqueued_at else 0.0,
+            }
+        return {
+            "backend": self.name,
+            "reliable": RELIABLE_QUEUE,
+            "depth": sum(s["depth"] for s in lane_stats.values()),
+            "in_flight": in_flight,
+            "dead_letter": dead,
+            "lanes": lane_stats,
+        }
+
+
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class StreamQueueBackend:
+    """Redis streams, one per lane, with a consumer group: XADD / XREADGROUP / XACK / XCLAIM.
+
+    Each entry is delivered to one consumer of QUEUE_STREAM_GROUP and stays
+    pending until acked. Retries are new entries carrying an attempt count;
+    the original is acked, and the entry ack'd by whoever gets there first
+    (worker nack or reaper) owns the retry, so a job is never re-queued twice.
+
+    Pops read each lane's lag (undelivered entries) and take jobs by the
+    scheduler's weights; when all lanes are empty one XREADGROUP blocks on
+    every lane stream. Entries it returns beyond what the caller asked for
+    are already pending on this consumer, so they are kept for its next pop.
+    """
+
+    name = "stream"
+    reliable = True
+
+    def __init__(self, scheduler: LaneScheduler | None = None) -> None:
+        self.scheduler = scheduler or LaneScheduler()
+        self._groups_ready = False
+        self._overflow: dict[str, list[dict]] = {}
+
+    @property
+    def streams(self) -> dict[str, str]:
+        return {lane: lane_stream(lane) for lane in self.scheduler.weights}
+
+    def _ensure_groups(self) -> None:
+        if self._groups_ready:
+            return
+        for stream in self.streams.values():
+            try:
+                redis_client.xgroup_create(stream, QUEUE_STREAM_GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+
+    def _group_call(self, fn: Callable[[], Any]) -> Any:
+        """Run consumer-group commands, recreating the groups if they vanished."""
+        self._ensure_groups()
+        try:
+            return fn()
+        except redis.ResponseError as e:
+            if "NOGROUP" not in str(e) and "no such key" not in str(e):
+                raise
+            self._groups_ready = False
+            self._ensure_groups()
+            return fn()
+
+    @staticmethod
+    def _job(lane: str, entry_id: str, fields: dict) -> dict:
+        lane_metrics.record(lane, time.time() - _stream_id(entry_id)[0] / 1000)
+        return {
+            "raw_event_id": fields["raw_event_id"],
+            "lane": lane,
+            "receipt": entry_id,
+            "attempts": int(fields.get("attempts", 0)),
+        }
+
+    def _jobs(self, response) -> list[dict]:
+        lanes = {stream: lane for lane, stream in self.streams.items()}
+        return [
+            self._job(lanes[stream], entry_id, fields)
+            for stream, entries in response or []
+            for entry_id, fields in entries
+        ]
+
+    def enqueue(self, raw_event_ids: list[str], lane: str = DEFAULT_LANE) -> None:
+        pipe = redis_client.pipeline(transaction=False)
+        for raw_event_id in raw_event_ids:
+            pipe.xadd(lane_stream(lane), {"raw_event_id": raw_event_id})
+        pipe.execute()
+
+    def _group_infos(self) -> dict[str, dict]:
+        def read() -> list:
+            pipe = redis_client.pipeline(transaction=False)
+            for stream in self.streams.values():
+                pipe.xinfo_groups(stream)
+            return pipe.execute()
+
+        return {
+            lane: next(g for g in groups if g["name"] == QUEUE_STREAM_GROUP)
+            for lane, groups in zip(self.streams, self._group_call(read), strict=True)
+        }
+
+    def _take(self, max_items: int, worker_id: str) -> list[dict]:
+        """Non-blocking weighted read across lanes."""
+        # lag is None when Redis cannot tell (e.g. after XDEL); assume work
+        depths = {
+            lane: max_items if info.get("lag") is None else info["lag"]
+            for lane, info in self._group_infos().items()
+        }
+        quotas = self.scheduler.allocate(max_items, depths)
+        if not quotas:
+            return []
+
+        pipe = redis_client.pipeline(transaction=False)
+        for lane, count in quotas.items():
+            pipe.xreadgroup(QUEUE_STREAM_GROUP, worker_id, {lane_stream(lane): ">"}, count=count)
+        return [job for response in pipe.execute() for job in self._jobs(response)]
+
+    def pop(self, timeout: float, worker_id: str) -> dict | None:
+        jobs = self.pop_many(1, timeout, worker_id)
+        return jobs[0] if jobs else None
+
+    def pop_many(self, max_items: int, timeout: float, worker_id: str) -> list[dict]:
+        max_items = max(1, max_items)
+        jobs = self._overflow.pop(worker_id, [])
+        if len(jobs) < max_items:
+            jobs += self._take(max_items - len(jobs), worker_id)
+        if not jobs:
+            response = self._group_call(
+                lambda: redis_client.xreadgroup(
+                    QUEUE_STREAM_GROUP,
+                    worker_id,
+                    {stream: ">" for stream in self.streams.values()},
+                    count=1,
+                    block=int(timeout * 1000),
+                )
+            )
+            jobs = self._jobs(response)
+            if jobs and len(jobs) < max_items:
+                jobs += self._take(max_items - len(jobs), worker_id)
+        if len(jobs) > max_items:
+            self._overflow[worker_id] = jobs[max_items:]
+            jobs = jobs[:max_items]
+        return jobs
+
+    def ack(self, job: dict) -> None:
+        if "receipt" not in job:
+            return
+        redis_client.xack(lane_stream(job["lane"]), QUEUE_STREAM_GROUP, job["receipt"])
+
+    def nack(self, job: dict) -> bool:
+        if "receipt" not in job:
+            return False
+        return self._release(
+            job["lane"], job["receipt"], job["raw_event_id"], job.get("attempts", 0)
+        )
+
+    def _release(self, lane: str, entry_id: str, raw_event_id: str, attempts: int) -> bool:
+        # Write the retry (or dead letter) before acking so a crash in between
+        # can only duplicate the job, never lose it; undo it if the ack shows
+        # someone else already released the entry.
+        stream = lane_stream(lane)
+        attempts += 1
+        if attempts >= MAX_DELIVERY_ATTEMPTS:
+            data = _job_data(raw_event_id, lane)
+            redis_client.lpush(DEAD_LETTER_QUEUE, data)
+            if not redis_client.xack(stream, QUEUE_STREAM_GROUP, entry_id):
+                redis_client.lrem(DEAD_LETTER_QUEUE, 1, data)
+            return False
+
+        retry_id = redis_client.xadd(stream, {"raw_event_id": raw_event_id, "attempts": attempts})
+        if not redis_client.xack(stream, QUEUE_STREAM_GROUP, entry_id):
+            redis_client.xdel(stream, retry_id)
+            return False
+        return True
+
+    def requeue_stale(self, visibility_timeout: int) -> int:
+        idle_ms = max(0, visibility_timeout) * 1000
+        requeued = 0
+        for lane, stream in self.streams.items():
+            stale = self._group_call(
+                partial(
+                    redis_client.xpending_range,
+                    stream,
+                    QUEUE_STREAM_GROUP,
+                    min="-",
+                    max="+",
+                    count=STREAM_REAP_BATCH,
+                    idle=idle_ms or None,
+                )
+            )
+            if stale:
+                # XCLAIM re-checks the idle time, so an entry acked or claimed
+                # since XPENDING is skipped
+                claimed = redis_client.xclaim(
+                    stream,
+                    QUEUE_STREAM_GROUP,
+                    STREAM_REAPER_CONSUMER,
+                    idle_ms,
+                    [entry["message_id"] for entry in stale],
+                )
+                for entry_id, fields in claimed:
+                    if not fields:
+                        # Deleted while pending: nothing left to retry
+                        redis_client.xack(stream, QUEUE_STREAM_GROUP, entry_id)
+                    elif self._release(
+                        lane, entry_id, fields["raw_event_id"], int(fields.get("attempts", 0))
+                    ):
+                        requeued += 1
+
+            for consumer in redis_client.xinfo_consumers(stream, QUEUE_STREAM_GROUP):
+                idle = consumer["idle"] > STREAM_CONSUMER_IDLE_TIMEOUT * 1000
+                if not consumer["pending"] and idle:
+                    redis_client.xgroup_delconsumer(stream, QUEUE_STREAM_GROUP, consumer["name"])
+        return requeued
+
+    def trim(self) -> int:
+        """Apply the retention / length policy to every lane; returns entries removed."""
+        cutoff = f"{int((time.time() - QUEUE_STREAM_RETENTION) * 1000)}-0"
+        removed = 0
+        for lane, group in self._group_infos().items():
+            stream = lane_stream(lane)
+
+            # Everything before the oldest pending entry and the last
+            # delivered one has been acked
+            floor = group["last-delivered-id"]
+            if group["pending"]:
+                pending = redis_client.xpending(stream, QUEUE_STREAM_GROUP)
+                floor = min(floor, pending["min"], key=_stream_id)
+
+            removed += redis_client.xtrim(
+                stream, minid=min(floor, cutoff, key=_stream_id), approximate=False
+            )
+            if QUEUE_STREAM_MAXLEN and redis_client.xlen(stream) > QUEUE_STREAM_MAXLEN:
+                removed += redis_client.xtrim(stream, minid=floor, approximate=False)
+        return removed
+
+    def stats(self) -> dict:
+        now_ms = time.time() * 1000
+        lane_stats = {}
+        for lane, group in self._group_infos().items():
+            stream = lane_stream(lane)
+            # Oldest undelivered entry: the first after the last delivered one
+            after = group["last-delivered-id"]
+            oldest = redis_client.xrange(stream, min=f"({after}", max="+", count=1)
+            lane_stats[lane] = {
+                "weight": self.scheduler.weights[lane],
+                "length": redis_client.xlen(stream),
+                "pending": group["pending"],
+                "lag": group.get("lag"),
+                "consumers": group["consumers"],
+                "oldest_wait_s": round((now_ms - _stream_id(oldest[0][0])[0]) / 1000, 3)
+                if oldest
+                else 0.0,
+            }
+        lags = [s["lag"] for s in lane_stats.values()]
+        return {
+            "backend": self.name,
+            "reliable": True,
+            "length": sum(s["length"] for s in lane_stats.values()),
+            "pending": sum(s["pending"] for s in lane_stats.values()),
+            "lag": None if None in lags else sum(lags),
+            "dead_letter": redis_client.llen(DEAD_LETTER_QUEUE),
+            "lanes": lane_stats,
+        }
+
+
+QUEUE_BACKENDS: dict[str, type] = {"list": ListQueueBackend, "stream": StreamQueueBackend}
+_backends: dict[str, RawEventQueue] = {}
+
+
+def get_queue_backend() -> RawEventQueue:
+    """Return the backend selected by QUEUE_BACKEND (one instance per process).
+
+    Raises:
+        ValueError: If QUEUE_BACKEND is not one of QUEUE_BACKENDS
+    """
+    if QUEUE_BACKEND not in QUEUE_BACKENDS:
+        raise ValueError(
+            f"Unknown QUEUE_BACKEND: {QUEUE_BACKEND} (expected one of {sorted(QUEUE_BACKENDS)})"
+        )
+    if QUEUE_BACKEND not in _backends:
+        _backends[QUEUE_BACKEND] = QUEUE_BACKENDS[QUEUE_BACKEND]()
+    return _backends[QUEUE_BACKEND]
+
+
+def enqueue_raw_event(raw_event_id: str, lane: str = DEFAULT_LANE):
+    get_queue_backend().enqueue([raw_event_id], lane)
+
+
+def enqueue_raw_events(raw_event_ids: list[str], lane: str = DEFAULT_LANE) -> None:
+    """Enqueue many raw events on one lane in one round trip."""
+    if not raw_event_ids:
+        return
+    get_queue_backend().enqueue(raw_event_ids, lane)
+
+
+def pop_raw_event(timeout: int = 2, worker_id: str = "default"):
+    """Pop the next job, or None if the queue stayed empty for `timeout` seconds.
+
+    In reliable mode (and with the stream backend) the job carries a
+    `receipt` that must be passed back to ack_raw_event() or nack_raw_event().
+    """
+    return get_queue_backend().pop(timeout, worker_id)
+
+
+def pop_raw_events(max_items: int, timeout: int = 2, worker_id: str = "default") -> list[dict]:
+    """Pop up to `max_items` jobs, blocking up to `timeout` seconds for the first.
+
+    Returns:
+        List of jobs (empty if the queue stayed empty for `timeout` seconds)
+    """
+    return get_queue_backend().pop_many(max_items, timeout, worker_id)
+
+
+def ack_raw_event(job: dict) -> None:
+    """Acknowledge a job as done, removing it from the in-flight set."""
+    get_queue_backend().ack(job)
+
+
+def nack_raw_event(job: dict) -> bool:
+    """Return a failed job to the queue, or dead-letter it after too many attempts.
+
+    Returns:
+        True if the job was re-queued, False if dead-lettered or already released
+    """
+    return get_queue_backend().nack(job)
+
+
+def claim_raw_events(raw_event_ids: list[str], ttl: int = VISIBILITY_TIMEOUT) -> list[bool]:
+    """Claim events for this worker across processes (one SET NX each, pipelined).
+
+    A claim outlives a crashed worker by at most `ttl` seconds, about when
+    the reaper re-delivers its job.
+
+    Returns:
+        One flag per id, in order: False if another worker holds the claim
+
+    Raises:
+        redis.RedisError: If Redis is unreachable
+    """
+    if not raw_event_ids:
+        return []
+    pipe = redis_client.pipeline(transaction=False)
+    for raw_event_id in raw_event_ids:
+        pipe.set(f"{EVENT_CLAIM_PREFIX}{raw_event_id}", 1, nx=True, ex=ttl)
+    return [bool(claimed) for claimed in pipe.execute()]
+
+
+def release_raw_event_claims(raw_event_ids: list[str]) -> None:
+    """Drop claims taken with claim_raw_events()."""
+    if raw_event_ids:
+        redis_client.delete(*(f"{EVENT_CLAIM_PREFIX}{i}" for i in raw_event_ids))
+
+
+def requeue_stale_raw_events(visibility_timeout: int = VISIBILITY_TIMEOUT) -> int:
+    """Reaper: release in-flight jobs whose worker has not acked within the timeout.
+
+    Returns:
+        Number of jobs re-queued (dead-lettered jobs are not counted)
+    """
+    return get_queue_backend().requeue_stale(visibility_timeout)
+
+
+def trim_raw_event_queue() -> int:
+    """Apply the backend's trimming policy; returns entries removed."""
+    return get_queue_backend().trim()
 
 
-def pop_raw_event(timeout: int = 2):
-    item = redis_client.brpop(QUEUE_NAME, timeout=timeout)
-    if item is None:
-        return None
-    _, data = item
-    return json.loads(data)
+def queue_stats() -> dict:
+    """Depth, in-flight and dead-letter counts for the selected backend, overall and per lane."""
+    return get_queue_backend().stats()
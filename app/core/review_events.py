@@ -0,0 +1,128 @@
+"""
+Review events: incremental review-queue updates pushed to browsers over SSE.
+
+Writers publish after committing:
+
+    candidate_created   the worker stored a new pending candidate (the event
+                        carries the same fields as a GET /api/review item)
+    approved            a candidate was approved ({candidate_id, task_id})
+    rejected            a candidate was rejected ({candidate_id})
+
+Events are appended to a capped Redis stream, which is the log clients
+resume from (SSE Last-Event-ID is the stream entry id), and a pub/sub
+message wakes every open GET /api/review/events connection to read the new
+entries. A client whose Last-Event-ID has been trimmed from the log gets a
+"reset" event and should reload the queue.
+
+Publishing fails open: if Redis is down the write still succeeds and open
+tabs catch up on their next reload.
+"""
+
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+
+import redis
+import redis.asyncio
+
+from app.core import queue
+
+logger = logging.getLogger(__name__)
+
+REVIEW_EVENTS_STREAM = "lifeos:review:events"
+REVIEW_EVENTS_CHANNEL = "lifeos:review:events:notify"
+
+# Events kept for Last-Event-ID resume (approximate cap)
+REVIEW_EVENTS_MAXLEN = int(os.getenv("REVIEW_EVENTS_MAXLEN", "10000"))
+
+# Seconds between SSE keepalive comments on an idle connection
+REVIEW_EVENTS_KEEPALIVE = float(os.getenv("REVIEW_EVENTS_KEEPALIVE", "15"))
+
+# Entries read per catch-up XRANGE
+REVIEW_EVENTS_BATCH = 100
+
+_async_client: redis.asyncio.Redis | None = None
+
+
+def publish_review_events(events: list[dict]) -> None:
+    """Append events ({"type": ..., **fields}) to the log and wake subscribers."""
+    if not events:
+        return
+    try:
+        pipe = queue.redis_client.pipeline(transaction=False)
+        for event in events:
+            fields = {k: v for k, v in event.items() if k != "type"}
+            pipe.xadd(
+                REVIEW_EVENTS_STREAM,
+                {"type": event["type"], "data": json.dumps(fields)},
+                maxlen=REVIEW_EVENTS_MAXLEN,
+                approximate=True,
+            )
+        pipe.publish(REVIEW_EVENTS_CHANNEL, str(len(events)))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish {len(events)} review event(s): {e}")
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """FastAPI dependency: the asyncio Redis client used by SSE connections."""
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.from_url(queue.REDIS_URL, decode_responses=True)
+    return _async_client
+
+
+def _sse(entry_id: str, fields: dict) -> str:
+    return f"id: {entry_id}\nevent: {fields['type']}\ndata: {fields['data']}\n\n"
+
+
+async def _start_id(client: redis.asyncio.Redis, last_event_id: str | None) -> tuple[str, bool]:
+    """Where to start reading, and whether the client missed trimmed events."""
+    if last_event_id:
+        try:
+            retained = await client.xrange(
+                REVIEW_EVENTS_STREAM, min=last_event_id, max=last_event_id
+            )
+        except redis.ResponseError:  # not a stream id
+            retained = []
+        if retained:
+            return last_event_id, False
+
+    # New connection (or a lost position): start after the newest entry
+    newest = await client.xrevrange(REVIEW_EVENTS_STREAM, count=1)
+    return (newest[0][0] if newest else "0-0"), bool(last_event_id)
+
+
+async def iter_review_events(
+    client: redis.asyncio.Redis,
+    last_event_id: str | None = None,
+    keepalive: float = REVIEW_EVENTS_KEEPALIVE,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for events after last_event_id, then live ones, forever."""
+    pubsub = client.pubsub()
+    # Subscribe before the first read so nothing published in between is missed
+    await pubsub.subscribe(REVIEW_EVENTS_CHANNEL)
+    try:
+        last_id, reset = await _start_id(client, last_event_id)
+        yield "retry: 3000\n\n"
+        if reset:
+            yield _sse(last_id, {"type": "reset", "data": "{}"})
+
+        while True:
+            entries = await client.xrange(
+                REVIEW_EVENTS_STREAM, min=f"({last_id}", count=REVIEW_EVENTS_BATCH
+            )
+            for entry_id, fields in entries:
+                yield _sse(entry_id, fields)
+                last_id = entry_id
+            if len(entries) == REVIEW_EVENTS_BATCH:
+                continue
+
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+            if message is None:
+                # Also detects dead connections: the write fails once the client is gone
+                yield ": keepalive\n\n"
+    finally:
+        await pubsub.unsubscribe(REVIEW_EVENTS_CHANNEL)
+        await pubsub.aclose()  # type: ignore[attr-defined]  # types-redis predates aclose
@@ -0,0 +1,48 @@
+"""
+Ingest routing: which raw-event sources need the worker.
+
+INGEST_ROUTES maps sources to a route, e.g.
+
+    INGEST_ROUTES=dictation:process,slack:store,manual:store
+
+    process   stored unprocessed and enqueued for app.worker
+    store     stored already marked processed and never enqueued (kept for
+              export and audit, but costs no queue traffic or worker time)
+
+Sources not listed are processed, so a new source is never silently
+dropped. The worker only builds candidates from dictation, so that is the
+only source routed to it by default.
+"""
+
+import os
+
+PROCESS = "process"
+STORE = "store"
+ROUTES = (PROCESS, STORE)
+
+INGEST_ROUTES = os.getenv("INGEST_ROUTES", "dictation:process,slack:store,manual:store")
+
+
+def parse_routes(spec: str) -> dict[str, str]:
+    """Parse "source:route,..." into {source: route}.
+
+    Raises:
+        ValueError: On a malformed entry or an unknown route
+    """
+    routes: dict[str, str] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        source, _, route = (s.strip() for s in entry.partition(":"))
+        if not source or route not in ROUTES:
+            raise ValueError(
+                f"Invalid INGEST_ROUTES entry: {entry!r} (route must be one of {ROUTES})"
+            )
+        routes[source] = route
+    return routes
+
+
+SOURCE_ROUTES = parse_routes(INGEST_ROUTES)
+
+
+def needs_processing(source: str) -> bool:
+    """Whether events from `source` should be enqueued for the worker."""
+    return SOURCE_ROUTES.get(source, PROCESS) == PROCESS
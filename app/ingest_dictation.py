@@ -1,19 +1,229 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import json
+import logging
+import os
+from typing import Any
 
-from app.core.db import get_db
-from app.core.queue import enqueue_raw_event
-from app.models.raw_event import RawEvent
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from redis import RedisError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import idempotency
+from app.core.bulk import insert_new_rows
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import get_async_db
+from app.core.lanes import lane_for
+from app.core.queue import enqueue_raw_event, enqueue_raw_events
+from app.core.routing import needs_processing
+from app.models.raw_event import RawEvent, raw_event_id_for
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Most items accepted by one POST /ingest/dictation/batch
+DICTATION_BATCH_MAX_ITEMS = int(os.getenv("DICTATION_BATCH_MAX_ITEMS", "500"))
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 @router.post("/ingest/dictation")
-def ingest_dictation(body: dict, db: Session = Depends(get_db)):
-    event = RawEvent(source="dictation", payload=body["text"])
+async def ingest_dictation(
+    body: dict,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: str | None = Header(None, max_length=idempotency.MAX_IDEMPOTENCY_KEY_LENGTH),
+):
+    text = body["text"]
+    dedup_key = idempotency.dedup_key("dictation", text, idempotency_key)
+
+    # The Redis client is synchronous; keep its round trips off the event loop
+    if not await run_in_threadpool(idempotency.claim, dedup_key):
+        return {"ok": True, "duplicate": True}
+
+    process = needs_processing("dictation")
+    event = RawEvent(
+        id=raw_event_id_for(dedup_key),
+        source="dictation",
+        payload=text,
+        dedup_key=dedup_key,
+        processed=not process,
+    )
     db.add(event)
-    db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        # Stored by an earlier submission the fast path missed; re-enqueue in
+        # case that attempt failed after the commit (the worker skips
+        # processed events)
+        logger.info(f"Duplicate dictation {dedup_key}")
+    except Exception:
+        await run_in_threadpool(idempotency.release, dedup_key)
+        raise
+    await run_in_threadpool(bump_dashboard_version)
+
+    if not process:
+        return {"ok": True}
 
-    enqueue_raw_event(event.id)
+    try:
+        # Someone is waiting on this one: use the interactive lane
+        await run_in_threadpool(
+            enqueue_raw_event, event.id, lane_for("dictation", interactive=True)
+        )
+    except RedisError:
+        # Let the retry through: it conflicts on insert and re-enqueues
+        await run_in_threadpool(idempotency.release, dedup_key)
+        raise
 
     return {"ok": True}
+
+
+async def _read_batch(request: Request) -> list:
+    """Parse a batch body: a JSON array, or NDJSON (one item per line).
+
+    Unparsable NDJSON lines are kept as None so item indexes stay aligned.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type not in NDJSON_MEDIA_TYPES:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+        if len(items) > DICTATION_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413, detail=f"At most {DICTATION_BATCH_MAX_ITEMS} items per batch"
+            )
+        return items
+
+    items = []
+    buffer = b""
+
+    def add(line: bytes) -> None:
+        if not line.strip():
+            return
+        if len(items) >= DICTATION_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413, detail=f"At most {DICTATION_BATCH_MAX_ITEMS} items per batch"
+            )
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            items.append(None)
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            add(line)
+    add(buffer)
+    return items
+
+
+def _invalid_item(item) -> str | None:
+    """Return why a batch item cannot be ingested, or None if it is valid."""
+    if not isinstance(item, dict):
+        return "Item must be a JSON object"
+    text = item.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return "'text' must be a non-empty string"
+    key = item.get("idempotency_key")
+    if key is not None and (
+        not isinstance(key, str) or len(key) > idempotency.MAX_IDEMPOTENCY_KEY_LENGTH
+    ):
+        return (
+            f"'idempotency_key' must be a string of at most "
+            f"{idempotency.MAX_IDEMPOTENCY_KEY_LENGTH} characters"
+        )
+    return None
+
+
+@router.post("/ingest/dictation/batch")
+async def ingest_dictation_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    backfill: bool = Query(False),
+):
+    """Ingest many dictations with one INSERT and one LPUSH.
+
+    Accepts a JSON array, or NDJSON (Content-Type: application/x-ndjson), of
+    {"text": ..., "idempotency_key": ...} items (the key is optional). Items
+    are deduplicated like single posts; invalid items are reported and
+    skipped without failing the rest.
+
+    Jobs go on the dictation lane, or with ?backfill=true on the backfill
+    lane, which only gets worker time left over by live traffic.
+
+    Returns:
+        Counts and, per item in request order, its index, status
+        (accepted | duplicate | invalid), raw event id and any error
+    """
+    items = await _read_batch(request)
+
+    results: list[dict] = []
+    pending: list[dict] = []  # valid rows not yet seen in this batch
+    seen: set[str] = set()
+    for index, item in enumerate(items):
+        error = _invalid_item(item)
+        if error:
+            results.append({"index": index, "status": "invalid", "error": error})
+            continue
+        dedup_key = idempotency.dedup_key("dictation", item["text"], item.get("idempotency_key"))
+        result: dict[str, Any] = {
+            "index": index,
+            "id": raw_event_id_for(dedup_key),
+            "status": "duplicate",
+        }
+        results.append(result)
+        if dedup_key not in seen:
+            seen.add(dedup_key)
+            pending.append({"result": result, "text": item["text"], "dedup_key": dedup_key})
+
+    # The Redis client is synchronous; keep its round trips off the event loop
+    claimed = await run_in_threadpool(idempotency.claim_many, [p["dedup_key"] for p in pending])
+    pending = [p for p, ok in zip(pending, claimed, strict=True) if ok]
+    keys = [p["dedup_key"] for p in pending]
+
+    process = needs_processing("dictation")
+    rows = [
+        {
+            "id": p["result"]["id"],
+            "source": "dictation",
+            "payload": p["text"],
+            "dedup_key": p["dedup_key"],
+            "processed": not process,
+        }
+        for p in pending
+    ]
+    try:
+        inserted = set(await db.run_sync(insert_new_rows, RawEvent, rows))
+        await db.commit()
+    except Exception:
+        await run_in_threadpool(idempotency.release_many, keys)
+        raise
+
+    for p in pending:
+        if p["result"]["id"] in inserted:
+            p["result"]["status"] = "accepted"
+    if inserted:
+        await run_in_threadpool(bump_dashboard_version)
+
+    # Rows the fast path missed but the unique index caught are re-enqueued
+    # like single posts (the worker skips processed events)
+    try:
+        if process:
+            await run_in_threadpool(
+                enqueue_raw_events,
+                [row["id"] for row in rows],
+                lane_for("dictation", backfill=backfill),
+            )
+    except RedisError:
+        await run_in_threadpool(idempotency.release_many, keys)
+        raise
+
+    counts = {status: 0 for status in ("accepted", "duplicate", "invalid")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {"ok": True, **counts, "items": results}
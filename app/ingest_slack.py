@@ -1,18 +1,35 @@
 import json
+import logging
+import os
 
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from redis import RedisError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.queue import enqueue_raw_event
+from app.core import idempotency
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import get_async_db
+from app.core.lanes import lane_for
+from app.core.queue import buffer_ingest, enqueue_raw_event
+from app.core.routing import needs_processing
 from app.core.security import verify_slack_signature
-from app.models.raw_event import RawEvent
+from app.models.raw_event import RawEvent, raw_event_id_for
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# inline: insert and enqueue before responding
+# buffered: verify, push onto the Redis ingest stream and ack immediately;
+#           app.persister batch-inserts the rows (keeps replies well under
+#           Slack's 3 s retry deadline under load)
+SLACK_INGEST_MODE = os.getenv("SLACK_INGEST_MODE", "inline")
+
 
 @router.post("/ingest/slack/events")
-async def ingest_slack(request: Request, db: Session = Depends(get_db)):
+async def ingest_slack(request: Request, db: AsyncSession = Depends(get_async_db)):
     raw_body = await request.body()
     payload = json.loads(raw_body.decode())
 
@@ -24,10 +41,56 @@ async def ingest_slack(request: Request, db: Session = Depends(get_db)):
     signature = request.headers.get("X-Slack-Signature", "")
     verify_slack_signature(raw_body, timestamp, signature)
 
-    event = RawEvent(source="slack", payload=json.dumps(payload))
+    # Slack resends the same event_id on retries (X-Slack-Retry-Num: 1, 2, 3)
+    event_id = payload.get("event_id")
+    dedup_key = idempotency.dedup_key("slack", payload, event_id)
+    retry_num = request.headers.get("X-Slack-Retry-Num")
+
+    # The Redis client is synchronous; keep its round trips off the event loop
+    if not await run_in_threadpool(idempotency.claim, dedup_key):
+        logger.info(f"Dropped duplicate Slack event {event_id} (retry {retry_num})")
+        return {"ok": True}
+
+    if SLACK_INGEST_MODE == "buffered":
+        try:
+            await run_in_threadpool(buffer_ingest, "slack", json.dumps(payload), dedup_key)
+        except RedisError:
+            await run_in_threadpool(idempotency.release, dedup_key)
+            # Not acked: Slack will retry
+            raise HTTPException(status_code=503, detail="Ingest buffer unavailable")
+        return {"ok": True}
+
+    # Events no processor uses are stored already processed and not enqueued
+    process = needs_processing("slack")
+    event = RawEvent(
+        id=raw_event_id_for(dedup_key),
+        source="slack",
+        payload=json.dumps(payload),
+        dedup_key=dedup_key,
+        processed=not process,
+    )
     db.add(event)
-    db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        # Already stored by an earlier delivery the fast path missed;
+        # re-enqueue in case that attempt failed after the commit (the worker
+        # skips processed events)
+        logger.info(f"Duplicate Slack event {event_id} (retry {retry_num})")
+    except Exception:
+        await run_in_threadpool(idempotency.release, dedup_key)
+        raise
+    await run_in_threadpool(bump_dashboard_version)
+
+    if not process:
+        return {"ok": True}
 
-    enqueue_raw_event(event.id)
+    try:
+        await run_in_threadpool(enqueue_raw_event, event.id, lane_for("slack"))
+    except RedisError:
+        # Let the retry through: it conflicts on insert and re-enqueues
+        await run_in_threadpool(idempotency.release, dedup_key)
+        raise
 
     return {"ok": True}
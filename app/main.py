@@ -1,11 +1,17 @@
 import os
 
-from fastapi import FastAPI
+import redis
+from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 
-from app.api_review import router as review_router
+from app.api_dashboard import router as dashboard_router
 from app.api_export import router as export_router
+from app.api_inbox import router as inbox_router
+from app.api_review import router as review_router
+from app.api_tasks import router as tasks_router
 from app.core.logging_config import setup_logging
+from app.core.pool import pool_metrics
+from app.core.queue import queue_stats
 from app.ingest_dictation import router as dictation_router
 from app.ingest_slack import router as slack_router
 
@@ -29,8 +35,11 @@ app = FastAPI(
 # -------------------------------------------------
 app.include_router(slack_router)
 app.include_router(dictation_router)
+app.include_router(inbox_router)
 app.include_router(review_router)
+app.include_router(tasks_router)
 app.include_router(export_router)
+app.include_router(dashboard_router)
 
 
 # -------------------------------------------------
@@ -41,6 +50,24 @@ def health():
     return {"status": "ok"}
 
 
+# -------------------------------------------------
+# Metrics
+# -------------------------------------------------
+@app.get("/metrics/db")
+def db_metrics():
+    """Connection pool counters and gauges for each engine (see app.core.pool)."""
+    return pool_metrics()
+
+
+@app.get("/metrics/queue")
+def queue_metrics():
+    """Raw-event queue depth, in-flight and dead-letter counts (see app.core.queue)."""
+    try:
+        return queue_stats()
+    except redis.RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Queue unavailable: {e}")
+
+
 # -------------------------------------------------
 # Static Frontend
 # -------------------------------------------------
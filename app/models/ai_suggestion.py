@@ -54,6 +54,9 @@ class AISuggestion(Base):
 
     rationale: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # Content address of the redacted input (see app.ai.cache.cache_key)
+    input_hash: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
@@ -1,9 +1,27 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String, Text
+from sqlalchemy import Boolean, DateTime, Index, String, Text, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# Events the worker has yet to handle: a small slice of a table that only grows.
+# Spelled the way each dialect renders `processed == false()`, so the planner
+# matches queries to the partial index.
+UNPROCESSED_EVENTS = text("processed = false")
+UNPROCESSED_EVENTS_SQLITE = text("processed = 0")
+
+# Namespace for ids derived from an upstream event key (see raw_event_id_for)
+RAW_EVENT_ID_NAMESPACE = uuid.UUID("5f0c2c8e-7a4b-4d55-9a53-3e1b9c6f0d21")
+
+
+def raw_event_id_for(key: str) -> str:
+    """Deterministic raw_events.id for an upstream event key (e.g. "slack:Ev123").
+
+    The same upstream event always maps to the same primary key, so a
+    redelivered copy conflicts instead of becoming a second row.
+    """
+    return str(uuid.uuid5(RAW_EVENT_ID_NAMESPACE, key))
+
 
 class Base(DeclarativeBase):
     pass
@@ -11,9 +29,24 @@ class Base(DeclarativeBase):
 
 class RawEvent(Base):
     __tablename__ = "raw_events"
+    __table_args__ = (
+        # Idempotent ingest (see app.core.idempotency, migration 005)
+        Index("idx_raw_events_dedup_key", "dedup_key", unique=True),
+        # Inbox: keyset order, optionally by source or unprocessed only (migration 007)
+        Index("idx_raw_events_inbox", "received_at", "id"),
+        Index("idx_raw_events_inbox_source", "source", "received_at", "id"),
+        Index(
+            "idx_raw_events_unprocessed",
+            "received_at",
+            "id",
+            postgresql_where=UNPROCESSED_EVENTS,
+            sqlite_where=UNPROCESSED_EVENTS_SQLITE,
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     source: Mapped[str] = mapped_column(String, index=True)
     received_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     payload: Mapped[str] = mapped_column(Text)
     processed: Mapped[bool] = mapped_column(Boolean, default=False)
+    dedup_key: Mapped[str | None] = mapped_column(String, nullable=True)
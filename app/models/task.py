@@ -1,9 +1,15 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# Active tasks are a small, hot slice of a table dominated by completed ones
+ACTIVE_TASKS = text("status = 'active'")
+
+# Tasks created from a raw event (manual tasks have none)
+FROM_RAW_EVENT = text("raw_event_id IS NOT NULL")
+
 
 class Base(DeclarativeBase):
     pass
@@ -11,6 +17,34 @@ class Base(DeclarativeBase):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Idempotency: one task per raw event (see migration 001)
+        Index(
+            "idx_tasks_raw_event_unique",
+            "raw_event_id",
+            unique=True,
+            postgresql_where=FROM_RAW_EVENT,
+            sqlite_where=FROM_RAW_EVENT,
+        ),
+        # Task list: status filter + keyset order (see migration 006)
+        Index("idx_tasks_list", "status", "created_at", "id"),
+        Index("idx_tasks_list_priority", "status", "priority", "created_at", "id"),
+        Index(
+            "idx_tasks_active",
+            "created_at",
+            "id",
+            postgresql_where=ACTIVE_TASKS,
+            sqlite_where=ACTIVE_TASKS,
+        ),
+        Index(
+            "idx_tasks_active_priority",
+            "priority",
+            "created_at",
+            "id",
+            postgresql_where=ACTIVE_TASKS,
+            sqlite_where=ACTIVE_TASKS,
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
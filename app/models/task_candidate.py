@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -11,6 +11,11 @@ class Base(DeclarativeBase):
 
 class TaskCandidate(Base):
     __tablename__ = "task_candidates"
+    __table_args__ = (
+        # Review queue: status filter + keyset order (see migration 004)
+        Index("idx_task_candidates_review", "status", "created_at", "id"),
+        Index("idx_task_candidates_review_priority", "status", "priority", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     raw_event_id: Mapped[str] = mapped_column(String, index=True)
@@ -0,0 +1,141 @@
+"""
+Ingest persister: moves buffered ingest payloads into raw_events in bulk.
+
+Fast-ack ingest routes (SLACK_INGEST_MODE=buffered) only push verified
+payloads onto the Redis ingest stream. This process reads them in batches,
+inserts each batch with one INSERT ... ON CONFLICT DO NOTHING, enqueues the
+ids that need processing (see app.core.routing) in one round trip per lane,
+then acks the stream entries.
+
+Row ids are derived from the entry's dedup key (or, without one, from the
+stream entry id), so a batch replayed after a crash between commit and ack,
+or an event already stored by another path, conflicts instead of inserting
+duplicates.
+
+Run with: python -m app.persister
+"""
+
+import logging
+import os
+import signal
+import socket
+import threading
+from datetime import datetime
+
+from app.core.bulk import insert_new_rows
+from app.core.dashboard import bump_dashboard_version
+from app.core.db import SessionLocal
+from app.core.lanes import lane_for
+from app.core.logging_config import setup_logging
+from app.core.queue import ack_ingest, enqueue_raw_events, ensure_ingest_group, read_ingest_buffer
+from app.core.routing import needs_processing
+from app.models.raw_event import RawEvent, raw_event_id_for
+
+logger = logging.getLogger(__name__)
+
+# Max stream entries per INSERT / commit
+PERSISTER_BATCH_SIZE = int(os.getenv("PERSISTER_BATCH_SIZE", "500"))
+
+# How long one read blocks waiting for new entries
+PERSISTER_BLOCK_MS = int(os.getenv("PERSISTER_BLOCK_MS", "1000"))
+
+# Entries pending this long on another (dead) persister are taken over
+PERSISTER_CLAIM_IDLE_MS = int(os.getenv("PERSISTER_CLAIM_IDLE_MS", "60000"))
+
+
+def entry_row(entry_id: str, fields: dict) -> dict:
+    """Build raw_events column values for one ingest stream entry."""
+    key = fields.get("dedup_key") or f"ingest:{entry_id}"
+    # Stream ids start with the entry's millisecond timestamp
+    received_ms = int(entry_id.split("-", 1)[0])
+    return {
+        "id": raw_event_id_for(key),
+        "source": fields["source"],
+        "payload": fields["payload"],
+        "received_at": datetime.utcfromtimestamp(received_ms / 1000),
+        # Sources routed to "store" never reach the worker
+        "processed": not needs_processing(fields["source"]),
+        "dedup_key": fields.get("dedup_key"),
+    }
+
+
+def persist_batch(db, entries: list[tuple[str, dict]]) -> list[str]:
+    """Insert one batch of stream entries and enqueue the rows that need processing.
+
+    Every process-routed row is enqueued, not only the ones inserted now: a
+    batch replayed after a crash between commit and enqueue inserts nothing,
+    and its rows would otherwise never reach the worker. Jobs for rows that
+    are already processed are dropped by the worker.
+
+    Returns:
+        Ids of the raw_events rows inserted (duplicates are skipped)
+    """
+    rows = [entry_row(entry_id, fields) for entry_id, fields in entries]
+    inserted = insert_new_rows(db, RawEvent, rows)
+    db.commit()
+    if inserted:
+        bump_dashboard_version()
+
+    # dict keeps one job per row when the batch repeats a dedup key
+    sources = {row["id"]: row["source"] for row in rows if not row["processed"]}
+    lanes: dict[str, list[str]] = {}
+    for raw_event_id, source in sources.items():
+        lanes.setdefault(lane_for(source), []).append(raw_event_id)
+    for lane, ids in lanes.items():
+        enqueue_raw_events(ids, lane)
+    ack_ingest([entry_id for entry_id, _ in entries])
+
+    skipped = len(rows) - len(inserted)
+    logger.info(
+        f"Persisted {len(inserted)} raw event(s)"
+        + (f", skipped {skipped} duplicate(s)" if skipped else "")
+    )
+    return inserted
+
+
+def run_persister(stop: threading.Event | None = None, batch_size: int | None = None) -> None:
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+
+    stop = stop or threading.Event()
+    batch_size = max(1, batch_size or PERSISTER_BATCH_SIZE)
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+
+    if threading.current_thread() is threading.main_thread():
+
+        def _request_stop(signum, _frame):
+            logger.info(f"Received signal {signum}, finishing current batch")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+
+    ensure_ingest_group()
+    logger.info(f"Persister started (consumer={consumer}, batch_size={batch_size})")
+
+    while not stop.is_set():
+        try:
+            entries = read_ingest_buffer(
+                consumer, batch_size, PERSISTER_BLOCK_MS, PERSISTER_CLAIM_IDLE_MS
+            )
+            if not entries:
+                continue
+
+            db = SessionLocal()
+            try:
+                persist_batch(db, entries)
+            except Exception:
+                db.rollback()
+                # Entries stay pending and are re-claimed after the idle timeout
+                logger.exception(f"Failed to persist {len(entries)} ingest entries")
+                stop.wait(1.0)
+            finally:
+                db.close()
+        except Exception:
+            logger.exception("Ingest buffer read failed")
+            stop.wait(1.0)
+
+    logger.info("Persister stopped")
+
+
+if __name__ == "__main__":
+    run_persister()
@@ -1,13 +1,39 @@
+import json
 import logging
 import os
-import time
+import signal
+import socket
+import sys
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
 
+import redis
+from sqlalchemy import insert, select, update
+
+from app.ai.cache import cache_key
 from app.ai.contract import suggestion_to_dict
-from app.ai.factory import get_suggester
+from app.ai.factory import get_shared_suggester, reload_suggester
 from app.ai.prompts import CURRENT_PROMPT_VERSION, redact_pii, truncate_for_excerpt
+from app.core.dashboard import bump_dashboard_version
 from app.core.db import SessionLocal
+from app.core.lanes import lane_metrics
 from app.core.logging_config import setup_logging
-from app.core.queue import pop_raw_event
+from app.core.pool import DB_POOLING, DB_ROLE, pool_metrics, pool_settings
+from app.core.queue import (
+    VISIBILITY_TIMEOUT,
+    ack_raw_event,
+    claim_raw_events,
+    get_queue_backend,
+    nack_raw_event,
+    pop_raw_event,
+    pop_raw_events,
+    release_raw_event_claims,
+    requeue_stale_raw_events,
+    trim_raw_event_queue,
+)
+from app.core.review_events import publish_review_events
 from app.core.summarizer import summarize
 from app.models.ai_suggestion import AISuggestion as AISuggestionModel
 from app.models.raw_event import RawEvent
@@ -16,23 +42,128 @@ from app.models.task_candidate import TaskCandidate
 
 logger = logging.getLogger(__name__)
 
+# Number of worker threads pulling from the queue (1 = original serial loop)
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
 
-def process_event(db, raw_event_id: str):
-    event = db.query(RawEvent).filter(RawEvent.id == raw_event_id).first()
-    if not event or event.processed:
-        return
+# Max jobs each thread pops and processes per transaction (1 = one event at a time)
+WORKER_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", "1"))
+
+# Seconds between DB pool and queue lane metrics log lines (0 disables)
+DB_POOL_LOG_INTERVAL = int(os.getenv("DB_POOL_LOG_INTERVAL", "60"))
+
+# Seconds a worker thread waits after an unexpected error (e.g. Redis down)
+WORKER_ERROR_BACKOFF = float(os.getenv("WORKER_ERROR_BACKOFF", "5"))
+
+
+class InFlightEvents:
+    """Thread-safe set of raw_event_ids currently being processed in this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: set[str] = set()
+
+    def claim(self, raw_event_id: str) -> bool:
+        with self._lock:
+            if raw_event_id in self._ids:
+                return False
+            self._ids.add(raw_event_id)
+            return True
+
+    def release(self, raw_event_id: str) -> None:
+        with self._lock:
+            self._ids.discard(raw_event_id)
+
+
+in_flight = InFlightEvents()
+
+
+@dataclass
+class EventRows:
+    """Rows produced by processing one raw event, written in bulk by _write_rows()."""
+
+    raw_event_id: str
+    ai_suggestions: list[dict] = field(default_factory=list)
+    summaries: list[dict] = field(default_factory=list)
+    candidates: list[dict] = field(default_factory=list)
+
+
+def _claim_events(raw_event_ids: list[str]) -> list[str]:
+    """Claim events in Redis before building them; returns the ids claimed.
+
+    Two worker processes can pop the same event (a reaper re-delivery, a
+    re-enqueue). The claim makes the second one skip it instead of paying
+    for a second provider call; the row lock still guards the write. An
+    event another worker holds is dropped here, and its job acked: the
+    holder acks or nacks its own job. Without Redis every id is returned.
+    """
+    try:
+        claimed = claim_raw_events(raw_event_ids)
+    except redis.RedisError as e:
+        logger.warning(f"Event claims unavailable, relying on row locks: {e}")
+        return raw_event_ids
+    for raw_event_id, ok in zip(raw_event_ids, claimed):
+        if not ok:
+            logger.info(f"Event {raw_event_id} claimed by another worker, skipping")
+    return [i for i, ok in zip(raw_event_ids, claimed) if ok]
+
+
+def _release_claims(raw_event_ids: list[str]) -> None:
+    try:
+        release_raw_event_claims(raw_event_ids)
+    except redis.RedisError as e:
+        # The claims expire on their own
+        logger.warning(f"Could not release {len(raw_event_ids)} event claim(s): {e}")
+
+
+def _read_unprocessed(db, raw_event_ids: list[str]) -> list[RawEvent]:
+    """Load unprocessed events without locking them, then end the transaction.
+
+    The events are detached with their columns loaded, so building their
+    rows (provider calls included) holds neither row locks nor a connection
+    in an open transaction.
+    """
+    events: list[RawEvent] = (
+        db.query(RawEvent)
+        .filter(RawEvent.id.in_(raw_event_ids), RawEvent.processed.is_(False))
+        .all()
+    )
+    for event in events:
+        db.expunge(event)
+    db.rollback()
+    return events
+
+
+def _lock_unprocessed(db, raw_event_ids: list[str]) -> set[str]:
+    # Row locks guard against a second worker process writing the same events;
+    # SKIP LOCKED leaves out rows another worker holds instead of waiting.
+    # Events finished while this worker built their rows are left out too.
+    return set(
+        db.scalars(
+            select(RawEvent.id)
+            .where(RawEvent.id.in_(raw_event_ids), RawEvent.processed.is_(False))
+            .with_for_update(skip_locked=True)
+        )
+    )
+
+
+def _candidate_identity() -> dict:
+    # Assigned here rather than by column defaults so the review event
+    # published after commit carries the stored id and timestamp
+    return {"id": str(uuid.uuid4()), "created_at": datetime.utcnow()}
+
+
+def build_event_rows(event: RawEvent, suggester) -> EventRows:
+    """Run the AI suggester (or stub summarizer) for one event without touching the DB."""
+    rows = EventRows(raw_event_id=event.id)
 
     # Only process dictation events
     if event.source != "dictation":
-        event.processed = True
-        db.commit()
-        return
+        return rows
 
     # Try AI suggestion first (if enabled)
-    suggester = get_suggester()
     if suggester:
         try:
-            logger.info(f"Attempting AI suggestion for event {raw_event_id}")
+            logger.info(f"Attempting AI suggestion for event {event.id}")
 
             # Redact PII before sending to AI
             redacted_text = redact_pii(event.payload)
@@ -43,79 +174,400 @@ def process_event(db, raw_event_id: str):
             if suggestion:
                 logger.info(f"AI suggestion successful: {suggestion.title}")
 
-                # Persist AI evidence
-                ai_record = AISuggestionModel(
-                    raw_event_id=event.id,
-                    provider=suggester.provider_name,
-                    model=suggester.model_name,
-                    prompt_version=CURRENT_PROMPT_VERSION,
-                    input_excerpt=truncate_for_excerpt(event.payload),
-                    suggestion_json=suggestion_to_dict(suggestion),
-                    rationale=suggestion.rationale,
-                )
-                db.add(ai_record)
-                db.flush()  # Get ai_record.id
-
-                # Create task candidate with AI link
-                candidate = TaskCandidate(
-                    raw_event_id=event.id,
-                    title=suggestion.title,
-                    description=suggestion.description,
-                    priority=suggestion.priority,
-                    ai_suggestion_id=ai_record.id,
+                # AI evidence row; id assigned up front so the candidate can link to it.
+                # Written for cache hits too, so every suggestion used stays auditable.
+                ai_suggestion_id = str(uuid.uuid4())
+                rows.ai_suggestions.append(
+                    {
+                        "id": ai_suggestion_id,
+                        "raw_event_id": event.id,
+                        "provider": suggester.provider_name,
+                        "model": suggester.model_name,
+                        "prompt_version": CURRENT_PROMPT_VERSION,
+                        "input_excerpt": truncate_for_excerpt(event.payload),
+                        "suggestion_json": suggestion_to_dict(suggestion),
+                        "rationale": suggestion.rationale,
+                        "input_hash": cache_key(
+                            redacted_text, suggester.provider_name, suggester.model_name
+                        ),
+                    }
                 )
-                db.add(candidate)
 
-                # Create summary for dictation
-                summary = Summary(raw_event_id=event.id, content=event.payload)
-                db.add(summary)
+                # Task candidate with AI link
+                rows.candidates.append(
+                    {
+                        **_candidate_identity(),
+                        "raw_event_id": event.id,
+                        "title": suggestion.title,
+                        "description": suggestion.description,
+                        "priority": suggestion.priority,
+                        "ai_suggestion_id": ai_suggestion_id,
+                    }
+                )
 
-                event.processed = True
-                db.commit()
-                logger.info(f"AI suggestion persisted for event {raw_event_id}")
-                return
+                # Summary for dictation
+                rows.summaries.append({"raw_event_id": event.id, "content": event.payload})
+                return rows
 
         except Exception as e:
-            logger.error(f"AI suggestion failed for {raw_event_id}: {e}")
-            db.rollback()
+            logger.error(f"AI suggestion failed for {event.id}: {e}")
             # Fall through to stub
 
     # Fallback: Use stub summarizer (existing behavior)
-    logger.info(f"Using stub summarizer for event {raw_event_id}")
+    logger.info(f"Using stub summarizer for event {event.id}")
     result = summarize(event.payload)
 
-    summary = Summary(raw_event_id=event.id, content=result["summary"])
-    db.add(summary)
-
+    rows.summaries.append({"raw_event_id": event.id, "content": result["summary"]})
     for t in result["tasks"]:
-        candidate = TaskCandidate(
-            raw_event_id=event.id, title=t["title"], description=t["description"]
+        rows.candidates.append(
+            {
+                **_candidate_identity(),
+                "raw_event_id": event.id,
+                "title": t["title"],
+                "description": t["description"],
+            }
         )
-        db.add(candidate)
 
-    event.processed = True
+    return rows
+
+
+def _write_rows(db, batch: list[EventRows]) -> None:
+    """Insert all rows for the given events with one multi-row INSERT per table."""
+    ai_suggestions = [r for rows in batch for r in rows.ai_suggestions]
+    summaries = [r for rows in batch for r in rows.summaries]
+    candidates = [r for rows in batch for r in rows.candidates]
+
+    if ai_suggestions:
+        db.execute(insert(AISuggestionModel), ai_suggestions)
+    if summaries:
+        db.execute(insert(Summary), summaries)
+    if candidates:
+        db.execute(insert(TaskCandidate), candidates)
+
+    db.execute(
+        update(RawEvent)
+        .where(RawEvent.id.in_([rows.raw_event_id for rows in batch]))
+        .values(processed=True)
+    )
+
+
+def _candidate_events(batch: list[EventRows]) -> list[dict]:
+    """candidate_created review events for the candidates written for batch.
+
+    Each event carries the fields of a GET /api/review item, so open review
+    pages can render it without a reload.
+    """
+    events = []
+    for rows in batch:
+        suggestions = {s["id"]: s for s in rows.ai_suggestions}
+        for c in rows.candidates:
+            ai = suggestions.get(c.get("ai_suggestion_id"))
+            events.append(
+                {
+                    "type": "candidate_created",
+                    "id": c["id"],
+                    "title": c["title"],
+                    "description": c.get("description", ""),
+                    "priority": c.get("priority", "medium"),
+                    "created_at": c["created_at"].isoformat(),
+                    "ai_metadata": {
+                        "provider": ai["provider"],
+                        "model": ai["model"],
+                        "rationale": ai["rationale"],
+                        "confidence": ai["suggestion_json"].get("confidence", 0.0),
+                    }
+                    if ai
+                    else None,
+                }
+            )
+    return events
+
+
+def process_event(db, raw_event_id: str):
+    if not _claim_events([raw_event_id]):
+        return
+    try:
+        # Read after claiming: a worker that held the claim has committed
+        events = _read_unprocessed(db, [raw_event_id])
+        if not events:
+            return
+
+        # Built before locking: the provider call holds no row lock
+        rows = build_event_rows(events[0], get_shared_suggester())
+        if not _lock_unprocessed(db, [raw_event_id]):
+            db.rollback()
+            return
+
+        _write_rows(db, [rows])
+        db.commit()
+    finally:
+        _release_claims([raw_event_id])
+
+    bump_dashboard_version()
+    publish_review_events(_candidate_events([rows]))
+
+    if rows.ai_suggestions:
+        logger.info(f"AI suggestion persisted for event {raw_event_id}")
+
+
+def process_batch(db, raw_event_ids: list[str]) -> set[str]:
+    """Process several events with one transaction for their writes.
+
+    Events are claimed in Redis first, so another worker process building
+    the same event is skipped rather than duplicated. Suggestions are then
+    built per event before any row is locked, so the slow provider calls
+    never hold locks or an open write transaction; an event whose suggestion
+    fails is reported without affecting the others. The remaining events
+    are then locked (SKIP LOCKED) and written with bulk inserts. If that
+    fails, each event is retried inside its own savepoint so one bad event
+    cannot take the rest of the batch down with it.
+
+    Returns:
+        IDs of events that could not be processed (caller should retry them)
+    """
+    claimed = _claim_events(raw_event_ids)
+    if not claimed:
+        return set()
+    try:
+        return _process_claimed(db, claimed)
+    finally:
+        _release_claims(claimed)
+
+
+def _process_claimed(db, raw_event_ids: list[str]) -> set[str]:
+    events = _read_unprocessed(db, raw_event_ids)
+    if not events:
+        return set()
+
+    suggester = get_shared_suggester()
+    failed: set[str] = set()
+    built: list[EventRows] = []
+    for event in events:
+        try:
+            built.append(build_event_rows(event, suggester))
+        except Exception:
+            logger.exception(f"Failed to build rows for event {event.id}")
+            failed.add(event.id)
+
+    # One IN query; events another worker holds or finished are its own
+    locked = _lock_unprocessed(db, [rows.raw_event_id for rows in built])
+    batch = [rows for rows in built if rows.raw_event_id in locked]
+    if not batch:
+        db.rollback()
+        return failed
+
+    try:
+        with db.begin_nested():
+            _write_rows(db, batch)
+    except Exception as e:
+        logger.warning(f"Bulk write failed for batch of {len(batch)}, isolating events: {e}")
+        for rows in batch:
+            try:
+                with db.begin_nested():
+                    _write_rows(db, [rows])
+            except Exception:
+                logger.exception(f"Failed to persist event {rows.raw_event_id}")
+                failed.add(rows.raw_event_id)
+
     db.commit()
+    bump_dashboard_version()
+    publish_review_events(_candidate_events([r for r in batch if r.raw_event_id not in failed]))
+    written = sum(rows.raw_event_id not in failed for rows in batch)
+    logger.info(f"Processed batch of {written} event(s)")
+    return failed
+
+
+def handle_job(job: dict) -> None:
+    """Process one queued job in its own session, skipping events already in flight.
+
+    The job is acked once processing finishes (or another thread owns the event)
+    and nacked if processing raises, so reliable mode can retry it.
+    """
+    raw_event_id = job["raw_event_id"]
+    if not in_flight.claim(raw_event_id):
+        logger.info(f"Event {raw_event_id} already in flight, skipping duplicate job")
+        ack_raw_event(job)
+        return
+
+    db = SessionLocal()
+    try:
+        process_event(db, raw_event_id)
+    except Exception:
+        logger.exception(f"Failed to process event {raw_event_id}")
+        if not nack_raw_event(job) and "receipt" in job:
+            logger.error(f"Event {raw_event_id} not re-queued (dead-lettered or reclaimed)")
+    else:
+        ack_raw_event(job)
+    finally:
+        db.close()
+        in_flight.release(raw_event_id)
+
+
+def handle_batch(jobs: list[dict]) -> None:
+    """Process a batch of jobs in one session, acking successes and nacking failures."""
+    claimed: list[dict] = []
+    for job in jobs:
+        if in_flight.claim(job["raw_event_id"]):
+            claimed.append(job)
+        else:
+            ack_raw_event(job)
+    if not claimed:
+        return
+
+    db = SessionLocal()
+    try:
+        failed = process_batch(db, [job["raw_event_id"] for job in claimed])
+    except Exception:
+        logger.exception(f"Failed to process batch of {len(claimed)} event(s)")
+        failed = {job["raw_event_id"] for job in claimed}
+    finally:
+        db.close()
+
+    for job in claimed:
+        try:
+            if job["raw_event_id"] in failed:
+                nack_raw_event(job)
+            else:
+                ack_raw_event(job)
+        finally:
+            in_flight.release(job["raw_event_id"])
+
+
+def _poll_once(worker_id: str, batch_size: int) -> None:
+    if batch_size > 1:
+        # pop blocks up to its timeout, so an empty result needs no extra sleep
+        jobs = pop_raw_events(batch_size, worker_id=worker_id)
+        if jobs:
+            handle_batch(jobs)
+        return
+
+    job = pop_raw_event(worker_id=worker_id)
+    if job:
+        handle_job(job)
+
+
+def _worker_loop(stop: threading.Event, batch_size: int) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+    while not stop.is_set():
+        try:
+            _poll_once(worker_id, batch_size)
+        except Exception:
+            # Unacked jobs are re-queued by the reaper; keep the thread alive
+            logger.exception(f"Worker loop failed, retrying in {WORKER_ERROR_BACKOFF}s")
+            stop.wait(WORKER_ERROR_BACKOFF)
+
+
+def _reaper_loop(stop: threading.Event) -> None:
+    # Re-queue jobs left unacked by crashed workers, then apply the queue's
+    # trimming policy (stream backend)
+    interval = max(1, VISIBILITY_TIMEOUT // 4)
+    while not stop.wait(interval):
+        try:
+            requeued = requeue_stale_raw_events()
+            if requeued:
+                logger.warning(f"Re-queued {requeued} stale in-flight event(s)")
+            trimmed = trim_raw_event_queue()
+            if trimmed:
+                logger.info(f"Trimmed {trimmed} acked entries from the queue")
+        except Exception:
+            logger.exception("Stale job reaper failed")
+
+
+def _metrics_loop(stop: threading.Event) -> None:
+    while not stop.wait(DB_POOL_LOG_INTERVAL):
+        logger.info(f"DB pool: {json.dumps(pool_metrics())}")
+        # Enqueue-to-pop wait per lane, cumulative for this process
+        logger.info(f"Queue lanes: {json.dumps(lane_metrics.snapshot())}")
+
+
+def _check_pool_capacity(concurrency: int) -> None:
+    if DB_ROLE != "worker":
+        logger.warning(f"DB_ROLE={DB_ROLE}; set DB_ROLE=worker to use the worker pool settings")
+    if DB_POOLING == "pgbouncer":
+        return
+    # Each worker thread holds one connection per event or batch
+    settings = pool_settings(DB_ROLE)
+    capacity = settings.pool_size + settings.max_overflow
+    if concurrency > capacity:
+        logger.warning(
+            f"WORKER_CONCURRENCY={concurrency} exceeds the DB pool capacity ({capacity}); "
+            f"threads will wait up to {settings.pool_timeout}s for a connection"
+        )
+
+
+def _install_signal_handlers(stop: threading.Event) -> None:
+    # signal.signal() may only be called from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    def _request_stop(signum, _frame):
+        logger.info(f"Received signal {signum}, finishing in-flight events")
+        stop.set()
+
+    def _reload(signum, _frame):
+        logger.info("Received SIGHUP, reloading AI suggester")
+        reload_suggester()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGHUP, _reload)
 
 
-def run_worker():
+def run_worker(
+    concurrency: int | None = None,
+    stop: threading.Event | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Run worker threads until stop is set.
+
+    Returns:
+        Process exit status: 1 if every worker thread died, 0 otherwise
+    """
     # Configure logging
     log_level = os.getenv("LOG_LEVEL", "INFO")
     setup_logging(log_level)
 
-    logger.info("Worker started")
-    while True:
-        job = pop_raw_event()
-        if not job:
-            time.sleep(0.5)
-            continue
+    concurrency = max(1, concurrency or WORKER_CONCURRENCY)
+    batch_size = max(1, batch_size or WORKER_BATCH_SIZE)
+    stop = stop or threading.Event()
+    _install_signal_handlers(stop)
 
-        raw_event_id = job["raw_event_id"]
-        db = SessionLocal()
-        try:
-            process_event(db, raw_event_id)
-        finally:
-            db.close()
+    workers = [
+        threading.Thread(target=_worker_loop, args=(stop, batch_size), name=f"worker-{i}")
+        for i in range(concurrency)
+    ]
+    threads = list(workers)
+    queue_backend = get_queue_backend()
+    if queue_backend.reliable:
+        threads.append(threading.Thread(target=_reaper_loop, args=(stop,), name="reaper"))
+    if DB_POOL_LOG_INTERVAL > 0:
+        threads.append(threading.Thread(target=_metrics_loop, args=(stop,), name="metrics"))
+    _check_pool_capacity(concurrency)
+    # Build the suggester once up front; threads share it and its connection pool
+    get_shared_suggester()
+    for t in threads:
+        t.start()
+
+    logger.info(
+        f"Worker started (concurrency={concurrency}, batch_size={batch_size}, "
+        f"queue={queue_backend.name})"
+    )
+
+    # Join with a timeout so the main thread stays responsive to signals
+    crashed = False
+    while any(t.is_alive() for t in threads):
+        for t in threads:
+            t.join(timeout=1.0)
+        if not stop.is_set() and not any(w.is_alive() for w in workers):
+            # The reaper and metrics threads would otherwise keep a process
+            # that no longer consumes alive; exit so the supervisor restarts it
+            logger.error("All worker threads died, shutting down")
+            crashed = True
+            stop.set()
+
+    logger.info("Worker stopped")
+    return 1 if crashed else 0
 
 
 if __name__ == "__main__":
-    run_worker()
+    sys.exit(run_worker())
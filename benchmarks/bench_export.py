@@ -0,0 +1,159 @@
+"""
+Benchmark: /api/export memory and throughput on a large database.
+
+Seeds a file-backed SQLite database with synthetic rows (1M by default,
+spread over raw events, candidates and AI suggestions), then runs each
+export mode in a fresh child process and reports that process's peak RSS
+and rows/sec:
+
+    ndjson      streaming iter_ndjson_export (yield_per + StreamingResponse body)
+    json        default single-document export (every table materialized)
+
+Usage:
+    python -m benchmarks.bench_export --rows 1000000
+    python -m benchmarks.bench_export --rows 200000 --modes ndjson,json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+def seed(url: str, rows: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from app.models.ai_suggestion import AISuggestion
+    from app.models.raw_event import RawEvent
+    from app.models.review_action import ReviewAction
+    from app.models.task import Task
+    from app.models.task_candidate import TaskCandidate
+
+    engine = create_engine(url)
+    for model in (RawEvent, TaskCandidate, Task, ReviewAction, AISuggestion):
+        model.metadata.create_all(engine)
+
+    # Half raw events, a quarter candidates, a quarter AI suggestions
+    base = datetime(2024, 1, 1)
+    chunk = 20_000
+    with engine.begin() as conn:
+        for start in range(0, rows // 2, chunk):
+            conn.execute(
+                insert(RawEvent),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "source": "dictation",
+                        "received_at": base + timedelta(seconds=i),
+                        "payload": f"Call the plumber about the kitchen sink #{i}",
+                        "processed": True,
+                    }
+                    for i in range(start, min(start + chunk, rows // 2))
+                ],
+            )
+        for start in range(0, rows // 4, chunk):
+            ids = [str(uuid.uuid4()) for _ in range(start, min(start + chunk, rows // 4))]
+            conn.execute(
+                insert(AISuggestion),
+                [
+                    {
+                        "id": ai_id,
+                        "raw_event_id": "evt",
+                        "provider": "openai",
+                        "model": "gpt-4o-mini",
+                        "prompt_version": "v1",
+                        "input_excerpt": "Call the plumber",
+                        "suggestion_json": {"title": "Call the plumber", "confidence": 0.8},
+                        "rationale": "Explicit request",
+                        "created_at": base,
+                    }
+                    for ai_id in ids
+                ],
+            )
+            conn.execute(
+                insert(TaskCandidate),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "raw_event_id": "evt",
+                        "created_at": base,
+                        "title": "Call the plumber",
+                        "description": "Kitchen sink leak",
+                        "priority": "medium",
+                        "status": "pending",
+                        "ai_suggestion_id": ai_id,
+                    }
+                    for ai_id in ids
+                ],
+            )
+    engine.dispose()
+
+
+def run_mode(mode: str) -> dict:
+    """Export once in this process; return rows, bytes, seconds and peak RSS."""
+    from app.api_export import export_all, iter_ndjson_export
+    from app.core.db import get_async_sessionmaker
+
+    start = time.perf_counter()
+    if mode == "ndjson":
+        size = lines = 0
+        for chunk in iter_ndjson_export():
+            size += len(chunk)
+            lines += chunk.count("\n")
+        rows = lines - 1  # header line
+    else:
+
+        async def export_json() -> dict:
+            async with get_async_sessionmaker()() as db:
+                return await export_all(format="json", db=db)
+
+        payload = asyncio.run(export_json())
+        size = len(json.dumps(payload))
+        rows = sum(len(v) for v in payload.values() if isinstance(v, list))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"rows": rows, "mb": size / 1e6, "seconds": elapsed, "peak_rss_mb": peak_mb}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--modes", default="ndjson", help="comma-separated: ndjson,json")
+    parser.add_argument("--run-mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode)))
+        return
+
+    tmpdir = tempfile.mkdtemp(prefix="lifeos-bench-")
+    url = f"sqlite:///{tmpdir}/export.db"
+    print(f"seeding {args.rows} rows ...", flush=True)
+    seed(url, args.rows)
+
+    env = dict(os.environ, DATABASE_URL=url, LOG_LEVEL="WARNING")
+    print(f"{'mode':>8} {'rows':>10} {'MB out':>8} {'rows/s':>10} {'peak RSS MB':>12}")
+    for mode in args.modes.split(","):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_export", "--run-mode", mode],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        rate = r["rows"] / r["seconds"]
+        print(f"{mode:>8} {r['rows']:>10} {r['mb']:>8.1f} {rate:>10.0f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
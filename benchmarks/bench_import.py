@@ -0,0 +1,151 @@
+"""
+Benchmark: /api/import rows/sec, bulk upsert engine vs. per-row merge.
+
+Builds a synthetic archive (raw events + task candidates) and imports it
+into a fresh file-backed SQLite database three ways:
+
+    merge           the previous path: json.loads + db.merge() per row, one commit
+    bulk-json       app.core.archive on the JSON document (ijson if installed)
+    bulk-ndjson     app.core.archive on the NDJSON export format
+
+Each bulk mode is run twice to show that re-importing (all conflicts) is
+just as cheap and leaves the row count unchanged.
+
+Usage:
+    python -m benchmarks.bench_import --rows 100000 --chunk-size 1000
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+_tmpdir = tempfile.mkdtemp(prefix="lifeos-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/unused.db")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api_export import IMPORT_TABLES, parse_dt  # noqa: E402
+from app.core.archive import bulk_import, iter_archive_records  # noqa: E402
+from app.models.raw_event import RawEvent  # noqa: E402
+from app.models.task_candidate import TaskCandidate  # noqa: E402
+
+
+def build_archive(rows: int) -> dict:
+    events = [
+        {
+            "id": str(uuid.uuid4()),
+            "source": "dictation",
+            "received_at": "2025-01-01T00:00:00",
+            "payload": f"Call the plumber about the kitchen sink #{i}",
+            "processed": True,
+        }
+        for i in range(rows // 2)
+    ]
+    candidates = [
+        {
+            "id": str(uuid.uuid4()),
+            "raw_event_id": e["id"],
+            "created_at": "2025-01-01T00:00:00",
+            "title": "Call the plumber",
+            "description": "Kitchen sink leak",
+            "priority": "medium",
+            "status": "pending",
+            "ai_suggestion_id": None,
+        }
+        for e in events
+    ]
+    return {"raw_events": events, "task_candidates": candidates}
+
+
+def to_ndjson(archive: dict) -> bytes:
+    lines = [json.dumps({"exported_at": "2025-01-01T00:00:00"})]
+    for table, records in archive.items():
+        lines.extend(json.dumps({"table": table, "record": r}) for r in records)
+    return ("\n".join(lines) + "\n").encode()
+
+
+def fresh_session(name: str):
+    engine = create_engine(f"sqlite:///{_tmpdir}/{name}.db")
+    RawEvent.metadata.create_all(engine)
+    TaskCandidate.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def legacy_merge(db, body: bytes) -> int:
+    """The pre-engine import loop (raw events and candidates only)."""
+    payload = json.loads(body.decode())
+    count = 0
+    for r in payload.get("raw_events", []):
+        db.merge(
+            RawEvent(
+                id=r.get("id"),
+                source=r.get("source"),
+                received_at=parse_dt(r.get("received_at")),
+                payload=r.get("payload"),
+                processed=bool(r.get("processed", False)),
+            )
+        )
+        count += 1
+    for c in payload.get("task_candidates", []):
+        db.merge(
+            TaskCandidate(
+                id=c.get("id"),
+                raw_event_id=c.get("raw_event_id"),
+                created_at=parse_dt(c.get("created_at")),
+                title=c.get("title"),
+                description=c.get("description"),
+                priority=c.get("priority"),
+                status=c.get("status"),
+                ai_suggestion_id=c.get("ai_suggestion_id"),
+            )
+        )
+        count += 1
+    db.commit()
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    archive = build_archive(args.rows)
+    document = json.dumps(archive).encode()
+    ndjson = to_ndjson(archive)
+
+    print(f"{'mode':>14} {'run':>4} {'rows':>8} {'seconds':>8} {'rows/s':>9} {'in db':>8}")
+
+    def report(mode: str, run: int, db, count: int, elapsed: float) -> None:
+        total = db.query(RawEvent).count() + db.query(TaskCandidate).count()
+        print(f"{mode:>14} {run:>4} {count:>8} {elapsed:>8.2f} {count / elapsed:>9.0f} {total:>8}")
+
+    db = fresh_session("merge")
+    start = time.perf_counter()
+    count = legacy_merge(db, document)
+    report("merge", 1, db, count, time.perf_counter() - start)
+    db.close()
+
+    for mode, body, fmt in (("bulk-json", document, "json"), ("bulk-ndjson", ndjson, "ndjson")):
+        db = fresh_session(mode)
+        for run in (1, 2):
+            start = time.perf_counter()
+            counts = bulk_import(
+                db,
+                iter_archive_records(io.BytesIO(body), fmt),
+                IMPORT_TABLES,
+                chunk_size=args.chunk_size,
+            )
+            report(mode, run, db, sum(counts.values()), time.perf_counter() - start)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
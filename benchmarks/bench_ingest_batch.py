@@ -0,0 +1,101 @@
+"""
+Benchmark: dictation ingest, N sequential single posts vs. batch uploads.
+
+Drives the real app in-process (httpx ASGITransport) against a temporary
+SQLite file and sends the same N dictations two ways:
+
+    single      N x POST /ingest/dictation: N claims, inserts, commits, LPUSHes
+    batch-B     N/B x POST /ingest/dictation/batch with B items each: one
+                pipelined claim, one multi-row INSERT, one commit and one LPUSH
+                per request
+
+Redis is an in-memory fakeredis by default, which hides network round trips
+and so understates the gap; pass --redis-url to measure against a real
+server (keys are written under the usual lifeos:* names).
+
+Usage:
+    python -m benchmarks.bench_ingest_batch --items 2000 --batch-sizes 10,100,500
+    python -m benchmarks.bench_ingest_batch --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+_tmpdir = tempfile.mkdtemp(prefix="lifeos-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/ingest.db")
+
+from unittest.mock import patch  # noqa: E402
+
+import httpx  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.models.raw_event import RawEvent  # noqa: E402
+
+
+async def post_single(http: httpx.AsyncClient, texts: list[str]) -> int:
+    for text in texts:
+        res = await http.post("/ingest/dictation", json={"text": text})
+        res.raise_for_status()
+    return len(texts)
+
+
+async def post_batches(http: httpx.AsyncClient, texts: list[str], size: int) -> int:
+    for start in range(0, len(texts), size):
+        items = [{"text": t} for t in texts[start : start + size]]
+        res = await http.post("/ingest/dictation/batch", json=items)
+        res.raise_for_status()
+        assert res.json()["accepted"] == len(items)
+    return -(-len(texts) // size)
+
+
+async def run(items: int, batch_sizes: list[int]) -> None:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        print(f"{'mode':>10} {'items':>7} {'requests':>9} {'seconds':>8} {'items/s':>9}")
+        modes = [("single", 1)] + [(f"batch-{size}", size) for size in batch_sizes]
+        for mode, size in modes:
+            # Fresh texts per mode so nothing is deduplicated
+            run_id = uuid.uuid4().hex[:8]
+            texts = [f"Call the plumber about the sink #{i} ({run_id})" for i in range(items)]
+            start = time.perf_counter()
+            if mode == "single":
+                requests = await post_single(http, texts)
+            else:
+                requests = await post_batches(http, texts, size)
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>10} {items:>7} {requests:>9} {elapsed:>8.2f} {items / elapsed:>9.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="10,100,500", help="comma-separated sizes")
+    parser.add_argument("--redis-url", help="defaults to an in-memory fakeredis")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    RawEvent.metadata.create_all(engine)
+
+    if args.redis_url:
+        import redis
+
+        client = redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeRedis(decode_responses=True)
+
+    batch_sizes = [int(s) for s in args.batch_sizes.split(",")]
+    with patch("app.core.queue.redis_client", client):
+        asyncio.run(run(args.items, batch_sizes))
+
+
+if __name__ == "__main__":
+    main()
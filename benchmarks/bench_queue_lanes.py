@@ -0,0 +1,112 @@
+"""
+Benchmark: interactive queue wait while a large backfill drains, FIFO vs. lanes.
+
+Enqueues a backfill backlog, then has a producer thread enqueue interactive
+jobs at a steady rate while one consumer pops batches and "processes" each
+job for --job-ms milliseconds. Reports the enqueue-to-pop wait of the
+interactive jobs two ways:
+
+    fifo     every job on the default lane: interactive jobs wait behind the
+             whole backlog ahead of them
+    lanes    backfill on the backfill lane, interactive on the interactive
+             lane, dequeued by weight (QUEUE_LANES)
+
+Redis is an in-memory fakeredis by default; pass --redis-url to run against
+a real server (keys are written under the usual lifeos:* names).
+
+Usage:
+    python -m benchmarks.bench_queue_lanes --backlog 2000 --interactive 50
+    python -m benchmarks.bench_queue_lanes --backend stream --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from unittest.mock import patch
+
+from app.core import queue
+from app.core.lanes import BACKFILL_LANE, DEFAULT_LANE, INTERACTIVE_LANE
+
+
+def run_mode(
+    lanes: bool, backlog: int, interactive: int, interval: float, batch: int, job_ms: float
+) -> list[float]:
+    """Drain one backlog; returns interactive waits in milliseconds."""
+    queue.enqueue_raw_events(
+        [f"backfill-{i}" for i in range(backlog)], BACKFILL_LANE if lanes else DEFAULT_LANE
+    )
+    enqueued: dict[str, float] = {}
+
+    def produce() -> None:
+        for i in range(interactive):
+            enqueued[f"live-{i}"] = time.perf_counter()
+            queue.enqueue_raw_event(f"live-{i}", INTERACTIVE_LANE if lanes else DEFAULT_LANE)
+            time.sleep(interval)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+
+    waits: list[float] = []
+    remaining = backlog + interactive
+    while remaining:
+        jobs = queue.pop_raw_events(batch, timeout=1, worker_id="bench")
+        now = time.perf_counter()
+        for job in jobs:
+            if job["raw_event_id"] in enqueued:
+                waits.append(1000 * (now - enqueued[job["raw_event_id"]]))
+            queue.ack_raw_event(job)
+        time.sleep(len(jobs) * job_ms / 1000)
+        remaining -= len(jobs)
+    producer.join()
+    return waits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backlog", type=int, default=2000, help="backfill jobs queued first")
+    parser.add_argument("--interactive", type=int, default=50, help="interactive jobs")
+    parser.add_argument("--interval-ms", type=float, default=40, help="between interactive jobs")
+    parser.add_argument("--batch", type=int, default=10, help="jobs per pop")
+    parser.add_argument("--job-ms", type=float, default=1.0, help="simulated work per job")
+    parser.add_argument("--backend", choices=sorted(queue.QUEUE_BACKENDS), default="list")
+    parser.add_argument("--redis-url", help="defaults to an in-memory fakeredis")
+    args = parser.parse_args()
+
+    if args.redis_url:
+        import redis
+
+        client = redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeRedis(decode_responses=True)
+
+    print(f"{'mode':>6} {'backlog':>8} {'live':>5} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in ("fifo", "lanes"):
+        with (
+            patch.object(queue, "redis_client", client),
+            patch.object(queue, "QUEUE_BACKEND", args.backend),
+            patch.dict(queue._backends, clear=True),
+        ):
+            waits = run_mode(
+                mode == "lanes",
+                args.backlog,
+                args.interactive,
+                args.interval_ms / 1000,
+                args.batch,
+                args.job_ms,
+            )
+        p50 = statistics.median(waits)
+        p99 = (
+            statistics.quantiles(waits, n=100, method="inclusive")[98]
+            if len(waits) > 1
+            else waits[0]
+        )
+        print(
+            f"{mode:>6} {args.backlog:>8} {len(waits):>5} {p50:>8.1f} {p99:>8.1f} {max(waits):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
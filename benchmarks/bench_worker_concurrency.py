@@ -0,0 +1,121 @@
+"""
+Benchmark: worker throughput as WORKER_CONCURRENCY grows.
+
+Runs app.worker.run_worker against a file-backed SQLite database, an
+in-memory queue and a stub suggester with injected latency, so no Postgres,
+Redis or AI provider is needed. Reports events/sec per concurrency level.
+
+Usage:
+    python -m benchmarks.bench_worker_concurrency --events 200 --latency 0.05
+"""
+
+import argparse
+import os
+import queue
+import tempfile
+import threading
+import time
+
+_tmpdir = tempfile.mkdtemp(prefix="lifeos-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/bench.db")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from unittest.mock import patch  # noqa: E402
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.ai.contract import AISuggestion  # noqa: E402
+from app.models.ai_suggestion import AISuggestion as AISuggestionModel  # noqa: E402
+from app.models.raw_event import RawEvent  # noqa: E402
+from app.models.summary import Summary  # noqa: E402
+from app.models.task_candidate import TaskCandidate  # noqa: E402
+
+
+class SlowSuggester:
+    """Stub suggester that sleeps to simulate provider latency."""
+
+    provider_name = "stub"
+    model_name = "stub-latency"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def suggest(self, text: str) -> AISuggestion | None:
+        time.sleep(self.latency)
+        return AISuggestion(
+            title=text[:60],
+            description=text,
+            priority="medium",
+            confidence=0.9,
+            rationale="benchmark",
+        )
+
+
+def run_level(concurrency: int, events: int, latency: float, batch_size: int = 1) -> float:
+    from app.worker import run_worker
+
+    engine = create_engine(f"sqlite:///{_tmpdir}/bench-{concurrency}.db")
+    for model in (RawEvent, Summary, TaskCandidate, AISuggestionModel):
+        model.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    jobs: queue.Queue = queue.Queue()
+    with factory() as db:
+        rows = [RawEvent(source="dictation", payload=f"Benchmark task {i}") for i in range(events)]
+        db.add_all(rows)
+        db.commit()
+        for row in rows:
+            jobs.put({"raw_event_id": row.id})
+
+    stop = threading.Event()
+    suggester = SlowSuggester(latency)
+
+    def pop(timeout: int = 2, worker_id: str = "default"):
+        try:
+            return jobs.get_nowait()
+        except queue.Empty:
+            stop.set()
+            return None
+
+    def pop_many(max_items: int, timeout: int = 2, worker_id: str = "default"):
+        batch = []
+        while len(batch) < max_items and (job := pop(timeout, worker_id)):
+            batch.append(job)
+        return batch
+
+    start = time.perf_counter()
+    with (
+        patch("app.worker.pop_raw_event", side_effect=pop),
+        patch("app.worker.pop_raw_events", side_effect=pop_many),
+        patch("app.worker.SessionLocal", factory),
+        patch("app.worker.get_shared_suggester", return_value=suggester),
+        patch("app.worker.setup_logging"),
+    ):
+        run_worker(concurrency=concurrency, stop=stop, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    with factory() as db:
+        done = db.query(RawEvent).filter(RawEvent.processed.is_(True)).count()
+    engine.dispose()
+    assert done == events, f"only {done}/{events} events processed"
+    return events / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub AI latency (s)")
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"events={args.events} latency={args.latency}s batch_size={args.batch_size}")
+    print(f"{'concurrency':>12} {'events/sec':>12}")
+    for level in (int(x) for x in args.levels.split(",")):
+        rate = run_level(level, args.events, args.latency, args.batch_size)
+        print(f"{level:>12} {rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
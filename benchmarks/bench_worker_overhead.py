@@ -0,0 +1,106 @@
+"""
+Benchmark: per-event worker overhead, excluding provider latency.
+
+Measures process_event on an in-memory SQLite database in three modes:
+
+    ai-disabled      AI_PROVIDER=none (stub summarizer only)
+    stub-rebuilt     OpenAI suggester rebuilt for every event (pre-cache behaviour)
+    stub-shared      OpenAI suggester built once per process (get_shared_suggester)
+
+The OpenAI client is real but its completions call is stubbed, so the
+numbers isolate env parsing, client construction and DB work.
+
+Usage:
+    python -m benchmarks.bench_worker_overhead --events 500
+"""
+
+import argparse
+import json
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import logging  # noqa: E402
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.ai import factory  # noqa: E402
+from app.models.ai_suggestion import AISuggestion  # noqa: E402
+from app.models.raw_event import RawEvent  # noqa: E402
+from app.models.summary import Summary  # noqa: E402
+from app.models.task_candidate import TaskCandidate  # noqa: E402
+from app.worker import process_event  # noqa: E402
+
+CANNED = SimpleNamespace(
+    choices=[
+        SimpleNamespace(
+            message=SimpleNamespace(
+                content=json.dumps(
+                    {
+                        "title": "Call the plumber",
+                        "description": "Kitchen sink leak",
+                        "priority": "medium",
+                        "confidence": 0.8,
+                        "rationale": "Explicit request",
+                    }
+                )
+            )
+        )
+    ]
+)
+
+
+def per_event_us(events: int, rebuild: bool) -> float:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    for model in (RawEvent, Summary, TaskCandidate, AISuggestion):
+        model.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    rows = [RawEvent(source="dictation", payload=f"Call the plumber #{i}") for i in range(events)]
+    db.add_all(rows)
+    db.commit()
+    ids = [row.id for row in rows]
+
+    factory.reload_suggester()
+    start = time.perf_counter()
+    for raw_event_id in ids:
+        if rebuild:
+            factory.reload_suggester()
+        process_event(db, raw_event_id)
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    engine.dispose()
+    return elapsed / events * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'mode':>14} {'us/event':>10}")
+    with patch.dict(os.environ, {"AI_PROVIDER": "none"}):
+        print(f"{'ai-disabled':>14} {per_event_us(args.events, rebuild=False):>10.1f}")
+
+    try:
+        from openai.resources.chat.completions import Completions
+    except ImportError:
+        print("openai not installed; skipping stub-client modes (pip install -e '.[ai]')")
+        return
+
+    env = {"AI_PROVIDER": "openai", "OPENAI_API_KEY": "sk-bench", "AI_CACHE_BACKEND": "none"}
+    with patch.dict(os.environ, env), patch.object(Completions, "create", return_value=CANNED):
+        print(f"{'stub-rebuilt':>14} {per_event_us(args.events, rebuild=True):>10.1f}")
+        print(f"{'stub-shared':>14} {per_event_us(args.events, rebuild=False):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
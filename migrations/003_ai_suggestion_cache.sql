@@ -0,0 +1,18 @@
+-- AI suggestion cache
+-- Migration: Content-address ai_suggestions rows so repeated input can reuse them
+
+-- 1. SHA-256 of (prompt_version, provider, model, redacted input); see app/ai/cache.py
+ALTER TABLE ai_suggestions
+ADD COLUMN IF NOT EXISTS input_hash VARCHAR NULL;
+
+-- 2. Index for cache lookups (AI_CACHE_BACKEND=db)
+CREATE INDEX IF NOT EXISTS idx_ai_suggestions_input_hash
+ON ai_suggestions(input_hash, created_at);
+
+COMMENT ON COLUMN ai_suggestions.input_hash IS 'Content address of the redacted input + prompt version + provider + model. Rows sharing a hash indicate cache reuse.';
+
+-- 3. Verification queries
+-- Count suggestions served more than once from the same input:
+-- SELECT input_hash, COUNT(*) FROM ai_suggestions
+-- WHERE input_hash IS NOT NULL
+-- GROUP BY input_hash HAVING COUNT(*) > 1;
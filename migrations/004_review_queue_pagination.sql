@@ -0,0 +1,18 @@
+-- Review queue pagination
+-- Migration: Composite indexes for keyset pagination of GET /api/review
+
+-- 1. Pending candidates ordered by (created_at, id) for cursor paging
+CREATE INDEX IF NOT EXISTS idx_task_candidates_review
+ON task_candidates(status, created_at DESC, id DESC);
+
+-- 2. Same ordering when filtering by priority
+CREATE INDEX IF NOT EXISTS idx_task_candidates_review_priority
+ON task_candidates(status, priority, created_at DESC, id DESC);
+
+-- AI/manual, provider and min_confidence filters join ai_suggestions by
+-- primary key and are applied to rows already read in index order.
+
+-- 3. Verification query (should use idx_task_candidates_review):
+-- EXPLAIN SELECT id FROM task_candidates
+-- WHERE status = 'pending' AND (created_at, id) < ('2024-01-01', 'x')
+-- ORDER BY created_at DESC, id DESC LIMIT 51;
@@ -0,0 +1,19 @@
+-- Idempotent ingest
+-- Migration: Dedup key on raw_events so duplicate deliveries cannot become second rows
+
+-- 1. '{source}:{Idempotency-Key or Slack event_id}' or
+--    '{source}:sha256:{hash of normalized payload + time bucket}'; see app/core/idempotency.py
+ALTER TABLE raw_events
+ADD COLUMN IF NOT EXISTS dedup_key VARCHAR NULL;
+
+-- 2. Unique index: the authority behind the Redis fast path. Rows ingested
+-- before this migration keep NULL, which never conflicts.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_raw_events_dedup_key
+ON raw_events(dedup_key);
+
+COMMENT ON COLUMN raw_events.dedup_key IS 'Idempotency key of the ingested event. raw_events.id is derived from it (uuid5), so duplicates conflict on insert.';
+
+-- 3. Verification query (should return no rows):
+-- SELECT dedup_key, COUNT(*) FROM raw_events
+-- WHERE dedup_key IS NOT NULL
+-- GROUP BY dedup_key HAVING COUNT(*) > 1;
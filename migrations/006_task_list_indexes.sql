@@ -0,0 +1,25 @@
+-- Task list pagination
+-- Migration: Indexes for status/priority filtering and keyset pagination of GET /api/tasks
+
+-- 1. All statuses ordered by (status, created_at, id) for cursor paging
+CREATE INDEX IF NOT EXISTS idx_tasks_list
+ON tasks(status, created_at DESC, id DESC);
+
+-- 2. Same ordering when filtering by priority
+CREATE INDEX IF NOT EXISTS idx_tasks_list_priority
+ON tasks(status, priority, created_at DESC, id DESC);
+
+-- 3. Partial indexes on active tasks: the default view reads a small index
+-- that does not grow with completed tasks
+CREATE INDEX IF NOT EXISTS idx_tasks_active
+ON tasks(created_at DESC, id DESC)
+WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_tasks_active_priority
+ON tasks(priority, created_at DESC, id DESC)
+WHERE status = 'active';
+
+-- 4. Verification query (should use idx_tasks_active):
+-- EXPLAIN SELECT id FROM tasks
+-- WHERE status = 'active' AND (created_at, id) < ('2024-01-01', 'x')
+-- ORDER BY created_at DESC, id DESC LIMIT 51;
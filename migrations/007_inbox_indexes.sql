@@ -0,0 +1,25 @@
+-- Inbox pagination
+-- Migration: Indexes for keyset pagination of GET /api/inbox
+
+-- 1. All events ordered by (received_at, id) for cursor paging
+CREATE INDEX IF NOT EXISTS idx_raw_events_inbox
+ON raw_events(received_at DESC, id DESC);
+
+-- 2. Same ordering when filtering by source
+CREATE INDEX IF NOT EXISTS idx_raw_events_inbox_source
+ON raw_events(source, received_at DESC, id DESC);
+
+-- 3. Partial index on unprocessed events: stays as small as the worker's
+-- backlog, however many events have been processed
+CREATE INDEX IF NOT EXISTS idx_raw_events_unprocessed
+ON raw_events(received_at DESC, id DESC)
+WHERE processed = false;
+
+-- 4. The boolean index matches half the table either way and is superseded
+-- by the partial index above
+DROP INDEX IF EXISTS idx_raw_events_processed;
+
+-- 5. Verification query (should use idx_raw_events_unprocessed):
+-- EXPLAIN SELECT id FROM raw_events
+-- WHERE processed = false AND (received_at, id) < ('2024-01-01', 'x')
+-- ORDER BY received_at DESC, id DESC LIMIT 51;
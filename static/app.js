@@ -1,6 +1,6 @@
-async function loadTasks(){
-  const r = await fetch('/api/tasks?status=active');
-  const tasks = await r.json();
+async function loadTasks(page){
+  if (!page) page = await (await fetch('/api/tasks?status=active')).json();
+  const tasks = page.items;
   const el = document.getElementById("tasks");
   el.innerHTML="";
   
@@ -52,9 +52,9 @@ async function addTask(){
   loadTasks();
 }
 
-async function loadInbox(){
-  const r = await fetch('/api/inbox');
-  const items = await r.json();
+async function loadInbox(page){
+  if (!page) page = await (await fetch('/api/inbox')).json();
+  const items = page.items;
   const el = document.getElementById("inbox");
   el.innerHTML="";
   if (!items || items.length === 0) {
@@ -65,7 +65,7 @@ async function loadInbox(){
   items.forEach(ev=>{
     const d=document.createElement("div");
     d.className = 'card';
-    d.innerHTML = `<div style="flex:1"><div><strong>[${escapeHtml(ev.source||'manual')}]</strong> ${escapeHtml(ev.payload||'')}</div><div class="meta">${formatDate(ev.created_at||ev.ingest_time||new Date())}</div></div>`;
+    d.innerHTML = `<div style="flex:1"><div><strong>[${escapeHtml(ev.source||'manual')}]</strong> ${escapeHtml(ev.payload||'')}${ev.payload_truncated ? '…' : ''}</div><div class="meta">${formatDate(ev.received_at||new Date())}</div></div>`;
     el.appendChild(d);
   });
 }
@@ -83,61 +83,106 @@ async function addEvent(){
   loadInbox();
 }
 
-async function loadReview(){
-  const r = await fetch('/api/review');
-  const items = await r.json();
+async function loadReview(cursor, page){
+  if (!page) {
+    const url = cursor ? `/api/review?cursor=${encodeURIComponent(cursor)}` : '/api/review';
+    page = await (await fetch(url)).json();
+  }
+  const items = page.items;
   const el = document.getElementById("review");
-  el.innerHTML="";
+  const more = document.getElementById("review-more");
+  if (more) more.remove();
+  if (!cursor) el.innerHTML="";
   
-  if (items.length === 0) {
+  if (!cursor && items.length === 0) {
     el.innerHTML = '<div class="card">No pending candidates</div>';
     return;
   }
   
-  items.forEach(c=>{
-    const d=document.createElement("div");
-    d.className = "card review-item";
-    d.id = `candidate-${c.id}`;
-
-    // Build AI metadata display
-    let aiInfo = '';
-    if (c.ai_metadata) {
-      const confidence = Math.round((c.ai_metadata.confidence || 0) * 100);
-      aiInfo = `
-        <div class="ai-badge">
-          <span class="badge ai">🤖 ${escapeHtml(c.ai_metadata.provider||'AI')}</span>
-          <span class="confidence">Confidence: ${confidence}%</span>
-        </div>
-        <details class="rationale-expand">
-          <summary>Why suggested</summary>
-          <p>${escapeHtml(c.ai_metadata.rationale||'')}</p>
-        </details>
-      `;
-    }
+  items.forEach(c => el.appendChild(renderCandidate(c)));
+
+  if (page.next_cursor) {
+    const btn = document.createElement("button");
+    btn.id = "review-more";
+    btn.className = "btn";
+    btn.textContent = "Load more";
+    btn.onclick = () => loadReview(page.next_cursor);
+    el.appendChild(btn);
+  }
+}
 
-    d.innerHTML = `
-      <div style="display:flex; align-items:center; justify-content:space-between; gap:12px;">
-        <div>
-          <strong>${escapeHtml(c.title)}</strong>
-          ${c.priority ? `<span class="badge ${c.priority}">${escapeHtml(c.priority.toUpperCase())}</span>` : ''}
-          <span class="badge pending">PENDING</span>
-        </div>
-      </div>
-      ${c.description ? `<div style="margin-top:0.5rem; color:#4b5563;">${escapeHtml(c.description)}</div>` : ''}
-      ${aiInfo}
-      <div style="margin-top:0.75rem; display:flex; gap:8px;">
-        <button class="btn" onclick="approveCandidate('${c.id}')">Approve</button>
-        <button class="btn" style="background:#6b7280;" onclick="rejectCandidate('${c.id}')">Reject</button>
+function renderCandidate(c){
+  const d=document.createElement("div");
+  d.className = "card review-item";
+  d.id = `candidate-${c.id}`;
+
+  // Build AI metadata display
+  let aiInfo = '';
+  if (c.ai_metadata) {
+    const confidence = Math.round((c.ai_metadata.confidence || 0) * 100);
+    aiInfo = `
+      <div class="ai-badge">
+        <span class="badge ai">🤖 ${escapeHtml(c.ai_metadata.provider||'AI')}</span>
+        <span class="confidence">Confidence: ${confidence}%</span>
       </div>
-      <div class="meta">Created ${formatDate(c.created_at)}</div>
+      <details class="rationale-expand">
+        <summary>Why suggested</summary>
+        <p>${escapeHtml(c.ai_metadata.rationale||'')}</p>
+      </details>
     `;
-    el.appendChild(d);
-  });
+  }
+
+  d.innerHTML = `
+    <div style="display:flex; align-items:center; justify-content:space-between; gap:12px;">
+      <div>
+        <strong>${escapeHtml(c.title)}</strong>
+        ${c.priority ? `<span class="badge ${c.priority}">${escapeHtml(c.priority.toUpperCase())}</span>` : ''}
+        <span class="badge pending">PENDING</span>
+      </div>
+    </div>
+    ${c.description ? `<div style="margin-top:0.5rem; color:#4b5563;">${escapeHtml(c.description)}</div>` : ''}
+    ${aiInfo}
+    <div style="margin-top:0.75rem; display:flex; gap:8px;">
+      <button class="btn" onclick="approveCandidate('${c.id}')">Approve</button>
+      <button class="btn" style="background:#6b7280;" onclick="rejectCandidate('${c.id}')">Reject</button>
+    </div>
+    <div class="meta">Created ${formatDate(c.created_at)}</div>
+  `;
+  return d;
+}
+
+// Review queue updates pushed by the server (GET /api/review/events)
+function onReviewEvent(e){
+  const data = JSON.parse(e.data);
+  const el = document.getElementById("review");
+  if (e.type === "candidate_created") {
+    if (document.getElementById(`candidate-${data.id}`)) return;
+    // Drop the "No pending candidates" placeholder
+    if (!el.querySelector(".review-item")) el.innerHTML = "";
+    el.prepend(renderCandidate(data));
+    return;
+  }
+  const item = document.getElementById(`candidate-${data.candidate_id}`);
+  if (item) item.remove();
+  if (!el.querySelector(".review-item") && !document.getElementById("review-more")) {
+    el.innerHTML = '<div class="card">No pending candidates</div>';
+  }
+  if (e.type === "approved") {
+    loadApproved();
+    loadTasks();
+  }
+}
+
+function subscribeReviewEvents(){
+  // EventSource reconnects on its own and resumes from Last-Event-ID
+  const source = new EventSource('/api/review/events');
+  ["candidate_created", "approved", "rejected"].forEach(type => source.addEventListener(type, onReviewEvent));
+  // Missed more than the server keeps: fall back to a full reload
+  source.addEventListener("reset", () => loadReview());
 }
 
-async function loadApproved(){
-  const r = await fetch('/api/review/approved');
-  const items = await r.json();
+async function loadApproved(items){
+  if (!items) items = await (await fetch('/api/review/approved')).json();
   const el = document.getElementById("approved");
   el.innerHTML="";
   
@@ -216,10 +261,9 @@ async function approveCandidate(id) {
       return;
     }
 
+    // The approved event refreshes approvals and tasks (and other open tabs)
     showToast(data.message || "Task approved", "success");
-    await loadReview();
-    await loadApproved();
-    await loadTasks();
+    if (item) item.remove();
   } catch (err) {
     showToast("Approval failed", "error");
     if (item) {
@@ -247,8 +291,7 @@ async function rejectCandidate(id) {
     }
 
     showToast(data.message || "Candidate rejected", "success");
-    await loadReview();
-    await loadApproved();
+    if (item) item.remove();
   } catch (err) {
     showToast("Rejection failed", "error");
     if (item) {
@@ -277,14 +320,18 @@ async function toggleTaskComplete(taskId, checked) {
 }
 
 async function loadAll(){
-  await loadInbox();
-  await loadReview();
-  await loadApproved();
-  await loadTasks();
+  // One request for every panel; unchanged dashboards revalidate as 304
+  const r = await fetch('/api/dashboard');
+  const dash = await r.json();
+  loadInbox(dash.inbox);
+  loadReview(null, dash.review);
+  loadApproved(dash.approved);
+  loadTasks(dash.tasks);
 }
 
 document.addEventListener('DOMContentLoaded', function(){
   loadAll();
+  subscribeReviewEvents();
   // Export button
   const exportBtn = document.getElementById('export-btn');
   if (exportBtn) exportBtn.addEventListener('click', async ()=>{
@@ -328,13 +375,13 @@ document.addEventListener('DOMContentLoaded', function(){
 
       // Build a concise human message
       const counts = preview.preview.counts;
-      const collisions = preview.collisions;
+      const collisions = preview.collision_counts;
       let msg = `Import preview:\n`;
-      msg += ` - raw_events: ${counts.raw_events} (existing: ${collisions.raw_events.length})\n`;
-      msg += ` - task_candidates: ${counts.task_candidates} (existing: ${collisions.task_candidates.length})\n`;
-      msg += ` - tasks: ${counts.tasks} (existing: ${collisions.tasks.length})\n`;
-      msg += ` - review_actions: ${counts.review_actions} (existing: ${collisions.review_actions.length})\n`;
-      msg += ` - ai_suggestions: ${counts.ai_suggestions} (existing: ${collisions.ai_suggestions.length})\n\n`;
+      msg += ` - raw_events: ${counts.raw_events} (existing: ${collisions.raw_events})\n`;
+      msg += ` - task_candidates: ${counts.task_candidates} (existing: ${collisions.task_candidates})\n`;
+      msg += ` - tasks: ${counts.tasks} (existing: ${collisions.tasks})\n`;
+      msg += ` - review_actions: ${counts.review_actions} (existing: ${collisions.review_actions})\n`;
+      msg += ` - ai_suggestions: ${counts.ai_suggestions} (existing: ${collisions.ai_suggestions})\n\n`;
       msg += `Samples:\n`;
       if(preview.preview.samples.task_candidates.length){
         preview.preview.samples.task_candidates.forEach(s=>{ msg += ` • candidate: ${s.id} ${s.title || ''}\n` });
@@ -378,12 +425,15 @@ function showImportModal(previewPayload, file){
   // collisions
   collisions.innerHTML = '';
   const col = previewPayload.collisions || {};
+  const colCounts = previewPayload.collision_counts || {};
   Object.keys(col).forEach(k=>{
-    if((col[k] || []).length === 0) return;
+    const total = colCounts[k] || (col[k] || []).length;
+    if(total === 0) return;
     const el = document.createElement('div');
-    el.innerHTML = `<strong>${k}:</strong>`;
+    el.innerHTML = `<strong>${k}:</strong> ${total} existing`;
     const ul = document.createElement('ul'); ul.className = 'collision-list';
     col[k].slice(0,10).forEach(id=>{ const li = document.createElement('li'); li.textContent = id; ul.appendChild(li)});
+    if(total > 10){ const li = document.createElement('li'); li.textContent = `… and ${total - 10} more`; ul.appendChild(li) }
     el.appendChild(ul);
     collisions.appendChild(el);
   });
@@ -3,12 +3,16 @@ Pytest configuration and shared fixtures.
 """
 
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Set test environment before importing app modules
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
@@ -24,6 +28,93 @@ def mock_db_session() -> Generator[MagicMock, None, None]:
     yield session
 
 
+@pytest.fixture
+def mock_async_db_session() -> Generator[MagicMock, None, None]:
+    """Provide a mock async database session (coroutine methods are AsyncMocks)."""
+    session = MagicMock(spec=AsyncSession)
+    yield session
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run @pytest.mark.anyio tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture
+def sqlite_engine() -> Generator[Engine, None, None]:
+    """Provide an in-memory SQLite engine with every model table created."""
+    from app.models.ai_suggestion import AISuggestion
+    from app.models.raw_event import RawEvent
+    from app.models.review_action import ReviewAction
+    from app.models.summary import Summary
+    from app.models.task import Task
+    from app.models.task_candidate import TaskCandidate
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (RawEvent, Summary, Task, TaskCandidate, ReviewAction, AISuggestion):
+        model.metadata.create_all(engine)
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine: Engine) -> Generator[Session, None, None]:
+    """Provide a real database session backed by the in-memory SQLite engine."""
+    session = sessionmaker(bind=sqlite_engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def sqlite_file(tmp_path: Path) -> Generator[Path, None, None]:
+    """Provide a file-backed SQLite database with every model table created.
+
+    Unlike the in-memory engine, a file can be opened by both the sync
+    driver (for seeding) and aiosqlite (for the async request path).
+    """
+    from app.models.ai_suggestion import AISuggestion
+    from app.models.raw_event import RawEvent
+    from app.models.review_action import ReviewAction
+    from app.models.summary import Summary
+    from app.models.task import Task
+    from app.models.task_candidate import TaskCandidate
+
+    path = tmp_path / "lifeos.db"
+    engine = create_engine(f"sqlite:///{path}")
+    for model in (RawEvent, Summary, Task, TaskCandidate, ReviewAction, AISuggestion):
+        model.metadata.create_all(engine)
+    engine.dispose()
+    yield path
+
+
+@pytest.fixture
+def sqlite_file_session(sqlite_file: Path) -> Generator[Session, None, None]:
+    """Provide a sync session on the file-backed SQLite database."""
+    engine = create_engine(f"sqlite:///{sqlite_file}")
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def async_sqlite_sessionmaker(sqlite_file: Path) -> async_sessionmaker[AsyncSession]:
+    """Provide an aiosqlite session factory on the file-backed SQLite database.
+
+    NullPool opens a fresh connection per session, so sessions can be used
+    from any event loop (pytest's or the TestClient's).
+    """
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_file}", poolclass=NullPool)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
 @pytest.fixture
 def mock_redis() -> Generator[MagicMock, None, None]:
     """Provide a mock Redis client."""
@@ -32,15 +123,52 @@ def mock_redis() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture
-def test_client(mock_db_session: MagicMock) -> Generator[TestClient, None, None]:
+def fake_redis() -> Generator[object, None, None]:
+    """Replace the queue's Redis client with an in-memory fakeredis instance."""
+    import fakeredis
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.core.queue.redis_client", client):
+        yield client
+
+
+@pytest.fixture
+def test_client(
+    mock_db_session: MagicMock, mock_async_db_session: MagicMock
+) -> Generator[TestClient, None, None]:
     """Provide a FastAPI test client with mocked dependencies."""
-    from app.core.db import get_db
+    from app.core.db import get_async_db, get_db
     from app.main import app
 
     def override_get_db() -> Generator[MagicMock, None, None]:
         yield mock_db_session
 
+    async def override_get_async_db() -> AsyncGenerator[MagicMock, None]:
+        yield mock_async_db_session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def async_sqlite_client(
+    async_sqlite_sessionmaker: async_sessionmaker[AsyncSession],
+) -> Generator[TestClient, None, None]:
+    """Provide a FastAPI test client whose async sessions use the SQLite file."""
+    from app.core.db import get_async_db, get_async_sessionmaker
+    from app.main import app
+
+    async def override_get_async_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_sqlite_sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: async_sqlite_sessionmaker
 
     with TestClient(app) as client:
         yield client
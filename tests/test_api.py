@@ -22,7 +22,7 @@ class TestDictationIngestion:
     """Tests for /ingest/dictation endpoint."""
 
     def test_ingest_dictation_success(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Valid dictation should be ingested successfully."""
         with patch("app.ingest_dictation.enqueue_raw_event"):
@@ -33,8 +33,62 @@ class TestDictationIngestion:
 
         assert response.status_code == 200
         assert response.json() == {"ok": True}
-        mock_db_session.add.assert_called_once()
-        mock_db_session.commit.assert_called_once()
+        mock_async_db_session.add.assert_called_once()
+        mock_async_db_session.commit.assert_awaited_once()
+
+    def test_ingest_dictation_persists_and_enqueues(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """The async path should commit the event and enqueue its id on the interactive lane."""
+        from app.models.raw_event import RawEvent
+
+        with patch("app.ingest_dictation.enqueue_raw_event") as enqueue:
+            response = async_sqlite_client.post("/ingest/dictation", json={"text": "Buy milk"})
+
+        assert response.status_code == 200
+        event = sqlite_file_session.query(RawEvent).one()
+        assert event.payload == "Buy milk"
+        enqueue.assert_called_once_with(event.id, "interactive")
+
+    def test_ingest_dictation_idempotency_key(
+        self, test_client: TestClient, mock_async_db_session: MagicMock, fake_redis
+    ) -> None:
+        """A repeated Idempotency-Key should be rejected before the DB and queue."""
+        headers = {"Idempotency-Key": "note-42"}
+        with patch("app.ingest_dictation.enqueue_raw_event") as enqueue:
+            first = test_client.post(
+                "/ingest/dictation", json={"text": "Buy milk"}, headers=headers
+            )
+            second = test_client.post(
+                "/ingest/dictation", json={"text": "Buy milk!"}, headers=headers
+            )
+
+        assert first.json() == {"ok": True}
+        assert second.json() == {"ok": True, "duplicate": True}
+        mock_async_db_session.add.assert_called_once()
+        enqueue.assert_called_once()
+
+    def test_ingest_dictation_duplicate_hits_unique_index(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """Without the Redis claim, the same content should still be stored once."""
+        from app.models.raw_event import RawEvent
+
+        with patch("app.ingest_dictation.enqueue_raw_event"):
+            async_sqlite_client.post("/ingest/dictation", json={"text": "Buy milk"})
+            fake_redis.flushall()
+            response = async_sqlite_client.post("/ingest/dictation", json={"text": "Buy  milk "})
+
+        assert response.status_code == 200
+        event = sqlite_file_session.query(RawEvent).one()
+        assert event.dedup_key.startswith("dictation:sha256:")
+
+    def test_ingest_dictation_long_idempotency_key(self, test_client: TestClient) -> None:
+        """Oversized Idempotency-Key headers should fail validation."""
+        response = test_client.post(
+            "/ingest/dictation", json={"text": "x"}, headers={"Idempotency-Key": "k" * 256}
+        )
+        assert response.status_code == 422
 
     def test_ingest_dictation_missing_text(self, test_client: TestClient) -> None:
         """Missing text field should raise KeyError."""
@@ -42,27 +96,108 @@ class TestDictationIngestion:
             test_client.post("/ingest/dictation", json={})
 
 
+class TestDictationBatchIngestion:
+    """Tests for /ingest/dictation/batch endpoint."""
+
+    def test_batch_inserts_and_enqueues_once(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """Valid items should be stored and enqueued; others get per-item statuses."""
+        import json
+
+        from app.core.queue import lane_key
+        from app.models.raw_event import RawEvent
+
+        items = [{"text": "Buy milk"}, {"text": ""}, {"text": "Buy  milk"}, {"text": "Call mom"}]
+        response = async_sqlite_client.post("/ingest/dictation/batch", json=items)
+
+        data = response.json()
+        assert [i["status"] for i in data["items"]] == [
+            "accepted",
+            "invalid",
+            "duplicate",
+            "accepted",
+        ]
+        assert (data["accepted"], data["duplicate"], data["invalid"]) == (2, 1, 1)
+        assert data["items"][0]["id"] == data["items"][2]["id"]
+
+        stored = {e.id for e in sqlite_file_session.query(RawEvent).all()}
+        assert stored == {data["items"][0]["id"], data["items"][3]["id"]}
+        jobs = fake_redis.lrange(lane_key("dictation"), 0, -1)
+        assert sorted(json.loads(j)["raw_event_id"] for j in jobs) == sorted(stored)
+
+    def test_batch_resubmit_is_duplicate(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """Re-uploading a batch should neither insert nor enqueue anything."""
+        from app.core.queue import lane_key
+        from app.models.raw_event import RawEvent
+
+        items = [{"text": "Buy milk", "idempotency_key": "rec-1"}, {"text": "Call mom"}]
+        async_sqlite_client.post("/ingest/dictation/batch", json=items)
+        fake_redis.delete(lane_key("dictation"))
+
+        data = async_sqlite_client.post("/ingest/dictation/batch", json=items).json()
+
+        assert data["duplicate"] == 2
+        assert sqlite_file_session.query(RawEvent).count() == 2
+        assert fake_redis.llen(lane_key("dictation")) == 0
+
+    def test_batch_backfill_lane(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """?backfill=true should enqueue on the backfill lane."""
+        from app.core.queue import lane_key
+
+        items = [{"text": "Old note 1"}, {"text": "Old note 2"}]
+        async_sqlite_client.post("/ingest/dictation/batch?backfill=true", json=items)
+
+        assert fake_redis.llen(lane_key("backfill")) == 2
+        assert fake_redis.llen(lane_key("dictation")) == 0
+
+    def test_batch_ndjson(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """NDJSON bodies should keep item indexes, marking unparsable lines invalid."""
+        body = b'{"text": "Buy milk"}\nnot json\n\n{"text": "Call mom"}'
+        response = async_sqlite_client.post(
+            "/ingest/dictation/batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert [(i["index"], i["status"]) for i in response.json()["items"]] == [
+            (0, "accepted"),
+            (1, "invalid"),
+            (2, "accepted"),
+        ]
+
+    def test_batch_rejects_bad_bodies(self, test_client: TestClient) -> None:
+        """Non-array bodies are 400 and oversized batches 413."""
+        assert test_client.post("/ingest/dictation/batch", json={"text": "x"}).status_code == 400
+        with patch("app.ingest_dictation.DICTATION_BATCH_MAX_ITEMS", 2):
+            response = test_client.post("/ingest/dictation/batch", json=[{"text": "x"}] * 3)
+        assert response.status_code == 413
+
+
 class TestReviewEndpoints:
     """Tests for /api/review endpoints."""
 
     def test_get_review_queue_empty(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Empty review queue should return empty list."""
-        # Mock query chain
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.return_value = []
-        mock_db_session.query.return_value = mock_query
+        result = MagicMock()
+        result.all.return_value = []
+        mock_async_db_session.execute.return_value = result
 
         response = test_client.get("/api/review")
 
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json() == {"items": [], "next_cursor": None}
 
     def test_get_review_queue_with_candidates(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Review queue should return pending candidates."""
         from datetime import datetime
@@ -74,32 +209,26 @@ class TestReviewEndpoints:
         mock_candidate.description = "Test description"
         mock_candidate.priority = "medium"
         mock_candidate.created_at = datetime(2024, 1, 15, 10, 30, 0)
-        mock_candidate.ai_suggestion_id = None
+        mock_candidate.ai_provider = None
 
-        # Mock query chain
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.return_value = [mock_candidate]
-        mock_db_session.query.return_value = mock_query
+        result = MagicMock()
+        result.all.return_value = [mock_candidate]
+        mock_async_db_session.execute.return_value = result
 
         response = test_client.get("/api/review")
 
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["id"] == "test-id-123"
         assert data[0]["title"] == "Test task"
         assert data[0]["ai_metadata"] is None
 
     def test_approve_candidate_not_found(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Approving non-existent candidate should return error."""
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db_session.query.return_value = mock_query
+        mock_async_db_session.get.return_value = None
 
         response = test_client.post("/api/review/nonexistent-id/approve")
 
@@ -108,7 +237,7 @@ class TestReviewEndpoints:
         assert data["error"] == "Not found"
 
     def test_approve_candidate_success(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Approving valid candidate should create task."""
         # Create mock candidate
@@ -123,17 +252,14 @@ class TestReviewEndpoints:
         mock_task = MagicMock()
         mock_task.id = "task-789"
 
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_candidate
-        mock_db_session.query.return_value = mock_query
+        mock_async_db_session.get.return_value = mock_candidate
 
         # Mock refresh to set task id
         def mock_refresh(obj):
             if hasattr(obj, "id") and obj.id is None:
                 obj.id = "task-789"
 
-        mock_db_session.refresh.side_effect = mock_refresh
+        mock_async_db_session.refresh.side_effect = mock_refresh
 
         response = test_client.post("/api/review/candidate-123/approve")
 
@@ -144,13 +270,10 @@ class TestReviewEndpoints:
         assert mock_candidate.status == "approved"
 
     def test_reject_candidate_not_found(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Rejecting non-existent candidate should return error."""
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db_session.query.return_value = mock_query
+        mock_async_db_session.get.return_value = None
 
         response = test_client.post("/api/review/nonexistent-id/reject")
 
@@ -159,7 +282,7 @@ class TestReviewEndpoints:
         assert data["error"] == "Not found"
 
     def test_reject_candidate_success(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Rejecting valid candidate should update status."""
         mock_candidate = MagicMock()
@@ -167,10 +290,7 @@ class TestReviewEndpoints:
         mock_candidate.raw_event_id = "event-456"
         mock_candidate.status = "pending"
 
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_candidate
-        mock_db_session.query.return_value = mock_query
+        mock_async_db_session.get.return_value = mock_candidate
 
         response = test_client.post("/api/review/candidate-123/reject")
 
@@ -181,15 +301,12 @@ class TestReviewEndpoints:
         assert mock_candidate.status == "rejected"
 
     def test_get_recently_approved(
-        self, test_client: TestClient, mock_db_session: MagicMock
+        self, test_client: TestClient, mock_async_db_session: MagicMock
     ) -> None:
         """Should return recently approved candidates."""
-        mock_query = MagicMock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = []
-        mock_db_session.query.return_value = mock_query
+        result = MagicMock()
+        result.all.return_value = []
+        mock_async_db_session.scalars.return_value = result
 
         response = test_client.get("/api/review/approved")
 
@@ -197,6 +314,293 @@ class TestReviewEndpoints:
         assert response.json() == []
 
 
+class TestReviewQueueQueries:
+    """Query-count regression tests for GET /api/review on a real database."""
+
+    @staticmethod
+    def seed(db, count: int) -> None:
+        from app.models.ai_suggestion import AISuggestion
+        from app.models.task_candidate import TaskCandidate
+
+        for i in range(count):
+            ai_id = None
+            if i % 2 == 0:
+                ai = AISuggestion(
+                    raw_event_id=f"evt-{i}",
+                    provider="openai",
+                    model="gpt-4o-mini",
+                    prompt_version="v1",
+                    input_excerpt="text",
+                    suggestion_json={"title": f"Task {i}", "confidence": 0.75},
+                    rationale="Explicit request",
+                )
+                db.add(ai)
+                db.flush()
+                ai_id = ai.id
+            db.add(
+                TaskCandidate(raw_event_id=f"evt-{i}", title=f"Task {i}", ai_suggestion_id=ai_id)
+            )
+        db.commit()
+
+    @pytest.mark.anyio
+    async def test_single_query_regardless_of_queue_size(
+        self, sqlite_file_session, async_sqlite_sessionmaker
+    ) -> None:
+        """The queue must be loaded with one SELECT, not one per AI candidate."""
+        from sqlalchemy import event
+
+        from app.api_review import get_review_queue
+
+        self.seed(sqlite_file_session, 50)
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany) -> None:
+            statements.append(statement)
+
+        async with async_sqlite_sessionmaker() as db:
+            sync_engine = db.bind.sync_engine
+            event.listen(sync_engine, "before_cursor_execute", count)
+            try:
+                result = (await get_review_queue(db=db, limit=200))["items"]
+            finally:
+                event.remove(sync_engine, "before_cursor_execute", count)
+
+        assert len(result) == 50
+        assert len(statements) == 1
+
+    @pytest.mark.anyio
+    async def test_ai_metadata_comes_from_join(
+        self, sqlite_file_session, async_sqlite_sessionmaker
+    ) -> None:
+        """AI candidates carry metadata and JSONB confidence; manual ones carry None."""
+        from app.api_review import get_review_queue
+
+        self.seed(sqlite_file_session, 4)
+        async with async_sqlite_sessionmaker() as db:
+            result = (await get_review_queue(db=db))["items"]
+
+        by_title = {item["title"]: item for item in result}
+        assert by_title["Task 0"]["ai_metadata"] == {
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "rationale": "Explicit request",
+            "confidence": 0.75,
+        }
+        assert by_title["Task 1"]["ai_metadata"] is None
+
+    @pytest.mark.anyio
+    async def test_missing_confidence_defaults_to_zero(
+        self, sqlite_file_session, async_sqlite_sessionmaker
+    ) -> None:
+        """Suggestions without a confidence key should report 0.0."""
+        from app.api_review import get_review_queue
+        from app.models.ai_suggestion import AISuggestion
+
+        self.seed(sqlite_file_session, 1)
+        ai = sqlite_file_session.query(AISuggestion).one()
+        ai.suggestion_json = {"title": "Task 0"}
+        sqlite_file_session.commit()
+
+        async with async_sqlite_sessionmaker() as db:
+            item = (await get_review_queue(db=db))["items"][0]
+        assert item["ai_metadata"]["confidence"] == 0.0
+
+
+class TestReviewQueuePagination:
+    """Tests for keyset pagination and filters on GET /api/review."""
+
+    @staticmethod
+    def seed(db) -> None:
+        """12 candidates, 3 sharing each timestamp; even ones are AI-generated."""
+        from datetime import datetime, timedelta
+
+        from app.models.ai_suggestion import AISuggestion
+        from app.models.task_candidate import TaskCandidate
+
+        base = datetime(2024, 1, 1)
+        for i in range(12):
+            ai_id = None
+            if i % 2 == 0:
+                ai = AISuggestion(
+                    raw_event_id=f"evt-{i}",
+                    provider="openai" if i % 4 == 0 else "anthropic",
+                    model="m",
+                    prompt_version="v1",
+                    input_excerpt="text",
+                    suggestion_json={"confidence": i / 10},
+                    rationale="r",
+                )
+                db.add(ai)
+                db.flush()
+                ai_id = ai.id
+            db.add(
+                TaskCandidate(
+                    id=f"cand-{i:02d}",
+                    raw_event_id=f"evt-{i}",
+                    title=f"Task {i}",
+                    priority=("low", "medium", "high")[i % 3],
+                    created_at=base + timedelta(minutes=i // 3),
+                    ai_suggestion_id=ai_id,
+                )
+            )
+        db.add(TaskCandidate(raw_event_id="evt-done", title="Done", status="approved"))
+        db.commit()
+
+    @pytest.mark.anyio
+    async def test_pages_cover_queue_without_duplicates(
+        self, sqlite_file_session, async_sqlite_sessionmaker
+    ) -> None:
+        """Following next_cursor should visit every pending row once, newest first."""
+        from app.api_review import get_review_queue
+
+        self.seed(sqlite_file_session)
+        seen: list[str] = []
+        cursor = None
+        async with async_sqlite_sessionmaker() as db:
+            while True:
+                page = await get_review_queue(db=db, limit=5, cursor=cursor)
+                seen.extend(item["id"] for item in page["items"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+
+        assert seen == [f"cand-{i:02d}" for i in range(11, -1, -1)]
+
+    @pytest.mark.anyio
+    async def test_last_page_has_no_cursor(
+        self, sqlite_file_session, async_sqlite_sessionmaker
+    ) -> None:
+        """An exactly full final page should not advertise another page."""
+        from app.api_review import get_review_queue
+
+        self.seed(sqlite_file_session)
+        async with async_sqlite_sessionmaker() as db:
+            assert (await get_review_queue(db=db, limit=12))["next_cursor"] is None
+            assert (await get_review_queue(db=db, limit=11))["next_cursor"] is not None
+
+    @pytest.mark.anyio
+    async def test_filters(self, sqlite_file_session, async_sqlite_sessionmaker) -> None:
+        """Priority, origin, provider and min_confidence should filter in SQL."""
+        from app.api_review import get_review_queue
+
+        self.seed(sqlite_file_session)
+
+        async def ids(**filters) -> set[str]:
+            async with async_sqlite_sessionmaker() as db:
+                return {i["id"] for i in (await get_review_queue(db=db, **filters))["items"]}
+
+        assert await ids(priority="high") == {"cand-02", "cand-05", "cand-08", "cand-11"}
+        assert await ids(origin="manual") == {f"cand-{i:02d}" for i in range(1, 12, 2)}
+        assert await ids(origin="ai") == {f"cand-{i:02d}" for i in range(0, 12, 2)}
+        assert await ids(provider="openai") == {"cand-00", "cand-04", "cand-08"}
+        assert await ids(min_confidence=0.6) == {"cand-06", "cand-08", "cand-10"}
+        assert await ids(provider="anthropic", min_confidence=0.6) == {"cand-06", "cand-10"}
+
+    def test_invalid_cursor_is_400(self, test_client: TestClient) -> None:
+        """Malformed cursors should be rejected, not crash."""
+        response = test_client.get("/api/review?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_limit_is_capped(self, test_client: TestClient) -> None:
+        """Page size above the maximum should fail validation."""
+        response = test_client.get("/api/review?limit=10000")
+        assert response.status_code == 422
+
+
+class TestReviewBulk:
+    """Tests for POST /api/review/bulk."""
+
+    @staticmethod
+    def seed(db) -> None:
+        """Pending c0-c3 (c2 and c3 share evt-2), approved c4, and a task for evt-5 (c5)."""
+        from app.models.task import Task
+        from app.models.task_candidate import TaskCandidate
+
+        for i, raw_event_id in enumerate(["evt-0", "evt-1", "evt-2", "evt-2", "evt-4", "evt-5"]):
+            db.add(
+                TaskCandidate(
+                    id=f"c{i}",
+                    raw_event_id=raw_event_id,
+                    title=f"Candidate {i}",
+                    status="approved" if i == 4 else "pending",
+                )
+            )
+        db.add(Task(id="task-5", title="Existing", raw_event_id="evt-5"))
+        db.commit()
+
+    def test_mixed_batch(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """Each item should get its own outcome in request order."""
+        from app.models.review_action import ReviewAction
+        from app.models.task import Task
+        from app.models.task_candidate import TaskCandidate
+
+        self.seed(sqlite_file_session)
+
+        data = async_sqlite_client.post(
+            "/api/review/bulk",
+            json=[
+                {"id": "c0", "action": "approve"},
+                {"id": "c1", "action": "reject"},
+                {"id": "c4", "action": "reject"},
+                {"id": "nope", "action": "approve"},
+                {"id": "c0", "action": "reject"},
+                {"id": "c2", "action": "archive"},
+            ],
+        ).json()
+
+        items = data["items"]
+        assert [i["status"] for i in items] == [
+            "approved",
+            "rejected",
+            "skipped",
+            "not_found",
+            "invalid",
+            "invalid",
+        ]
+        assert items[2]["error"] == "Candidate is approved"
+        assert (data["approved"], data["rejected"], data["invalid"]) == (1, 1, 2)
+
+        sqlite_file_session.expire_all()
+        task = sqlite_file_session.get(Task, items[0]["task_id"])
+        assert (task.title, task.raw_event_id) == ("Candidate 0", "evt-0")
+        assert sqlite_file_session.get(TaskCandidate, "c1").status == "rejected"
+        audits = sqlite_file_session.query(ReviewAction).order_by(ReviewAction.action).all()
+        assert [(a.candidate_id, a.action) for a in audits] == [
+            ("c0", "approved"),
+            ("c1", "rejected"),
+        ]
+
+    def test_unique_index_does_not_abort_the_batch(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """Approvals for a raw event that has (or gets) a task should be duplicates."""
+        from app.models.task import Task
+        from app.models.task_candidate import TaskCandidate
+
+        self.seed(sqlite_file_session)
+
+        items = async_sqlite_client.post(
+            "/api/review/bulk",
+            json=[{"id": c, "action": "approve"} for c in ("c5", "c2", "c3", "c0")],
+        ).json()["items"]
+
+        assert [i["status"] for i in items] == ["duplicate", "approved", "duplicate", "approved"]
+        sqlite_file_session.expire_all()
+        assert sqlite_file_session.query(Task).filter_by(raw_event_id="evt-2").count() == 1
+        assert sqlite_file_session.get(TaskCandidate, "c3").status == "pending"
+        assert sqlite_file_session.get(TaskCandidate, "c5").status == "pending"
+
+    def test_batch_size_is_capped(self, async_sqlite_client: TestClient) -> None:
+        """Oversized batches should be rejected before touching the database."""
+        with patch("app.api_review.REVIEW_BULK_MAX_ITEMS", 2):
+            response = async_sqlite_client.post(
+                "/api/review/bulk", json=[{"id": f"c{i}", "action": "reject"} for i in range(3)]
+            )
+        assert response.status_code == 413
+
+
 class TestSlackIngestion:
     """Tests for /ingest/slack/events endpoint."""
 
@@ -209,3 +613,365 @@ class TestSlackIngestion:
 
         assert response.status_code == 200
         assert response.json() == {"challenge": "test-challenge-123"}
+
+    def test_slack_buffered_mode_acks_and_dedups(
+        self, test_client: TestClient, mock_async_db_session: MagicMock, fake_redis
+    ) -> None:
+        """Buffered mode should push to the ingest stream once per event_id, no DB write."""
+        from app.core.queue import INGEST_STREAM
+
+        event = {"type": "event_callback", "event_id": "Ev123", "event": {"text": "hi"}}
+        with patch("app.ingest_slack.SLACK_INGEST_MODE", "buffered"):
+            first = test_client.post("/ingest/slack/events", json=event)
+            retry = test_client.post(
+                "/ingest/slack/events", json=event, headers={"X-Slack-Retry-Num": "1"}
+            )
+
+        assert first.json() == {"ok": True} and retry.json() == {"ok": True}
+        assert fake_redis.xlen(INGEST_STREAM) == 1
+        mock_async_db_session.add.assert_not_called()
+
+    def test_slack_buffered_mode_redis_down(self, test_client: TestClient) -> None:
+        """If the buffer is unavailable the request must not be acked."""
+        import redis
+
+        with (
+            patch("app.ingest_slack.SLACK_INGEST_MODE", "buffered"),
+            patch("app.ingest_slack.buffer_ingest", side_effect=redis.ConnectionError),
+        ):
+            response = test_client.post("/ingest/slack/events", json={"event_id": "Ev1"})
+
+        assert response.status_code == 503
+
+    def test_slack_inline_retry_is_dropped(
+        self, test_client: TestClient, mock_async_db_session: MagicMock, fake_redis
+    ) -> None:
+        """A retried event_id should be answered from the fast path alone."""
+        event = {"type": "event_callback", "event_id": "Ev123", "event": {"text": "hi"}}
+        with (
+            patch.dict("app.core.routing.SOURCE_ROUTES", {"slack": "process"}),
+            patch("app.ingest_slack.enqueue_raw_event") as enqueue,
+        ):
+            for headers in ({}, {"X-Slack-Retry-Num": "1"}):
+                response = test_client.post("/ingest/slack/events", json=event, headers=headers)
+                assert response.json() == {"ok": True}
+
+        mock_async_db_session.add.assert_called_once()
+        enqueue.assert_called_once()
+
+    def test_slack_inline_retry_is_not_duplicated(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """Past the fast path (Redis down), a retry should hit the unique index."""
+        from app.models.raw_event import RawEvent, raw_event_id_for
+
+        event = {"type": "event_callback", "event_id": "Ev123", "event": {"text": "hi"}}
+        with (
+            patch.dict("app.core.routing.SOURCE_ROUTES", {"slack": "process"}),
+            patch("app.ingest_slack.enqueue_raw_event") as enqueue,
+        ):
+            for headers in ({}, {"X-Slack-Retry-Num": "1"}):
+                response = async_sqlite_client.post(
+                    "/ingest/slack/events", json=event, headers=headers
+                )
+                assert response.json() == {"ok": True}
+
+        rows = sqlite_file_session.query(RawEvent).all()
+        assert [r.id for r in rows] == [raw_event_id_for("slack:Ev123")]
+        assert enqueue.call_count == 2
+
+    def test_slack_store_route_skips_the_worker(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """With the default routes, Slack events are stored processed and never enqueued."""
+        from app.models.raw_event import RawEvent
+
+        event = {"type": "event_callback", "event_id": "Ev123", "event": {"text": "hi"}}
+        with patch("app.ingest_slack.enqueue_raw_event") as enqueue:
+            response = async_sqlite_client.post("/ingest/slack/events", json=event)
+
+        assert response.json() == {"ok": True}
+        assert sqlite_file_session.query(RawEvent).one().processed is True
+        enqueue.assert_not_called()
+
+
+class TestTasksApi:
+    """Tests for /api/tasks listing, creation and lifecycle transitions."""
+
+    @staticmethod
+    def seed(db) -> None:
+        """12 tasks, 3 sharing each timestamp; every third is completed."""
+        from datetime import datetime, timedelta
+
+        from app.models.raw_event import RawEvent
+        from app.models.task import Task
+
+        base = datetime(2024, 1, 1)
+        db.add(RawEvent(id="evt-0", source="dictation", payload="x"))
+        for i in range(12):
+            db.add(
+                Task(
+                    id=f"task-{i:02d}",
+                    title=f"Task {i}",
+                    priority=("low", "medium", "high")[i % 3],
+                    status="completed" if i % 3 == 0 else "active",
+                    created_at=base + timedelta(minutes=i // 3),
+                    raw_event_id=f"evt-{i}",
+                )
+            )
+        db.commit()
+
+    def test_pages_cover_all_statuses(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """Following next_cursor should visit every task once, by status then newest first."""
+        self.seed(sqlite_file_session)
+        seen: list[str] = []
+        url = "/api/tasks?limit=5"
+        while url:
+            page = async_sqlite_client.get(url).json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            url = f"/api/tasks?limit=5&cursor={cursor}" if cursor else ""
+
+        active = [f"task-{i:02d}" for i in range(11, -1, -1) if i % 3]
+        completed = [f"task-{i:02d}" for i in range(11, -1, -1) if i % 3 == 0]
+        assert seen == active + completed
+
+    def test_filters(self, async_sqlite_client: TestClient, sqlite_file_session) -> None:
+        """Status and priority should filter; source comes from the raw event."""
+        self.seed(sqlite_file_session)
+
+        items = async_sqlite_client.get("/api/tasks?status=active&priority=high").json()["items"]
+
+        assert [i["id"] for i in items] == ["task-11", "task-08", "task-05", "task-02"]
+        completed = async_sqlite_client.get("/api/tasks?status=completed").json()["items"]
+        assert completed[-1]["source"] == "dictation"
+        assert completed[0]["source"] == "manual"
+        assert async_sqlite_client.get("/api/tasks?status=done").status_code == 422
+
+    def test_create_task(self, async_sqlite_client: TestClient) -> None:
+        """A manual task should be created active and show up in the list."""
+        created = async_sqlite_client.post(
+            "/api/tasks", json={"title": " Buy milk ", "priority": "high"}
+        ).json()
+
+        assert (created["title"], created["status"], created["source"]) == (
+            "Buy milk",
+            "active",
+            "manual",
+        )
+        items = async_sqlite_client.get("/api/tasks?status=active").json()["items"]
+        assert [i["id"] for i in items] == [created["id"]]
+        assert async_sqlite_client.post("/api/tasks", json={"title": ""}).status_code == 400
+        bad = async_sqlite_client.post("/api/tasks", json={"title": "x", "priority": "urgent"})
+        assert bad.status_code == 400
+
+    def test_complete_and_reactivate(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """Transitions should apply once and report invalid or unknown tasks."""
+        self.seed(sqlite_file_session)
+
+        done = async_sqlite_client.post("/api/tasks/task-01/complete").json()
+        assert done["status"] == "completed"
+        assert done["task"]["completed_at"] is not None
+
+        again = async_sqlite_client.post("/api/tasks/task-01/complete").json()
+        assert again == {"error": "Invalid transition", "message": "Task is completed"}
+
+        back = async_sqlite_client.post("/api/tasks/task-01/reactivate").json()
+        assert (back["task"]["status"], back["task"]["completed_at"]) == ("active", None)
+
+        missing = async_sqlite_client.post("/api/tasks/nope/complete").json()
+        assert missing["error"] == "Not found"
+
+    def test_transition_reports_raw_event_source(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """A transitioned task should carry the same source the list shows."""
+        self.seed(sqlite_file_session)
+
+        done = async_sqlite_client.post("/api/tasks/task-00/reactivate").json()
+        listed = async_sqlite_client.get("/api/tasks?status=active").json()["items"]
+
+        assert done["task"]["source"] == "dictation"
+        assert next(i for i in listed if i["id"] == "task-00")["source"] == "dictation"
+        manual = async_sqlite_client.post("/api/tasks/task-01/complete").json()
+        assert manual["task"]["source"] == "manual"
+
+
+class TestInboxApi:
+    """Tests for /api/inbox paging, filters, projections and manual entries."""
+
+    @staticmethod
+    def seed(db) -> None:
+        """10 events, 2 sharing each timestamp; odd ones are processed Slack events."""
+        from datetime import datetime, timedelta
+
+        from app.models.raw_event import RawEvent
+
+        base = datetime(2024, 1, 1)
+        for i in range(10):
+            db.add(
+                RawEvent(
+                    id=f"evt-{i:02d}",
+                    source="slack" if i % 2 else "dictation",
+                    payload=f"note {i}",
+                    processed=bool(i % 2),
+                    received_at=base + timedelta(minutes=i // 2),
+                )
+            )
+        db.commit()
+
+    def test_pages_cover_inbox(self, async_sqlite_client: TestClient, sqlite_file_session) -> None:
+        """Following next_cursor should visit every event once, newest first."""
+        self.seed(sqlite_file_session)
+        seen: list[str] = []
+        url = "/api/inbox?limit=3"
+        while url:
+            page = async_sqlite_client.get(url).json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            url = f"/api/inbox?limit=3&cursor={cursor}" if cursor else ""
+
+        assert seen == [f"evt-{i:02d}" for i in range(9, -1, -1)]
+
+    def test_filters(self, async_sqlite_client: TestClient, sqlite_file_session) -> None:
+        """Source and processed should filter."""
+        self.seed(sqlite_file_session)
+
+        def ids(query: str) -> list[str]:
+            return [i["id"] for i in async_sqlite_client.get(f"/api/inbox?{query}").json()["items"]]
+
+        assert ids("processed=false") == ["evt-08", "evt-06", "evt-04", "evt-02", "evt-00"]
+        assert ids("processed=true&source=slack") == [
+            "evt-09",
+            "evt-07",
+            "evt-05",
+            "evt-03",
+            "evt-01",
+        ]
+        assert ids("processed=true&source=dictation") == []
+
+    def test_payload_is_truncated(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """Long payloads should come back as a preview, flagged as truncated."""
+        from app.api_inbox import INBOX_PREVIEW_CHARS
+        from app.models.raw_event import RawEvent
+
+        sqlite_file_session.add(RawEvent(source="dictation", payload="x" * 100_000))
+        sqlite_file_session.add(RawEvent(source="dictation", payload="x" * INBOX_PREVIEW_CHARS))
+        sqlite_file_session.commit()
+
+        items = async_sqlite_client.get("/api/inbox").json()["items"]
+
+        assert sorted((len(i["payload"]), i["payload_truncated"]) for i in items) == [
+            (INBOX_PREVIEW_CHARS, False),
+            (INBOX_PREVIEW_CHARS, True),
+        ]
+
+    def test_add_event_is_routed(
+        self, async_sqlite_client: TestClient, sqlite_file_session
+    ) -> None:
+        """Manual notes are stored processed; dictation is enqueued for the worker."""
+        from app.models.raw_event import RawEvent
+
+        with patch("app.api_inbox.enqueue_raw_event") as enqueue:
+            manual = async_sqlite_client.post("/api/inbox", json={"payload": "Call mom"}).json()
+            dictated = async_sqlite_client.post(
+                "/api/inbox", json={"payload": "Buy milk", "source": "dictation"}
+            ).json()
+
+        assert (manual["source"], manual["processed"]) == ("manual", True)
+        assert dictated["processed"] is False
+        enqueue.assert_called_once_with(dictated["id"], "interactive")
+        assert sqlite_file_session.query(RawEvent).count() == 2
+        assert async_sqlite_client.post("/api/inbox", json={"payload": " "}).status_code == 400
+        bad = async_sqlite_client.post("/api/inbox", json={"payload": "x", "source": "email"})
+        assert bad.status_code == 400
+
+
+class TestDashboard:
+    """Tests for GET /api/dashboard."""
+
+    def test_gathers_every_view(
+        self, async_sqlite_client: TestClient, sqlite_file_session, fake_redis
+    ) -> None:
+        """One response should carry bounded pages of all four panels."""
+        from app.models.raw_event import RawEvent
+        from app.models.task import Task
+        from app.models.task_candidate import TaskCandidate
+
+        for i in range(30):
+            sqlite_file_session.add(RawEvent(source="dictation", payload=f"note {i}"))
+        sqlite_file_session.add(TaskCandidate(raw_event_id="evt-1", title="Pending"))
+        sqlite_file_session.add(TaskCandidate(raw_event_id="evt-2", title="Ok", status="approved"))
+        sqlite_file_session.add(Task(title="Active"))
+        sqlite_file_session.add(Task(title="Done", status="completed"))
+        sqlite_file_session.commit()
+
+        with patch("app.api_dashboard.DASHBOARD_PAGE_SIZE", 25):
+            data = async_sqlite_client.get("/api/dashboard").json()
+
+        assert len(data["inbox"]["items"]) == 25
+        assert data["inbox"]["next_cursor"] is not None
+        assert [c["title"] for c in data["review"]["items"]] == ["Pending"]
+        assert [c["title"] for c in data["approved"]] == ["Ok"]
+        assert [t["title"] for t in data["tasks"]["items"]] == ["Active"]
+
+    def test_unchanged_dashboard_is_304_without_the_database(
+        self, async_sqlite_client: TestClient, fake_redis
+    ) -> None:
+        """A matching If-None-Match should be answered from Redis alone."""
+        from app.core.db import get_async_sessionmaker
+        from app.main import app
+
+        first = async_sqlite_client.get("/api/dashboard")
+        etag = first.headers["ETag"]
+
+        sessionmaker = MagicMock()
+        app.dependency_overrides[get_async_sessionmaker] = lambda: sessionmaker
+        cached = async_sqlite_client.get("/api/dashboard", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        sessionmaker.assert_not_called()
+
+    def test_writes_change_the_etag(self, async_sqlite_client: TestClient, fake_redis) -> None:
+        """A write the dashboard shows should invalidate cached copies."""
+        etag = async_sqlite_client.get("/api/dashboard").headers["ETag"]
+
+        async_sqlite_client.post("/api/tasks", json={"title": "Buy milk"})
+        response = async_sqlite_client.get("/api/dashboard", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert [t["title"] for t in response.json()["tasks"]["items"]] == ["Buy milk"]
+
+    def test_lost_counter_does_not_reissue_etags(
+        self, async_sqlite_client: TestClient, fake_redis
+    ) -> None:
+        """After Redis loses the counter, earlier ETags should no longer match."""
+        async_sqlite_client.post("/api/tasks", json={"title": "Buy milk"})
+        etag = async_sqlite_client.get("/api/dashboard").headers["ETag"]
+
+        fake_redis.flushall()
+        async_sqlite_client.post("/api/tasks", json={"title": "Call mum"})
+        response = async_sqlite_client.get("/api/dashboard", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_served_without_etag_when_redis_is_down(
+        self, async_sqlite_client: TestClient, fake_redis
+    ) -> None:
+        """If the version cannot be read the dashboard is still served, uncached."""
+        import redis
+
+        with patch.object(fake_redis, "pipeline", side_effect=redis.ConnectionError):
+            response = async_sqlite_client.get("/api/dashboard", headers={"If-None-Match": "*"})
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
@@ -0,0 +1,196 @@
+"""
+Unit tests for archive parsing and bulk upserts used by /api/import.
+"""
+
+import io
+import json
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import ForeignKey, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.core.archive import (
+    ArchiveConflictError,
+    ArchiveError,
+    archive_format,
+    bulk_import,
+    iter_archive_records,
+    upsert_rows,
+)
+
+DOCUMENT = {
+    "raw_events": [
+        {"id": "r1", "source": "manual", "payload": "p1"},
+        {"id": "r2", "source": "slack", "payload": "p2"},
+    ],
+    "ai_suggestions": [{"id": "a1", "suggestion_json": {"confidence": 0.5, "tags": ["x"]}}],
+    "tasks": [],
+    "exported_at": "2025-01-01T00:00:00",
+}
+
+EXPECTED = [
+    ("raw_events", {"id": "r1", "source": "manual", "payload": "p1"}),
+    ("raw_events", {"id": "r2", "source": "slack", "payload": "p2"}),
+    ("ai_suggestions", {"id": "a1", "suggestion_json": {"confidence": 0.5, "tags": ["x"]}}),
+]
+
+
+def ndjson_bytes() -> bytes:
+    lines = [{"exported_at": "2025-01-01T00:00:00", "tables": ["raw_events"]}]
+    lines += [{"table": t, "record": r} for t, r in EXPECTED]
+    return ("\n".join(json.dumps(line) for line in lines) + "\n").encode()
+
+
+class TestArchiveFormat:
+    """Tests for archive_format."""
+
+    def test_detects_formats(self) -> None:
+        """Content type or file suffix should select the parser."""
+        assert archive_format("a.json", "application/json") == "json"
+        assert archive_format("a.ndjson", "application/x-ndjson") == "ndjson"
+        assert archive_format("a.ndjson", "application/octet-stream") == "ndjson"
+        assert archive_format("a.txt", "text/plain") is None
+
+
+class TestIterArchiveRecords:
+    """Tests for incremental archive parsing."""
+
+    def test_ndjson_skips_header(self) -> None:
+        """NDJSON records should be yielded in order without the header."""
+        records = list(iter_archive_records(io.BytesIO(ndjson_bytes()), "ndjson"))
+        assert records == EXPECTED
+
+    def test_ndjson_invalid_line(self) -> None:
+        """A corrupt line should raise ArchiveError with its line number."""
+        data = ndjson_bytes() + b"{not json\n"
+        with pytest.raises(ArchiveError, match="line 5"):
+            list(iter_archive_records(io.BytesIO(data), "ndjson"))
+
+    def test_json_document_streamed(self) -> None:
+        """JSON documents should yield array items, including nested objects."""
+        pytest.importorskip("ijson")
+        data = json.dumps(DOCUMENT).encode()
+        assert list(iter_archive_records(io.BytesIO(data), "json")) == EXPECTED
+
+    def test_json_document_without_ijson(self) -> None:
+        """Without ijson the document should still import via json.load."""
+        data = json.dumps(DOCUMENT).encode()
+        with patch.dict(sys.modules, {"ijson": None}):
+            assert list(iter_archive_records(io.BytesIO(data), "json")) == EXPECTED
+
+    def test_json_document_invalid(self) -> None:
+        """Malformed JSON should raise ArchiveError with either parser."""
+        with pytest.raises(ArchiveError):
+            list(iter_archive_records(io.BytesIO(b'{"raw_events": [{"id": '), "json"))
+        with patch.dict(sys.modules, {"ijson": None}), pytest.raises(ArchiveError):
+            list(iter_archive_records(io.BytesIO(b'{"raw_events": [{"id": '), "json"))
+
+
+class TestUpsert:
+    """Tests for upsert_rows and bulk_import on SQLite."""
+
+    def test_upsert_inserts_then_updates(self, sqlite_session) -> None:
+        """Existing ids should be updated in place, new ids inserted."""
+        from app.models.raw_event import RawEvent
+
+        upsert_rows(sqlite_session, RawEvent, [{"id": "r1", "source": "a", "payload": "old"}])
+        upsert_rows(
+            sqlite_session,
+            RawEvent,
+            [
+                {"id": "r1", "source": "a", "payload": "new"},
+                {"id": "r2", "source": "b", "payload": "p"},
+            ],
+        )
+        sqlite_session.commit()
+
+        rows = {r.id: r.payload for r in sqlite_session.query(RawEvent).all()}
+        assert rows == {"r1": "new", "r2": "p"}
+
+    def test_bulk_import_commits_in_chunks(self, sqlite_session) -> None:
+        """Each chunk should be committed and reported, and reruns are idempotent."""
+        from app.models.raw_event import RawEvent
+
+        tables = {
+            "raw_events": (
+                RawEvent,
+                lambda r: {"id": r["id"], "source": "manual", "payload": r["payload"]},
+            )
+        }
+        records = [("raw_events", {"id": f"r{i}", "payload": "p"}) for i in range(5)]
+        records.append(("unknown", {"id": "x"}))
+        progress = MagicMock()
+
+        counts = bulk_import(sqlite_session, records, tables, chunk_size=2, on_progress=progress)
+
+        assert counts == {"raw_events": 5}
+        assert [c.args[0]["raw_events"] for c in progress.call_args_list] == [2, 4, 5]
+        bulk_import(sqlite_session, records, tables, chunk_size=2)
+        assert sqlite_session.query(RawEvent).count() == 5
+
+    def test_bulk_import_dedupes_ids_within_a_chunk(self, sqlite_session) -> None:
+        """A repeated id should be written once per chunk, with its last value."""
+        from app.models.raw_event import RawEvent
+
+        tables = {"raw_events": (RawEvent, lambda r: {"source": "manual", **r})}
+        records = [
+            ("raw_events", {"id": "r1", "payload": "old"}),
+            ("raw_events", {"id": "r1", "payload": "new"}),
+            ("raw_events", {"id": "r2", "payload": "p"}),
+        ]
+
+        with patch("app.core.archive.upsert_rows", wraps=upsert_rows) as upsert:
+            counts = bulk_import(sqlite_session, records, tables, chunk_size=2)
+
+        batches = [[row["id"] for row in c.args[2]] for c in upsert.call_args_list]
+        assert batches == [["r1", "r2"]]
+        assert counts == {"raw_events": 2}
+        assert sqlite_session.get(RawEvent, "r1").payload == "new"
+
+    def test_bulk_import_conflict_keeps_earlier_chunks(self, sqlite_session) -> None:
+        """A constraint violation should roll back its chunk and raise ArchiveConflictError."""
+        from app.models.raw_event import RawEvent
+
+        tables = {"raw_events": (RawEvent, lambda r: r)}
+        records = [
+            ("raw_events", {"id": "r1", "source": "manual", "payload": "p"}),
+            ("raw_events", {"id": "r2", "source": None, "payload": "p"}),
+        ]
+        progress = MagicMock()
+
+        with pytest.raises(ArchiveConflictError, match="raw_events"):
+            bulk_import(sqlite_session, records, tables, chunk_size=1, on_progress=progress)
+
+        progress.assert_called_once_with({"raw_events": 1})
+        assert [r.id for r in sqlite_session.query(RawEvent).all()] == ["r1"]
+
+    def test_bulk_import_flushes_parents_before_children(self) -> None:
+        """A full child chunk should not be written ahead of its buffered parents."""
+
+        class Base(DeclarativeBase):
+            pass
+
+        class Parent(Base):
+            __tablename__ = "parents"
+            id: Mapped[str] = mapped_column(primary_key=True)
+
+        class Child(Base):
+            __tablename__ = "children"
+            id: Mapped[str] = mapped_column(primary_key=True)
+            parent_id: Mapped[str] = mapped_column(ForeignKey("parents.id"))
+
+        engine = create_engine("sqlite://")
+        event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+        Base.metadata.create_all(engine)
+        tables = {"parents": (Parent, dict), "children": (Child, dict)}
+        records = [("parents", {"id": f"p{i}"}) for i in range(15)]
+        records += [("children", {"id": f"c{i}", "parent_id": "p13"}) for i in range(10)]
+
+        with Session(engine) as db:
+            counts = bulk_import(db, records, tables, chunk_size=10)
+            assert db.query(Child).count() == 10
+
+        assert counts == {"parents": 15, "children": 10}
+        engine.dispose()
@@ -0,0 +1,200 @@
+"""
+Tests for the asyncio AI suggesters against a local fake HTTP server.
+
+Requires the optional AI dependencies (pip install -e ".[ai]").
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+SUGGESTION = {
+    "title": "Call the plumber",
+    "description": "Kitchen sink is leaking",
+    "priority": "high",
+    "confidence": 0.9,
+    "rationale": "Explicit request to call someone",
+}
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    """Serves canned OpenAI Chat Completions and Anthropic Messages responses."""
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        server = self.server
+
+        time.sleep(server.delay)  # type: ignore[attr-defined]
+        if server.status != 200:  # type: ignore[attr-defined]
+            body = {"error": {"type": "invalid_request_error", "message": "bad request"}}
+            return self._reply(server.status, body)  # type: ignore[attr-defined]
+
+        content = server.content  # type: ignore[attr-defined]
+        if self.path.endswith("/chat/completions"):
+            body = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        else:
+            body = {
+                "id": "msg_1",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-3-5-sonnet-20241022",
+                "content": [{"type": "text", "text": content}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1},
+            }
+        self._reply(200, body)
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_server() -> Generator[ThreadingHTTPServer, None, None]:
+    """Run a fake provider API and point both SDKs at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeProviderHandler)
+    server.delay = 0.0  # type: ignore[attr-defined]
+    server.status = 200  # type: ignore[attr-defined]
+    server.content = json.dumps(SUGGESTION)  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    base = f"http://127.0.0.1:{server.server_port}"
+    env = {
+        "OPENAI_API_KEY": "sk-test",
+        "OPENAI_BASE_URL": f"{base}/v1",
+        "ANTHROPIC_API_KEY": "sk-ant-test",
+        "ANTHROPIC_BASE_URL": base,
+    }
+    with patch.dict(os.environ, env):
+        yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncOpenAISuggester:
+    """Tests for AsyncOpenAISuggester."""
+
+    def test_returns_validated_suggestion(self, fake_server) -> None:
+        """A well-formed response should pass validate_suggestion."""
+        from app.ai.providers.openai_suggester import AsyncOpenAISuggester
+
+        suggestion = asyncio.run(AsyncOpenAISuggester().suggest("the sink is leaking"))
+
+        assert suggestion is not None
+        assert suggestion.title == "Call the plumber"
+        assert suggestion.priority == "high"
+
+    def test_malformed_output_returns_none(self, fake_server) -> None:
+        """Non-JSON content should be discarded, not raised."""
+        from app.ai.providers.openai_suggester import AsyncOpenAISuggester
+
+        fake_server.content = "not json"
+        assert asyncio.run(AsyncOpenAISuggester().suggest("text")) is None
+
+    def test_client_keeps_timeout_and_retry_limits(self, fake_server) -> None:
+        """The async client must enforce the same limits as the sync one."""
+        from app.ai.providers.openai_suggester import AsyncOpenAISuggester
+
+        client = AsyncOpenAISuggester().client
+        assert client.timeout == 10.0
+        assert client.max_retries == 2
+
+    def test_many_calls_run_concurrently(self, fake_server) -> None:
+        """Gathered calls should overlap instead of running back to back."""
+        from app.ai.providers.openai_suggester import AsyncOpenAISuggester
+
+        fake_server.delay = 0.2
+        suggester = AsyncOpenAISuggester()
+
+        async def run_all():
+            return await asyncio.gather(*(suggester.suggest(f"task {i}") for i in range(10)))
+
+        start = time.perf_counter()
+        results = asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+
+        assert all(r is not None for r in results)
+        # Serial execution would take at least 10 * 0.2 s
+        assert elapsed < 10 * 0.2 * 0.75
+
+
+class TestAsyncClaudeSuggester:
+    """Tests for AsyncClaudeSuggester."""
+
+    def test_returns_validated_suggestion(self, fake_server) -> None:
+        """A well-formed response should pass validate_suggestion."""
+        from app.ai.providers.claude_suggester import AsyncClaudeSuggester
+
+        suggestion = asyncio.run(AsyncClaudeSuggester().suggest("the sink is leaking"))
+
+        assert suggestion is not None
+        assert suggestion.confidence == 0.9
+
+    def test_api_error_returns_none(self, fake_server) -> None:
+        """A provider error should be logged and swallowed."""
+        from app.ai.providers.claude_suggester import AsyncClaudeSuggester
+
+        fake_server.status = 400
+        assert asyncio.run(AsyncClaudeSuggester().suggest("text")) is None
+
+    def test_invalid_suggestion_returns_none(self, fake_server) -> None:
+        """Output violating the contract should be discarded."""
+        from app.ai.providers.claude_suggester import AsyncClaudeSuggester
+
+        fake_server.content = json.dumps(dict(SUGGESTION, priority="urgent"))
+        assert asyncio.run(AsyncClaudeSuggester().suggest("text")) is None
+
+
+class TestGetAsyncSuggester:
+    """Tests for the async factory entry point."""
+
+    def test_selects_async_provider(self, fake_server) -> None:
+        """AI_PROVIDER should select the matching async implementation."""
+        from app.ai.factory import get_async_suggester
+        from app.ai.providers.claude_suggester import AsyncClaudeSuggester
+        from app.ai.providers.openai_suggester import AsyncOpenAISuggester
+
+        with patch.dict(os.environ, {"AI_PROVIDER": "openai"}):
+            assert isinstance(get_async_suggester(), AsyncOpenAISuggester)
+        with patch.dict(os.environ, {"AI_PROVIDER": "anthropic"}):
+            assert isinstance(get_async_suggester(), AsyncClaudeSuggester)
+
+    def test_returns_none_when_disabled(self) -> None:
+        """AI_PROVIDER=none should disable the async path too."""
+        from app.ai.factory import get_async_suggester
+
+        with patch.dict(os.environ, {"AI_PROVIDER": "none"}):
+            assert get_async_suggester() is None
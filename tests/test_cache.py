@@ -0,0 +1,235 @@
+"""
+Tests for the content-addressed AI suggestion cache.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.orm import sessionmaker
+
+from app.ai.cache import (
+    CachedSuggester,
+    DatabaseCacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    cache_key,
+    wrap_with_cache,
+)
+from app.ai.contract import AISuggestion, suggestion_to_dict
+
+SUGGESTION = AISuggestion(
+    title="Call the plumber",
+    description="Kitchen sink is leaking",
+    priority="high",
+    confidence=0.9,
+    rationale="Explicit request to call someone",
+)
+
+
+def make_inner() -> MagicMock:
+    inner = MagicMock()
+    inner.provider_name = "openai"
+    inner.model_name = "gpt-4o-mini"
+    inner.suggest.return_value = SUGGESTION
+    return inner
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_same_input_same_key(self) -> None:
+        """Identical requests should share a content address."""
+        assert cache_key("text", "openai", "gpt-4o-mini") == cache_key(
+            "text", "openai", "gpt-4o-mini"
+        )
+
+    def test_key_covers_prompt_provider_and_model(self) -> None:
+        """Changing any request dimension should change the key."""
+        base = cache_key("text", "openai", "gpt-4o-mini", "v1")
+        assert cache_key("text", "openai", "gpt-4o-mini", "v2") != base
+        assert cache_key("text", "anthropic", "gpt-4o-mini", "v1") != base
+        assert cache_key("text", "openai", "gpt-4o", "v1") != base
+        assert cache_key("other", "openai", "gpt-4o-mini", "v1") != base
+
+
+class TestMemoryCacheBackend:
+    """Tests for the in-process LRU backend."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Capacity overflow should drop the oldest untouched entry."""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", {"v": 1})
+        backend.set("b", {"v": 2})
+        backend.get("a")
+        backend.set("c", {"v": 3})
+
+        assert backend.get("a") == {"v": 1}
+        assert backend.get("b") is None
+        assert backend.get("c") == {"v": 3}
+
+    def test_expired_entries_are_misses(self) -> None:
+        """Entries older than the TTL should not be served."""
+        backend = MemoryCacheBackend(ttl=10)
+        with patch("app.ai.cache.time.monotonic", return_value=100.0):
+            backend.set("a", {"v": 1})
+        with patch("app.ai.cache.time.monotonic", return_value=111.0):
+            assert backend.get("a") is None
+
+
+class TestRedisCacheBackend:
+    """Tests for the Redis backend."""
+
+    def test_round_trip_with_ttl(self, fake_redis) -> None:
+        """Stored values should be readable and expire via SET EX."""
+        backend = RedisCacheBackend(ttl=60)
+        backend.set("abc", {"v": 1})
+
+        assert backend.get("abc") == {"v": 1}
+        assert 0 < fake_redis.ttl("lifeos:ai_cache:abc") <= 60
+        assert backend.get("missing") is None
+
+
+class TestCachedSuggester:
+    """Tests for the CachedSuggester wrapper."""
+
+    def test_second_call_is_served_from_cache(self) -> None:
+        """Identical text should hit the provider only once."""
+        inner = make_inner()
+        cached = CachedSuggester(inner, MemoryCacheBackend())
+
+        assert cached.suggest("call the plumber") == SUGGESTION
+        assert cached.suggest("call the plumber") == SUGGESTION
+
+        inner.suggest.assert_called_once()
+        assert cached.stats.hits == 1
+        assert cached.stats.misses == 1
+
+    def test_failed_suggestions_are_not_cached(self) -> None:
+        """A None result should be retried next time."""
+        inner = make_inner()
+        inner.suggest.return_value = None
+        cached = CachedSuggester(inner, MemoryCacheBackend())
+
+        cached.suggest("text")
+        cached.suggest("text")
+
+        assert inner.suggest.call_count == 2
+        assert cached.stats.hits == 0
+
+    def test_bypass_always_calls_provider(self) -> None:
+        """Bypass mode should neither read nor write the cache."""
+        inner = make_inner()
+        backend = MagicMock()
+        cached = CachedSuggester(inner, backend, bypass=True)
+
+        cached.suggest("text")
+        cached.suggest("text")
+
+        assert inner.suggest.call_count == 2
+        assert cached.stats.bypassed == 2
+        backend.get.assert_not_called()
+        backend.set.assert_not_called()
+
+    def test_backend_errors_fall_through_to_provider(self) -> None:
+        """A broken cache must not break suggestion."""
+        inner = make_inner()
+        backend = MagicMock()
+        backend.get.side_effect = ConnectionError("redis down")
+        backend.set.side_effect = ConnectionError("redis down")
+        cached = CachedSuggester(inner, backend)
+
+        assert cached.suggest("text") == SUGGESTION
+        assert cached.stats.errors == 2
+        assert cached.stats.misses == 1
+
+    def test_invalid_cached_data_is_a_miss(self) -> None:
+        """Cached data failing the contract should be ignored."""
+        inner = make_inner()
+        backend = MemoryCacheBackend()
+        key = cache_key("text", "openai", "gpt-4o-mini")
+        backend.set(key, {"title": "x", "priority": "urgent"})
+        cached = CachedSuggester(inner, backend)
+
+        assert cached.suggest("text") == SUGGESTION
+        inner.suggest.assert_called_once()
+
+
+class TestWrapWithCache:
+    """Tests for environment-driven cache selection."""
+
+    def test_memory_is_default(self) -> None:
+        """Without configuration the memory backend should be used."""
+        env = {k: v for k, v in os.environ.items() if not k.startswith("AI_CACHE_")}
+        with patch.dict(os.environ, env, clear=True):
+            wrapped = wrap_with_cache(make_inner())
+        assert isinstance(wrapped, CachedSuggester)
+        assert isinstance(wrapped.backend, MemoryCacheBackend)
+
+    def test_none_returns_suggester_unchanged(self) -> None:
+        """AI_CACHE_BACKEND=none should disable caching."""
+        inner = make_inner()
+        with patch.dict(os.environ, {"AI_CACHE_BACKEND": "none"}):
+            assert wrap_with_cache(inner) is inner
+
+    def test_bypass_flag(self) -> None:
+        """AI_CACHE_BYPASS should be passed through to the wrapper."""
+        with patch.dict(os.environ, {"AI_CACHE_BACKEND": "memory", "AI_CACHE_BYPASS": "true"}):
+            wrapped = wrap_with_cache(make_inner())
+        assert isinstance(wrapped, CachedSuggester)
+        assert wrapped.bypass is True
+
+
+class TestDatabaseCache:
+    """Tests for the ai_suggestions-backed cache and worker evidence rows."""
+
+    def test_cache_hit_still_writes_evidence_row(self, sqlite_engine, sqlite_session) -> None:
+        """Repeated text should reuse a stored suggestion but log a row per event."""
+        from app.models.ai_suggestion import AISuggestion as AISuggestionModel
+        from app.models.raw_event import RawEvent
+        from app.worker import process_event
+
+        inner = make_inner()
+        backend = DatabaseCacheBackend(session_factory=sessionmaker(bind=sqlite_engine))
+        cached = CachedSuggester(inner, backend)
+
+        events = [RawEvent(source="dictation", payload="Call the plumber") for _ in range(2)]
+        sqlite_session.add_all(events)
+        sqlite_session.commit()
+
+        with patch("app.worker.get_shared_suggester", return_value=cached):
+            for event in events:
+                process_event(sqlite_session, event.id)
+
+        rows = sqlite_session.query(AISuggestionModel).all()
+        assert len(rows) == 2
+        assert rows[0].input_hash == rows[1].input_hash
+        assert rows[0].input_hash == cache_key("Call the plumber", "openai", "gpt-4o-mini")
+        inner.suggest.assert_called_once()
+        assert cached.stats.hits == 1
+
+    def test_expired_rows_are_ignored(self, sqlite_engine, sqlite_session) -> None:
+        """Rows older than the TTL should not be reused."""
+        from datetime import datetime, timedelta
+
+        from app.models.ai_suggestion import AISuggestion as AISuggestionModel
+
+        sqlite_session.add(
+            AISuggestionModel(
+                raw_event_id="evt-1",
+                provider="openai",
+                model="gpt-4o-mini",
+                prompt_version="v1",
+                input_excerpt="text",
+                suggestion_json=suggestion_to_dict(SUGGESTION),
+                rationale=SUGGESTION.rationale,
+                input_hash="abc",
+                created_at=datetime.utcnow() - timedelta(hours=2),
+            )
+        )
+        sqlite_session.commit()
+        factory = sessionmaker(bind=sqlite_engine)
+
+        assert DatabaseCacheBackend(session_factory=factory, ttl=3600).get("abc") is None
+        assert DatabaseCacheBackend(session_factory=factory, ttl=3 * 3600).get("abc") == (
+            suggestion_to_dict(SUGGESTION)
+        )
@@ -0,0 +1,45 @@
+"""
+Tests for database engine and session helpers.
+"""
+
+import pytest
+
+from app.core.db import async_database_url
+
+
+class TestAsyncDatabaseUrl:
+    """Tests for deriving the async driver URL from DATABASE_URL."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("postgresql://u:p@db:5432/lifeos", "postgresql+psycopg://u:p@db:5432/lifeos"),
+            ("postgresql+psycopg://u:p@db/lifeos", "postgresql+psycopg://u:p@db/lifeos"),
+            ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+            ("sqlite:////tmp/lifeos.db", "sqlite+aiosqlite:////tmp/lifeos.db"),
+        ],
+    )
+    def test_maps_to_async_driver(self, url: str, expected: str) -> None:
+        """Known backends should switch to their async driver, keeping the rest."""
+        assert async_database_url(url) == expected
+
+    def test_unknown_backend_unchanged(self) -> None:
+        """URLs for other backends should pass through untouched."""
+        assert async_database_url("mysql://u@db/lifeos") == "mysql://u@db/lifeos"
+
+
+class TestGetAsyncDb:
+    """Tests for the async session dependency."""
+
+    @pytest.mark.anyio
+    async def test_yields_async_session(self) -> None:
+        """The dependency should lazily build the engine and yield a working session."""
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        from app.core.db import get_async_db
+
+        async for db in get_async_db():
+            assert isinstance(db, AsyncSession)
+            assert (await db.execute(text("SELECT 1"))).scalar() == 1
@@ -11,34 +11,23 @@ def make_mock_row(**kwargs):
     return m
 
 
-def test_export_returns_collections(test_client, mock_db_session):
-    # Prepare one item per collection
-    raw = make_mock_row(id="r1", source="manual", received_at=datetime(2025,1,1,0,0,0), payload="p", processed=False)
-    cand = make_mock_row(id="c1", raw_event_id="r1", created_at=datetime(2025,1,1,0,0,0), title="T1", description="d", priority="medium", status="pending", ai_suggestion_id=None)
-    task = make_mock_row(id="t1", created_at=datetime(2025,1,1,0,0,0), title="Task", description="dd", priority="low", status="active", completed_at=None, raw_event_id="r1")
-    review = make_mock_row(id="ra1", candidate_id="c1", action="approved", timestamp=datetime(2025,1,1,0,0,0), raw_event_id="r1")
-    ai = make_mock_row(id="ai1", provider="prov", model="m1", rationale="r", suggestion_json={"confidence":0.9}, created_at=datetime(2025,1,1,0,0,0))
-
-    # Create query mocks mapping by model class
-    def query_side_effect(model):
-        qm = MagicMock()
-        if model.__name__ == 'RawEvent':
-            qm.order_by.return_value.all.return_value = [raw]
-        elif model.__name__ == 'TaskCandidate':
-            qm.order_by.return_value.all.return_value = [cand]
-        elif model.__name__ == 'Task':
-            qm.order_by.return_value.all.return_value = [task]
-        elif model.__name__ == 'ReviewAction':
-            qm.order_by.return_value.all.return_value = [review]
-        elif model.__name__ == 'AISuggestion':
-            qm.order_by.return_value.all.return_value = [ai]
-        else:
-            qm.order_by.return_value.all.return_value = []
-        return qm
+def test_export_returns_collections(async_sqlite_client, sqlite_file_session):
+    from app.models.ai_suggestion import AISuggestion
+    from app.models.raw_event import RawEvent
+    from app.models.review_action import ReviewAction
+    from app.models.task import Task
+    from app.models.task_candidate import TaskCandidate
 
-    mock_db_session.query.side_effect = query_side_effect
+    # One item per collection
+    db = sqlite_file_session
+    db.add(RawEvent(id="r1", source="manual", received_at=datetime(2025,1,1,0,0,0), payload="p", processed=False))
+    db.add(TaskCandidate(id="c1", raw_event_id="r1", created_at=datetime(2025,1,1,0,0,0), title="T1", description="d", priority="medium", status="pending", ai_suggestion_id=None))
+    db.add(Task(id="t1", created_at=datetime(2025,1,1,0,0,0), title="Task", description="dd", priority="low", status="active", completed_at=None, raw_event_id="r1"))
+    db.add(ReviewAction(id="ra1", candidate_id="c1", action="approved", timestamp=datetime(2025,1,1,0,0,0), raw_event_id="r1"))
+    db.add(AISuggestion(id="ai1", raw_event_id="r1", provider="prov", model="m1", prompt_version="v1", input_excerpt="p", rationale="r", suggestion_json={"confidence":0.9}, created_at=datetime(2025,1,1,0,0,0)))
+    db.commit()
 
-    res = test_client.get('/api/export')
+    res = async_sqlite_client.get('/api/export')
     assert res.status_code == 200
     data = res.json()
     assert 'raw_events' in data and len(data['raw_events']) == 1
@@ -46,6 +35,8 @@ def test_export_returns_collections(test_client, mock_db_session):
     assert 'tasks' in data and len(data['tasks']) == 1
     assert 'review_actions' in data and len(data['review_actions']) == 1
     assert 'ai_suggestions' in data and len(data['ai_suggestions']) == 1
+    assert data['tasks'][0]['created_at'] == "2025-01-01T00:00:00"
+    assert data['ai_suggestions'][0]['suggestion_json'] == {"confidence": 0.9}
 
 
 def test_import_preview_and_import(test_client, mock_db_session):
@@ -59,10 +50,10 @@ def test_import_preview_and_import(test_client, mock_db_session):
     }
 
     # Prepare query mocks for collision detection: Task with id 't-existing' exists
-    def query_side_effect(model):
+    def query_side_effect(column):
         qm = MagicMock()
-        # For collision detection, import preview uses model.id.in_(...)
-        if model.__name__ == 'Task':
+        # For collision detection, import preview selects model.id filtered by model.id.in_(...)
+        if column.class_.__name__ == 'Task':
             existing = make_mock_row(id='t-existing')
             filt = MagicMock()
             filt.all.return_value = [existing]
@@ -82,16 +73,218 @@ def test_import_preview_and_import(test_client, mock_db_session):
     preview = response.json()
     assert preview['preview']['counts']['tasks'] == 1
     assert 't-existing' in preview['collisions']['tasks']
+    assert preview['collision_counts']['tasks'] == 1
+    assert preview['collision_page']['next_offset'] is None
 
-    # Now test full import: ensure merge and commit are called
-    # Reset query side effect for import (not strictly needed)
-    mock_db_session.query.side_effect = lambda model: MagicMock()
+    # Now test full import: ensure bulk upserts and commit are called
+    mock_db_session.get_bind.return_value.dialect.name = "postgresql"
 
     file_obj2 = io.BytesIO(json.dumps(payload).encode())
     response2 = test_client.post('/api/import', files={'file': ('payload.json', file_obj2, 'application/json')})
     assert response2.status_code == 200
     data = response2.json()
     assert data['status'] == 'imported'
-    # merge should be called multiple times (for raw_events, candidates, tasks)
-    assert mock_db_session.merge.call_count >= 1
+    assert data['counts']['raw_events'] == 1 and data['counts']['tasks'] == 1
+    # one upsert statement per non-empty table (raw_events, candidates, tasks)
+    assert mock_db_session.execute.call_count == 3
+    mock_db_session.merge.assert_not_called()
     mock_db_session.commit.assert_called()
+
+
+def test_export_ndjson_streams_every_table(test_client, sqlite_engine):
+    from unittest.mock import patch
+
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.raw_event import RawEvent
+    from app.models.task import Task
+    from app.models.task_candidate import TaskCandidate
+
+    session_factory = sessionmaker(bind=sqlite_engine)
+    db = session_factory()
+    db.add_all([RawEvent(id=f"r{i}", source="manual", payload=f"p{i}", received_at=datetime(2025, 1, 1, 0, 0, i)) for i in range(5)])
+    db.add(TaskCandidate(id="c1", raw_event_id="r1", title="T1", created_at=datetime(2025, 1, 1)))
+    db.add(Task(id="t1", raw_event_id="r1", title="Task", created_at=datetime(2025, 1, 1)))
+    db.commit()
+    db.close()
+
+    with patch("app.api_export.SessionLocal", session_factory), patch("app.api_export.EXPORT_BATCH_SIZE", 2):
+        res = test_client.get('/api/export?format=ndjson')
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    header, records = lines[0], lines[1:]
+    assert "exported_at" in header
+    assert header["tables"] == ["raw_events", "task_candidates", "tasks", "review_actions", "ai_suggestions"]
+    assert [r["record"]["id"] for r in records if r["table"] == "raw_events"] == [f"r{i}" for i in range(5)]
+    assert [r["record"]["id"] for r in records if r["table"] == "task_candidates"] == ["c1"]
+    task = next(r["record"] for r in records if r["table"] == "tasks")
+    assert task["created_at"] == "2025-01-01T00:00:00" and task["completed_at"] is None
+
+
+def test_export_ndjson_chunks_by_batch_size(sqlite_engine):
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api_export import iter_ndjson_export
+    from app.models.raw_event import RawEvent
+
+    session_factory = sessionmaker(bind=sqlite_engine)
+    db = session_factory()
+    db.add_all([RawEvent(id=f"r{i}", source="manual", payload="p") for i in range(7)])
+    db.commit()
+    db.close()
+
+    chunks = list(iter_ndjson_export(session_factory, batch_size=3))
+
+    # header, then raw_events in chunks of 3, 3 and 1 lines
+    assert [c.count("\n") for c in chunks] == [1, 3, 3, 1]
+
+
+def test_import_ndjson_round_trip_is_idempotent(sqlite_engine):
+    from unittest.mock import patch
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api_export import iter_ndjson_export
+    from app.core.db import get_db
+    from app.main import app
+    from app.models.ai_suggestion import AISuggestion
+    from app.models.raw_event import RawEvent
+    from app.models.task_candidate import TaskCandidate
+
+    session_factory = sessionmaker(bind=sqlite_engine)
+    db = session_factory()
+    db.add_all([RawEvent(id=f"r{i}", source="manual", payload=f"p{i}") for i in range(5)])
+    db.add(AISuggestion(id="a1", raw_event_id="r1", provider="openai", model="m", prompt_version="v1", input_hash="h1", input_excerpt="p1", suggestion_json={"confidence": 0.5}, rationale="r"))
+    db.add(TaskCandidate(id="c1", raw_event_id="r1", title="T1", ai_suggestion_id="a1"))
+    db.commit()
+    archive = "".join(iter_ndjson_export(session_factory)).encode()
+
+    # Wipe and re-import twice into the same database
+    for model in (RawEvent, AISuggestion, TaskCandidate):
+        db.query(model).delete()
+    db.commit()
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with patch("app.api_export.IMPORT_CHUNK_SIZE", 2):
+            client = TestClient(app)
+            for _ in range(2):
+                res = client.post('/api/import', files={'file': ('lifeos-export.ndjson', io.BytesIO(archive), 'application/octet-stream')})
+                assert res.status_code == 200
+                assert res.json()['counts']['raw_events'] == 5
+    finally:
+        app.dependency_overrides.clear()
+
+    assert db.query(RawEvent).count() == 5
+    assert db.query(TaskCandidate).one().ai_suggestion_id == "a1"
+    suggestion = db.query(AISuggestion).one()
+    assert suggestion.suggestion_json == {"confidence": 0.5}
+    # The suggestion cache looks rows up by input_hash
+    assert suggestion.input_hash == "h1"
+    db.close()
+
+
+def test_import_rejects_unknown_format(test_client):
+    res = test_client.post('/api/import', files={'file': ('notes.txt', io.BytesIO(b'hello'), 'text/plain')})
+    assert res.status_code == 400
+
+
+def test_import_rejects_corrupt_archive(test_client, mock_db_session):
+    mock_db_session.get_bind.return_value.dialect.name = "postgresql"
+    res = test_client.post('/api/import', files={'file': ('a.ndjson', io.BytesIO(b'{"table": "tasks", "record": {}}\n{oops'), 'application/x-ndjson')})
+    assert res.status_code == 400
+    assert "line 2" in res.json()['detail']
+
+
+def test_import_conflict_reports_committed_rows(test_client):
+    from unittest.mock import patch
+
+    from app.core.archive import ArchiveConflictError
+
+    def partial_import(db, records, tables, chunk_size, on_progress):
+        on_progress({"raw_events": 1000, "tasks": 0})
+        raise ArchiveConflictError("tasks rows conflict with existing data: UNIQUE constraint failed")
+
+    with patch("app.api_export.bulk_import", side_effect=partial_import):
+        res = test_client.post('/api/import', files={'file': ('a.ndjson', io.BytesIO(b''), 'application/x-ndjson')})
+    assert res.status_code == 409
+    assert "tasks rows conflict" in res.json()['detail']
+    assert "(1000 rows committed)" in res.json()['detail']
+
+
+def test_import_preview_chunks_id_lookups_and_pages_collisions(sqlite_engine):
+    from unittest.mock import patch
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db import get_db
+    from app.main import app
+    from app.models.raw_event import RawEvent
+
+    session_factory = sessionmaker(bind=sqlite_engine)
+    db = session_factory()
+    db.add_all([RawEvent(id=f"r{i}", source="manual", payload="p") for i in range(0, 10, 2)])
+    db.commit()
+    db.close()
+
+    # r0..r9 incoming, even ids already exist
+    lines = [{"exported_at": "2025-01-01T00:00:00"}]
+    lines += [{"table": "raw_events", "record": {"id": f"r{i}", "source": "slack", "payload": "x"}} for i in range(10)]
+    archive = "\n".join(json.dumps(line) for line in lines).encode()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "raw_events" in statement:
+            statements.append((statement, parameters))
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    event.listen(sqlite_engine, "before_cursor_execute", record)
+    try:
+        with patch("app.api_export.PREVIEW_LOOKUP_CHUNK", 4):
+            client = TestClient(app)
+            res = client.post('/api/import/preview?collision_limit=2', files={'file': ('a.ndjson', io.BytesIO(archive), 'application/x-ndjson')})
+            page2 = client.post('/api/import/preview?collision_limit=2&collision_offset=4', files={'file': ('a.ndjson', io.BytesIO(archive), 'application/x-ndjson')})
+    finally:
+        event.remove(sqlite_engine, "before_cursor_execute", record)
+        app.dependency_overrides.clear()
+
+    assert res.status_code == 200
+    data = res.json()
+    assert data['preview']['counts']['raw_events'] == 10
+    assert [s['id'] for s in data['preview']['samples']['raw_events']] == ["r0", "r1", "r2", "r3", "r4"]
+    assert data['collision_counts']['raw_events'] == 5
+    assert data['collisions']['raw_events'] == ["r0", "r2"]
+    assert data['collision_page'] == {"offset": 0, "limit": 2, "next_offset": 2}
+    assert page2.json()['collisions']['raw_events'] == ["r8"]
+    assert page2.json()['collision_page']['next_offset'] is None
+
+    # Two requests x three chunks (4 + 4 + 2 ids), id column only
+    assert len(statements) == 6
+    assert all(len(params) <= 4 for _, params in statements)
+    assert all("payload" not in sql for sql, _ in statements)
+
+
+def test_import_preview_rejects_corrupt_archive(test_client):
+    res = test_client.post('/api/import/preview', files={'file': ('a.ndjson', io.BytesIO(b'{"table": "tasks"\n'), 'application/x-ndjson')})
+    assert res.status_code == 400
+    assert "line 1" in res.json()['detail']
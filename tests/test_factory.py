@@ -130,3 +130,35 @@ class TestGetSuggester:
             ):
                 result = app.ai.factory.get_suggester()
                 assert result is None
+
+
+class TestSharedSuggester:
+    """Tests for the process-wide suggester cache and reload hook."""
+
+    def test_shared_suggester_is_built_once(self) -> None:
+        """Repeated calls should reuse the same instance."""
+        import app.ai.factory as factory
+
+        sentinel = object()
+        with (
+            patch.object(factory, "_shared_loaded", False),
+            patch.object(factory, "_shared_suggester", None),
+            patch.object(factory, "get_suggester", return_value=sentinel) as mock_get,
+        ):
+            assert factory.get_shared_suggester() is sentinel
+            assert factory.get_shared_suggester() is sentinel
+            mock_get.assert_called_once()
+
+    def test_reload_rebuilds_shared_suggester(self) -> None:
+        """reload_suggester should replace the cached instance."""
+        import app.ai.factory as factory
+
+        first, second = object(), object()
+        with (
+            patch.object(factory, "_shared_loaded", False),
+            patch.object(factory, "_shared_suggester", None),
+            patch.object(factory, "get_suggester", side_effect=[first, second]),
+        ):
+            assert factory.get_shared_suggester() is first
+            assert factory.reload_suggester() is second
+            assert factory.get_shared_suggester() is second
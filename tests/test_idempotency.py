@@ -0,0 +1,77 @@
+"""
+Tests for ingest dedup keys and the Redis fast path.
+"""
+
+from unittest.mock import patch
+
+import redis
+
+from app.core.idempotency import (
+    IDEMPOTENCY_WINDOW,
+    claim,
+    claim_many,
+    dedup_key,
+    release,
+    release_many,
+)
+
+
+class TestDedupKey:
+    """Tests for dedup_key."""
+
+    def test_explicit_key_wins(self) -> None:
+        """An explicit key should be used as-is, whatever the payload."""
+        assert dedup_key("slack", {"a": 1}, "Ev123") == "slack:Ev123"
+        assert dedup_key("dictation", "one", "k1") == dedup_key("dictation", "two", "k1")
+
+    def test_content_hash_is_normalized(self) -> None:
+        """Whitespace differences and dict key order should not change the key."""
+        now = 1_700_000_000
+        assert dedup_key("dictation", "Buy  milk\n", now=now) == dedup_key(
+            "dictation", " Buy milk", now=now
+        )
+        assert dedup_key("slack", {"a": 1, "b": 2}, now=now) == dedup_key(
+            "slack", {"b": 2, "a": 1}, now=now
+        )
+        assert dedup_key("dictation", "Buy milk", now=now) != dedup_key(
+            "dictation", "Buy eggs", now=now
+        )
+
+    def test_content_hash_is_scoped(self) -> None:
+        """The same text from another source or time bucket is a new event."""
+        now = IDEMPOTENCY_WINDOW * 1000
+        key = dedup_key("dictation", "Buy milk", now=now)
+        assert key.startswith("dictation:sha256:")
+        assert key == dedup_key("dictation", "Buy milk", now=now + IDEMPOTENCY_WINDOW - 1)
+        assert key != dedup_key("dictation", "Buy milk", now=now + IDEMPOTENCY_WINDOW)
+        assert key.split(":", 1)[1] != dedup_key("slack", "Buy milk", now=now).split(":", 1)[1]
+
+
+class TestClaim:
+    """Tests for claim and release."""
+
+    def test_second_claim_is_rejected(self, fake_redis) -> None:
+        """A key should be claimable once until released."""
+        assert claim("dictation:k1") is True
+        assert claim("dictation:k1") is False
+        assert claim("dictation:k2") is True
+
+        release("dictation:k1")
+        assert claim("dictation:k1") is True
+
+    def test_claim_many(self, fake_redis) -> None:
+        """Batch claims should report each key in order."""
+        claim("dictation:k2")
+        assert claim_many(["dictation:k1", "dictation:k2", "dictation:k3"]) == [True, False, True]
+
+        release_many(["dictation:k1", "dictation:k2"])
+        assert claim_many(["dictation:k1", "dictation:k2", "dictation:k3"]) == [True, True, False]
+
+    def test_fails_open_without_redis(self, fake_redis) -> None:
+        """If Redis is down the request should proceed to the database check."""
+        with (
+            patch.object(fake_redis, "set", side_effect=redis.ConnectionError),
+            patch.object(fake_redis, "delete", side_effect=redis.ConnectionError),
+        ):
+            assert claim("dictation:k1") is True
+            release("dictation:k1")
@@ -0,0 +1,80 @@
+"""
+Tests for queue lane configuration and the weighted fair scheduler.
+"""
+
+import pytest
+
+from app.core.lanes import LaneMetrics, LaneScheduler, lane_for, parse_lanes
+
+
+class TestParseLanes:
+    """Tests for QUEUE_LANES parsing."""
+
+    def test_weights_and_default_lane(self) -> None:
+        """Listed lanes keep their weights and the default lane is always added."""
+        assert parse_lanes("interactive:8, backfill") == {
+            "interactive": 8,
+            "backfill": 1,
+            "default": 1,
+        }
+        assert parse_lanes("default:3") == {"default": 3}
+
+    @pytest.mark.parametrize("spec", ["slack:fast", "slack:0"])
+    def test_invalid_entries(self, spec: str) -> None:
+        """Malformed entries and weights below 1 should be rejected."""
+        with pytest.raises(ValueError):
+            parse_lanes(spec)
+
+
+class TestLaneFor:
+    """Tests for lane_for."""
+
+    def test_routing(self) -> None:
+        """Flags win over the source, and unknown lanes fall back to default."""
+        assert lane_for("dictation", interactive=True) == "interactive"
+        assert lane_for("dictation", interactive=True, backfill=True) == "backfill"
+        assert lane_for("slack") == "slack"
+        assert lane_for("email") == "default"
+
+
+class TestLaneScheduler:
+    """Tests for smooth weighted round robin."""
+
+    def test_slots_follow_weights(self) -> None:
+        """With every lane busy, slots should be split in proportion to weight."""
+        scheduler = LaneScheduler({"interactive": 8, "backfill": 1, "default": 1})
+
+        quotas = scheduler.allocate(100, {"interactive": 1000, "backfill": 1000, "default": 1000})
+
+        assert quotas == {"interactive": 80, "backfill": 10, "default": 10}
+
+    def test_light_lane_is_not_starved(self) -> None:
+        """The lightest busy lane should still get a slot every round."""
+        scheduler = LaneScheduler({"interactive": 8, "backfill": 1})
+
+        picks = [
+            next(iter(scheduler.allocate(1, {"interactive": 99, "backfill": 99}))) for _ in range(9)
+        ]
+
+        assert picks.count("backfill") == 1
+
+    def test_empty_lanes_get_nothing(self) -> None:
+        """Lanes without work are skipped and their slots go to the others."""
+        scheduler = LaneScheduler({"interactive": 8, "backfill": 1})
+
+        assert scheduler.allocate(5, {"interactive": 0, "backfill": 3}) == {"backfill": 3}
+        assert scheduler.allocate(5, {}) == {}
+
+
+class TestLaneMetrics:
+    """Tests for LaneMetrics."""
+
+    def test_snapshot(self) -> None:
+        """Snapshots should report pops and average / max wait per lane."""
+        metrics = LaneMetrics()
+        metrics.record("interactive", 0.01)
+        metrics.record("interactive", 0.03)
+
+        assert metrics.snapshot() == {
+            "interactive": {"popped": 2, "wait_ms_avg": 20.0, "wait_ms_max": 30.0}
+        }
@@ -0,0 +1,160 @@
+"""
+Tests for the fast-ack ingest buffer and the bulk persister.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.queue import (
+    INGEST_STREAM,
+    buffer_ingest,
+    ensure_ingest_group,
+    lane_key,
+    read_ingest_buffer,
+)
+from app.models.raw_event import RawEvent, raw_event_id_for
+
+SLACK_QUEUE = lane_key("slack")
+
+
+@pytest.fixture
+def process_slack():
+    """Route Slack events to the worker (the default stores them processed)."""
+    with patch.dict("app.core.routing.SOURCE_ROUTES", {"slack": "process"}):
+        yield
+
+
+class TestIngestBuffer:
+    """Tests for buffer_ingest and read_ingest_buffer."""
+
+    def test_dedup_key_is_carried(self, fake_redis) -> None:
+        """The dedup key should travel with the entry; keyless entries omit it."""
+        ensure_ingest_group()
+        buffer_ingest("slack", "{}", "slack:Ev1")
+        buffer_ingest("slack", "{}")
+
+        entries = read_ingest_buffer("p1", 10, block_ms=1)
+        assert [fields.get("dedup_key") for _, fields in entries] == ["slack:Ev1", None]
+
+    def test_idle_entries_are_claimed(self, fake_redis) -> None:
+        """Entries left pending by a dead persister should be re-read by another."""
+        ensure_ingest_group()
+        buffer_ingest("slack", "{}", "slack:Ev1")
+        assert len(read_ingest_buffer("dead", 10, block_ms=1)) == 1
+
+        assert read_ingest_buffer("alive", 10, block_ms=1, claim_idle_ms=60_000) == []
+        claimed = read_ingest_buffer("alive", 10, block_ms=1, claim_idle_ms=0)
+        assert [fields["dedup_key"] for _, fields in claimed] == ["slack:Ev1"]
+
+
+class TestPersistBatch:
+    """Tests for persist_batch on SQLite."""
+
+    def test_inserts_enqueues_and_acks(self, fake_redis, sqlite_session, process_slack) -> None:
+        """A batch should become raw_events rows, worker jobs and acked entries."""
+        from app.persister import persist_batch
+
+        ensure_ingest_group()
+        buffer_ingest("slack", '{"event_id": "Ev1"}', "slack:Ev1")
+        buffer_ingest("slack", '{"text": "no id"}')
+        entries = read_ingest_buffer("p1", 10, block_ms=1)
+
+        inserted = persist_batch(sqlite_session, entries)
+
+        assert len(inserted) == 2
+        assert raw_event_id_for("slack:Ev1") in inserted
+        stored = sqlite_session.get(RawEvent, raw_event_id_for("slack:Ev1"))
+        assert stored.dedup_key == "slack:Ev1"
+        assert sqlite_session.query(RawEvent).count() == 2
+        jobs = [json.loads(j)["raw_event_id"] for j in fake_redis.lrange(SLACK_QUEUE, 0, -1)]
+        assert sorted(jobs) == sorted(inserted)
+        assert fake_redis.xlen(INGEST_STREAM) == 0
+
+    def test_replayed_batch_is_not_duplicated(
+        self, fake_redis, sqlite_session, process_slack
+    ) -> None:
+        """Re-persisting entries (crash before enqueue) should insert nothing but re-enqueue."""
+        from app.persister import persist_batch
+
+        ensure_ingest_group()
+        buffer_ingest("slack", "{}", "slack:Ev1")
+        buffer_ingest("slack", "{}")
+        entries = read_ingest_buffer("p1", 10, block_ms=1)
+        persist_batch(sqlite_session, entries)
+        fake_redis.delete(SLACK_QUEUE)
+
+        assert persist_batch(sqlite_session, entries) == []
+        assert sqlite_session.query(RawEvent).count() == 2
+        # The unprocessed rows still reach the worker
+        jobs = [json.loads(j)["raw_event_id"] for j in fake_redis.lrange(SLACK_QUEUE, 0, -1)]
+        assert sorted(jobs) == sorted(e.id for e in sqlite_session.query(RawEvent).all())
+
+    def test_store_route_is_not_enqueued(self, fake_redis, sqlite_session) -> None:
+        """Sources routed to "store" should be inserted processed and skip the queue."""
+        from app.persister import persist_batch
+
+        ensure_ingest_group()
+        buffer_ingest("slack", "{}", "slack:Ev1")
+        buffer_ingest("dictation", "Buy milk", "dictation:k1")
+        entries = read_ingest_buffer("p1", 10, block_ms=1)
+
+        persist_batch(sqlite_session, entries)
+
+        stored = {e.source: e.processed for e in sqlite_session.query(RawEvent).all()}
+        assert stored == {"slack": True, "dictation": False}
+        assert fake_redis.llen(SLACK_QUEUE) == 0
+        assert fake_redis.llen(lane_key("dictation")) == 1
+
+    def test_replayed_batch_enqueues_only_processed_routes(
+        self, fake_redis, sqlite_session
+    ) -> None:
+        """A replay should re-enqueue process-routed rows and still skip stored ones."""
+        from app.persister import persist_batch
+
+        ensure_ingest_group()
+        buffer_ingest("slack", "{}", "slack:Ev1")
+        buffer_ingest("dictation", "Buy milk", "dictation:k1")
+        entries = read_ingest_buffer("p1", 10, block_ms=1)
+        persist_batch(sqlite_session, entries)
+        fake_redis.delete(lane_key("dictation"))
+
+        assert persist_batch(sqlite_session, entries) == []
+        jobs = fake_redis.lrange(lane_key("dictation"), 0, -1)
+        assert [json.loads(j)["raw_event_id"] for j in jobs] == [raw_event_id_for("dictation:k1")]
+        assert fake_redis.llen(SLACK_QUEUE) == 0
+
+
+class TestRunPersister:
+    """Tests for the persister loop."""
+
+    def test_drains_buffer_until_stopped(self, fake_redis, sqlite_engine, process_slack) -> None:
+        """The loop should persist everything buffered, then stop on request."""
+        from sqlalchemy.orm import sessionmaker
+
+        from app.persister import run_persister
+
+        session_factory = sessionmaker(bind=sqlite_engine)
+        for i in range(5):
+            buffer_ingest("slack", "{}", f"slack:Ev{i}")
+
+        stop = threading.Event()
+        with (
+            patch("app.persister.SessionLocal", session_factory),
+            patch("app.persister.PERSISTER_BLOCK_MS", 10),
+        ):
+            thread = threading.Thread(target=run_persister, args=(stop, 2))
+            thread.start()
+            deadline = time.monotonic() + 5
+            while fake_redis.xlen(INGEST_STREAM) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop.set()
+            thread.join(timeout=5)
+
+        db = session_factory()
+        assert db.query(RawEvent).count() == 5
+        db.close()
+        assert fake_redis.llen(SLACK_QUEUE) == 5
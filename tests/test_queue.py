@@ -0,0 +1,299 @@
+"""
+Unit tests for the Redis raw-event queue.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core import queue
+
+
+@pytest.fixture
+def reliable(fake_redis):
+    """Enable reliable mode against fakeredis."""
+    with (
+        patch.object(queue, "RELIABLE_QUEUE", True),
+        patch.object(queue, "MAX_DELIVERY_ATTEMPTS", 2),
+    ):
+        yield fake_redis
+
+
+class TestSimpleQueue:
+    """Tests for the default BRPOP mode."""
+
+    def test_enqueue_then_pop_is_fifo(self, fake_redis) -> None:
+        """Jobs should come out in the order they were enqueued."""
+        queue.enqueue_raw_event("a")
+        queue.enqueue_raw_event("b")
+
+        assert queue.pop_raw_event(timeout=1)["raw_event_id"] == "a"
+        assert queue.pop_raw_event(timeout=1)["raw_event_id"] == "b"
+
+    def test_pop_many_drains_up_to_max_items(self, fake_redis) -> None:
+        """Batch pop should return at most max_items jobs in FIFO order."""
+        for raw_event_id in "abcde":
+            queue.enqueue_raw_event(raw_event_id)
+
+        jobs = queue.pop_raw_events(3, timeout=1)
+
+        assert [job["raw_event_id"] for job in jobs] == ["a", "b", "c"]
+        assert fake_redis.llen(queue.QUEUE_NAME) == 2
+
+    def test_ack_and_nack_are_noops(self, fake_redis) -> None:
+        """Jobs without a receipt need no acknowledgement."""
+        queue.ack_raw_event({"raw_event_id": "a"})
+        assert queue.nack_raw_event({"raw_event_id": "a"}) is False
+
+
+class TestReliableQueue:
+    """Tests for in-flight tracking, ack/nack, reaping and dead-lettering."""
+
+    def test_pop_moves_job_to_processing_list(self, reliable) -> None:
+        """A popped job should stay in the worker's processing list until acked."""
+        queue.enqueue_raw_event("a")
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+
+        assert job["raw_event_id"] == "a"
+        assert reliable.llen(queue.QUEUE_NAME) == 0
+        assert reliable.lrange(queue.processing_list("w1"), 0, -1) == [job["receipt"]]
+        assert reliable.zcard(queue.INFLIGHT_KEY) == 1
+
+    def test_pop_many_tracks_every_job_in_flight(self, reliable) -> None:
+        """Batch pop in reliable mode should move each job to the processing list."""
+        for raw_event_id in "abc":
+            queue.enqueue_raw_event(raw_event_id)
+
+        jobs = queue.pop_raw_events(5, timeout=1, worker_id="w1")
+
+        assert [job["raw_event_id"] for job in jobs] == ["a", "b", "c"]
+        assert reliable.llen(queue.processing_list("w1")) == 3
+        assert reliable.zcard(queue.INFLIGHT_KEY) == 3
+        for job in jobs:
+            queue.ack_raw_event(job)
+        assert reliable.llen(queue.processing_list("w1")) == 0
+
+    def test_ack_clears_in_flight_state(self, reliable) -> None:
+        """Acking should remove the job from every tracking structure."""
+        queue.enqueue_raw_event("a")
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+
+        queue.ack_raw_event(job)
+
+        assert reliable.llen(queue.processing_list("w1")) == 0
+        assert reliable.zcard(queue.INFLIGHT_KEY) == 0
+        assert reliable.llen(queue.QUEUE_NAME) == 0
+
+    def test_nack_requeues_then_dead_letters(self, reliable) -> None:
+        """Failures should re-queue until MAX_DELIVERY_ATTEMPTS, then dead-letter."""
+        queue.enqueue_raw_event("a")
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+        assert queue.nack_raw_event(job) is True
+        assert reliable.llen(queue.QUEUE_NAME) == 1
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+        assert queue.nack_raw_event(job) is False
+        assert reliable.llen(queue.QUEUE_NAME) == 0
+        dead = reliable.lrange(queue.DEAD_LETTER_QUEUE, 0, -1)
+        assert [json.loads(data)["raw_event_id"] for data in dead] == ["a"]
+
+    def test_reaper_requeues_stale_jobs_only(self, reliable) -> None:
+        """Jobs older than the visibility timeout should go back on the queue."""
+        queue.enqueue_raw_event("stale")
+        queue.enqueue_raw_event("fresh")
+        stale = queue.pop_raw_event(timeout=1, worker_id="crashed")
+        queue.pop_raw_event(timeout=1, worker_id="alive")
+
+        member = f"{stale['processing_list']}|{stale['receipt']}"
+        reliable.zadd(queue.INFLIGHT_KEY, {member: time.time() - 120})
+
+        assert queue.requeue_stale_raw_events(visibility_timeout=60) == 1
+        assert queue.pop_raw_event(timeout=1, worker_id="alive")["raw_event_id"] == "stale"
+        assert reliable.llen(queue.processing_list("crashed")) == 0
+
+    def test_late_ack_after_reap_does_not_duplicate(self, reliable) -> None:
+        """A reaped job should not be re-queued again by its original worker."""
+        queue.enqueue_raw_event("a")
+        job = queue.pop_raw_event(timeout=1, worker_id="slow")
+
+        assert queue.requeue_stale_raw_events(visibility_timeout=-1) == 1
+        assert queue.nack_raw_event(job) is False
+        assert reliable.llen(queue.QUEUE_NAME) == 1
+
+
+@pytest.fixture
+def stream(fake_redis):
+    """Select the stream backend against fakeredis."""
+    with (
+        patch.object(queue, "QUEUE_BACKEND", "stream"),
+        patch.object(queue, "MAX_DELIVERY_ATTEMPTS", 2),
+        patch.dict(queue._backends, clear=True),
+    ):
+        yield fake_redis
+
+
+class TestStreamQueue:
+    """Tests for the Redis Streams backend (consumer group, XCLAIM, trimming)."""
+
+    def test_jobs_stay_pending_until_acked(self, stream) -> None:
+        """Delivered jobs should be pending in the group, and kept after ack for replay."""
+        queue.enqueue_raw_events(["a", "b"])
+
+        jobs = queue.pop_raw_events(5, timeout=1, worker_id="w1")
+
+        assert [job["raw_event_id"] for job in jobs] == ["a", "b"]
+        assert stream.xpending(queue.QUEUE_STREAM, queue.QUEUE_STREAM_GROUP)["pending"] == 2
+        for job in jobs:
+            queue.ack_raw_event(job)
+        assert stream.xpending(queue.QUEUE_STREAM, queue.QUEUE_STREAM_GROUP)["pending"] == 0
+        assert stream.xlen(queue.QUEUE_STREAM) == 2
+
+    def test_consumers_share_the_stream(self, stream) -> None:
+        """Each job should be delivered to only one worker."""
+        queue.enqueue_raw_events(["a", "b"])
+
+        first = queue.pop_raw_event(timeout=1, worker_id="node1")
+        second = queue.pop_raw_event(timeout=1, worker_id="node2")
+
+        assert {first["raw_event_id"], second["raw_event_id"]} == {"a", "b"}
+        assert queue.pop_raw_events(5, timeout=0.001, worker_id="node1") == []
+
+    def test_nack_requeues_then_dead_letters(self, stream) -> None:
+        """Failures should re-queue with an attempt count, then dead-letter."""
+        queue.enqueue_raw_event("a")
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+        assert queue.nack_raw_event(job) is True
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+        assert job["attempts"] == 1
+        assert queue.nack_raw_event(job) is False
+        assert queue.pop_raw_event(timeout=0.001, worker_id="w1") is None
+        dead = stream.lrange(queue.DEAD_LETTER_QUEUE, 0, -1)
+        assert [json.loads(data)["raw_event_id"] for data in dead] == ["a"]
+        assert stream.xpending(queue.QUEUE_STREAM, queue.QUEUE_STREAM_GROUP)["pending"] == 0
+
+    def test_reaper_reclaims_once(self, stream) -> None:
+        """A stale job should be re-queued by the reaper, not again by a late nack."""
+        queue.enqueue_raw_event("a")
+        job = queue.pop_raw_event(timeout=1, worker_id="slow")
+
+        assert queue.requeue_stale_raw_events(visibility_timeout=60) == 0
+        assert queue.requeue_stale_raw_events(visibility_timeout=-1) == 1
+        assert queue.nack_raw_event(job) is False
+
+        retry = queue.pop_raw_event(timeout=1, worker_id="alive")
+        assert retry["raw_event_id"] == "a"
+        assert queue.pop_raw_event(timeout=0.001, worker_id="alive") is None
+
+    def test_trim_never_drops_unacked_entries(self, stream) -> None:
+        """Trimming should only remove acked entries, by age or past the length cap."""
+        queue.enqueue_raw_events(["a", "b", "c"])
+        a, _ = queue.pop_raw_events(2, timeout=1, worker_id="w1")
+        queue.ack_raw_event(a)
+
+        assert queue.trim_raw_event_queue() == 0  # within retention, under the cap
+
+        with patch.object(queue, "QUEUE_STREAM_MAXLEN", 1):
+            assert queue.trim_raw_event_queue() == 1
+        remaining = [f["raw_event_id"] for _, f in stream.xrange(queue.QUEUE_STREAM)]
+        assert remaining == ["b", "c"]
+
+        with patch.object(queue, "QUEUE_STREAM_RETENTION", -60):
+            assert queue.trim_raw_event_queue() == 0
+
+    def test_stats(self, stream) -> None:
+        """Stats should report stream length, pending entries and lag."""
+        queue.enqueue_raw_events(["a", "b", "c"])
+        queue.pop_raw_event(timeout=1, worker_id="w1")
+
+        stats = queue.queue_stats()
+
+        assert stats["backend"] == "stream"
+        assert (stats["length"], stats["pending"], stats["lag"]) == (3, 1, 2)
+
+
+@pytest.fixture(params=["list", "stream"])
+def laned(request, fake_redis):
+    """Each backend with a fresh lane scheduler."""
+    with (
+        patch.object(queue, "QUEUE_BACKEND", request.param),
+        patch.dict(queue._backends, clear=True),
+    ):
+        yield fake_redis
+
+
+class TestQueueLanes:
+    """Tests for per-lane queues and weighted fair dequeue."""
+
+    def test_interactive_jobs_skip_the_backfill(self, laned) -> None:
+        """Jobs on a heavier lane should pop ahead of a large backlog on a light one."""
+        queue.enqueue_raw_events([f"old-{i}" for i in range(200)], lane="backfill")
+        queue.enqueue_raw_events(["live-1", "live-2"], lane="interactive")
+
+        jobs = queue.pop_raw_events(3, timeout=1, worker_id="w1")
+
+        assert [job["lane"] for job in jobs].count("interactive") == 2
+        assert [job["raw_event_id"] for job in jobs if job["lane"] == "backfill"] == ["old-0"]
+
+    def test_backfill_drains_when_alone(self, laned) -> None:
+        """A light lane should get every slot when the others are empty."""
+        queue.enqueue_raw_events(["a", "b", "c"], lane="backfill")
+
+        jobs = queue.pop_raw_events(5, timeout=1, worker_id="w1")
+
+        assert [job["raw_event_id"] for job in jobs] == ["a", "b", "c"]
+
+    def test_blocking_pop_wakes_on_any_lane(self, laned) -> None:
+        """An idle worker should pick up work on whichever lane it arrives."""
+        assert queue.pop_raw_events(5, timeout=0.01, worker_id="w1") == []
+        queue.enqueue_raw_event("a", lane="slack")
+
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+
+        assert (job["raw_event_id"], job["lane"]) == ("a", "slack")
+
+    def test_stats_per_lane(self, laned) -> None:
+        """Stats should break depth and oldest wait down by lane."""
+        queue.enqueue_raw_events(["a", "b"], lane="backfill")
+        queue.enqueue_raw_event("c")
+
+        lanes = queue.queue_stats()["lanes"]
+
+        assert lanes["default"]["weight"] == 1
+        assert lanes["interactive"]["oldest_wait_s"] == 0.0
+        assert lanes["backfill"]["oldest_wait_s"] >= 0.0
+        depth = "depth" if queue.QUEUE_BACKEND == "list" else "lag"
+        assert (lanes["backfill"][depth], lanes["default"][depth]) == (2, 1)
+
+    def test_reliable_retry_returns_to_its_lane(self, reliable) -> None:
+        """A nacked job should be re-queued on the lane it came from."""
+        queue.enqueue_raw_event("a", lane="slack")
+        job = queue.pop_raw_event(timeout=1, worker_id="w1")
+
+        assert queue.nack_raw_event(job) is True
+
+        assert reliable.llen(queue.lane_key("slack")) == 1
+        assert reliable.llen(queue.QUEUE_NAME) == 0
+
+
+class TestQueueBackendSelection:
+    """Tests for QUEUE_BACKEND selection and /metrics/queue."""
+
+    def test_unknown_backend(self) -> None:
+        """An unknown QUEUE_BACKEND should fail loudly."""
+        with patch.object(queue, "QUEUE_BACKEND", "kafka"), pytest.raises(ValueError):
+            queue.get_queue_backend()
+
+    def test_metrics_endpoint(self, test_client, fake_redis) -> None:
+        """/metrics/queue should report the list backend's depth."""
+        queue.enqueue_raw_events(["a", "b"])
+
+        response = test_client.get("/metrics/queue")
+
+        assert response.json()["backend"] == "list"
+        assert response.json()["depth"] == 2
@@ -0,0 +1,189 @@
+"""
+Unit tests for the PII redaction engine.
+"""
+
+import random
+import re
+from unittest.mock import patch
+
+import pytest
+
+from app.ai.prompts import redact_pii
+from app.ai.redaction import DEFAULT_RULES, RedactionEngine, RedactionRule
+
+
+def legacy_redact_pii(text: str) -> str:
+    """Four-pass implementation the engine replaced (reference output)."""
+    redacted = text
+    redacted = re.sub(r"\b\d{3}-\d{2}-\d{4}\b", "[SSN-REDACTED]", redacted)
+    redacted = re.sub(r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b", "[CC-REDACTED]", redacted)
+    redacted = re.sub(
+        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "[EMAIL-REDACTED]", redacted
+    )
+    redacted = re.sub(
+        r"\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b",
+        "[PHONE-REDACTED]",
+        redacted,
+    )
+    return redacted
+
+
+SAMPLES = [
+    "",
+    "Schedule a meeting with the team tomorrow at 3pm",
+    "My SSN is 123-45-6789",
+    "Card: 1234 5678 9012 3456, backup 1234-5678-9012-3456 or 1234567890123456",
+    "Contact John at john@example.com or 555-123-4567. SSN: 123-45-6789",
+    "Call (555) 123-4567, +1-555-123-4567, 555.123.4567 or 5551234567",
+    "Emails: user+tag@example.org, user_name@example.co.uk, a.b-c@d.io.",
+    "5551234567@example.com is an address, not a phone",
+    "The code is 12-34-567 and the order is #12345",
+    "Room 101, ext 4567, call 1-800-555-0199 after 9:30",
+    "SSN:123-45-6789;card:1234567890123456;phone:(555)123-4567",
+    "Already [SSN-REDACTED] here plus 987-65-4321",
+    "Unicode café résumé 555-123-4567 naïve",
+]
+
+WORDS = "call the plumber about kitchen sink meeting at 3pm with team email me".split()
+
+
+def transcript(rng: random.Random, words: int) -> str:
+    """Random text with PII tokens separated by at least one ordinary word."""
+    parts = []
+    for _ in range(words):
+        parts.append(rng.choice(WORDS))
+        if rng.random() < 0.2:
+            parts.append(rng.choice(SAMPLES[2:8]))
+    return " ".join(parts)
+
+
+class TestLegacyEquivalence:
+    """The engine must reproduce the previous redact_pii output."""
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_samples_match_legacy(self, text: str) -> None:
+        """Hand-picked inputs should redact identically."""
+        assert redact_pii(text) == legacy_redact_pii(text)
+
+    def test_random_transcripts_match_legacy(self) -> None:
+        """Generated transcripts should redact identically."""
+        rng = random.Random(1234)
+        for _ in range(500):
+            text = transcript(rng, rng.randint(1, 40))
+            assert redact_pii(text) == legacy_redact_pii(text), text
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "id 123 456 7890-1234-5678-9012",
+            "(555) 123-4567 1234 5678 9012 3456",
+            "123-45-67891234 5678 9012 3456",
+            "5551234567 1234567890123456 555-123-4567",
+            "123-45-6789 555-123-4567a@b.com 1234-5678-9012-3456",
+        ],
+    )
+    def test_overlapping_pii_keeps_rule_priority(self, text: str) -> None:
+        """A lower-priority rule must not split a higher-priority match."""
+        assert redact_pii(text) == legacy_redact_pii(text)
+
+    def test_card_is_not_split_by_phone_prefix(self) -> None:
+        """The card rule runs before the phone rule can take its first digits."""
+        assert redact_pii("id 123 456 7890-1234-5678-9012") == "id 123 456 [CC-REDACTED]"
+
+    def test_random_adjacent_pii_matches_legacy(self) -> None:
+        """PII glued together with any separator should redact identically."""
+        rng = random.Random(4321)
+        fragments = SAMPLES[2:8] + ["123", "456", "7890", "1234", "1", "+1", "(555)"]
+        for _ in range(2000):
+            text = "".join(
+                rng.choice(fragments) + rng.choice(["", " ", "-", ".", "a"])
+                for _ in range(rng.randint(1, 6))
+            )
+            assert redact_pii(text) == legacy_redact_pii(text), text
+
+
+class TestSinglePass:
+    """The combined pass must agree with one sequential pass per rule."""
+
+    RULES = [
+        RedactionRule("dig", r"\d{2}", "[D]"),
+        RedactionRule("plus", r"\+\d\d", "[P]"),
+        RedactionRule("dot", r"\.\w", "[O]"),
+    ]
+
+    def sequential(self, text: str) -> str:
+        for rule in self.RULES:
+            text = re.sub(rf"\b(?:{rule.pattern})", rule.replacement, text)
+        return text
+
+    def test_separated_pii_needs_no_fallback(self) -> None:
+        """Isolated matches should be substituted without the per-rule passes."""
+        engine = RedactionEngine(DEFAULT_RULES)
+        text = transcript(random.Random(99), 200)
+
+        with patch.object(engine, "_redact_ordered", side_effect=AssertionError):
+            redacted, count = engine.redact(text)
+
+        assert redacted == legacy_redact_pii(text)
+        assert count == redacted.count("-REDACTED]")
+
+    def test_random_custom_rules_match_sequential(self) -> None:
+        """Touching and overlapping custom-rule matches should redact identically."""
+        engine = RedactionEngine(self.RULES)
+        rng = random.Random(2024)
+        fragments = ["1", "22", "333", "(12)", "+12", ".a", "ab", "a1", " ", "-", "+", "."]
+        for _ in range(3000):
+            text = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 12)))
+            assert engine.redact(text)[0] == self.sequential(text), text
+
+
+class TestRedactionEngine:
+    """Tests for RedactionEngine and its rule registry."""
+
+    def test_counts_redactions_in_same_pass(self) -> None:
+        """The count should equal the number of substitutions made."""
+        engine = RedactionEngine(DEFAULT_RULES)
+        text, count = engine.redact("a@b.com, 123-45-6789 and 555-123-4567")
+        assert text == "[EMAIL-REDACTED], [SSN-REDACTED] and [PHONE-REDACTED]"
+        assert count == 3
+
+    def test_existing_tokens_are_not_counted(self) -> None:
+        """Only new substitutions count, not tokens already in the input."""
+        _, count = RedactionEngine(DEFAULT_RULES).redact("[SSN-REDACTED] 987-65-4321")
+        assert count == 1
+
+    def test_register_custom_rule(self) -> None:
+        """A new PII type should be redacted after the built-in ones."""
+        engine = RedactionEngine(DEFAULT_RULES)
+        engine.register(RedactionRule("mrn", r"MRN\d{8}\b", "[MRN-REDACTED]"))
+
+        text, count = engine.redact("Patient MRN12345678, call 555-123-4567")
+
+        assert text == "Patient [MRN-REDACTED], call [PHONE-REDACTED]"
+        assert count == 2
+        assert [r.name for r in engine.rules][-1] == "mrn"
+
+    def test_earlier_rule_wins_at_same_position(self) -> None:
+        """Registration order decides between matches starting together."""
+        engine = RedactionEngine(
+            [
+                RedactionRule("long", r"\d{6}\b", "[LONG]"),
+                RedactionRule("short", r"\d{3}", "[SHORT]"),
+            ]
+        )
+        assert engine.redact("id 123456")[0] == "id [LONG]"
+
+    def test_duplicate_name_rejected(self) -> None:
+        """Rule names are group names and must be unique."""
+        engine = RedactionEngine(DEFAULT_RULES)
+        with pytest.raises(ValueError):
+            engine.register(RedactionRule("ssn", r"\d{9}\b", "[SSN-REDACTED]"))
+
+    def test_invalid_name_rejected(self) -> None:
+        """Rule names must be valid identifiers."""
+        with pytest.raises(ValueError):
+            RedactionEngine().register(RedactionRule("credit-card", r"\d{16}", "[CC]"))
+
+    def test_empty_engine_is_identity(self) -> None:
+        """With no rules the text should pass through untouched."""
+        assert RedactionEngine().redact("555-123-4567") == ("555-123-4567", 0)
@@ -0,0 +1,171 @@
+"""
+Tests for review queue events (publishing and the SSE stream).
+"""
+
+import json
+from collections.abc import AsyncIterator, Generator
+from unittest.mock import patch
+
+import anyio
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.review_events import (
+    REVIEW_EVENTS_STREAM,
+    iter_review_events,
+    publish_review_events,
+)
+from app.models.raw_event import RawEvent
+from app.models.task_candidate import TaskCandidate
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_server() -> Generator[object, None, None]:
+    """Share one fake server between the sync (publishing) and async (SSE) clients."""
+    server = fakeredis.FakeServer()
+    with patch(
+        "app.core.queue.redis_client", fakeredis.FakeRedis(server=server, decode_responses=True)
+    ):
+        yield server
+
+
+def async_client(server):
+    return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+
+def parse(frame: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return {"id": fields["id"], "event": fields["event"], "data": json.loads(fields["data"])}
+
+
+async def next_event(frames: AsyncIterator[str]) -> dict:
+    # Skips the retry hint and keepalive comments
+    with anyio.fail_after(2):
+        async for frame in frames:
+            if frame.startswith("id: "):
+                return parse(frame)
+    raise AssertionError("stream ended")
+
+
+class TestReviewEventStream:
+    """Tests for publish_review_events and iter_review_events."""
+
+    @pytest.mark.anyio
+    async def test_live_events_are_pushed(self, redis_server) -> None:
+        """An event published while connected should reach the stream."""
+        frames = iter_review_events(async_client(redis_server), keepalive=0.05)
+        try:
+            assert await frames.__anext__() == "retry: 3000\n\n"
+
+            async def publish_later() -> None:
+                await anyio.sleep(0.1)
+                publish_review_events([{"type": "rejected", "candidate_id": "c1"}])
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(publish_later)
+                event = await next_event(frames)
+        finally:
+            await frames.aclose()
+
+        assert event["event"] == "rejected"
+        assert event["data"] == {"candidate_id": "c1"}
+
+    @pytest.mark.anyio
+    async def test_new_connection_starts_at_the_newest_event(self, redis_server) -> None:
+        """Without Last-Event-ID, earlier events should not be replayed."""
+        publish_review_events([{"type": "rejected", "candidate_id": "old"}])
+        frames = iter_review_events(async_client(redis_server), keepalive=0.05)
+        try:
+            await frames.__anext__()
+            publish_review_events([{"type": "rejected", "candidate_id": "new"}])
+            event = await next_event(frames)
+        finally:
+            await frames.aclose()
+
+        assert event["data"]["candidate_id"] == "new"
+
+    @pytest.mark.anyio
+    async def test_resume_from_last_event_id(self, redis_server) -> None:
+        """A reconnect should receive exactly the events after Last-Event-ID."""
+        publish_review_events([{"type": "rejected", "candidate_id": f"c{i}"} for i in range(3)])
+        entries = await async_client(redis_server).xrange(REVIEW_EVENTS_STREAM)
+
+        frames = iter_review_events(async_client(redis_server), entries[0][0], keepalive=0.05)
+        try:
+            events = [await next_event(frames), await next_event(frames)]
+        finally:
+            await frames.aclose()
+
+        assert [e["data"]["candidate_id"] for e in events] == ["c1", "c2"]
+        assert [e["id"] for e in events] == [entries[1][0], entries[2][0]]
+
+    @pytest.mark.anyio
+    async def test_trimmed_position_gets_reset(self, redis_server) -> None:
+        """A Last-Event-ID no longer in the log should produce a reset event."""
+        publish_review_events([{"type": "rejected", "candidate_id": "c1"}])
+        frames = iter_review_events(async_client(redis_server), "1-0", keepalive=0.05)
+        try:
+            event = await next_event(frames)
+        finally:
+            await frames.aclose()
+
+        assert event["event"] == "reset"
+
+    def test_publish_fails_open(self) -> None:
+        """A Redis outage should be logged, not raised."""
+        with patch("app.core.queue.redis_client") as client:
+            client.pipeline.return_value.execute.side_effect = redis.ConnectionError
+            publish_review_events([{"type": "rejected", "candidate_id": "c1"}])
+
+
+class TestReviewEventPublishers:
+    """Tests for the writers that publish review events."""
+
+    def test_worker_publishes_stored_candidates(
+        self, sqlite_session: Session, redis_server
+    ) -> None:
+        """candidate_created should carry the id and fields of the stored row."""
+        from app.core import queue
+        from app.worker import process_event
+
+        event = RawEvent(source="dictation", payload="Call the plumber")
+        sqlite_session.add(event)
+        sqlite_session.commit()
+
+        with patch("app.worker.get_shared_suggester", return_value=None):
+            process_event(sqlite_session, event.id)
+
+        candidate = sqlite_session.query(TaskCandidate).one()
+        ((_, fields),) = queue.redis_client.xrange(REVIEW_EVENTS_STREAM)
+        assert fields["type"] == "candidate_created"
+        data = json.loads(fields["data"])
+        assert data["id"] == candidate.id
+        assert data["title"] == candidate.title
+        assert data["created_at"] == candidate.created_at.isoformat()
+        assert data["ai_metadata"] is None
+
+    def test_approve_and_reject_publish(
+        self, async_sqlite_client: TestClient, sqlite_file_session: Session, redis_server
+    ) -> None:
+        """Review actions should publish approved and rejected events."""
+        from app.core import queue
+
+        for i in range(2):
+            sqlite_file_session.add(TaskCandidate(id=f"c{i}", raw_event_id=f"e{i}", title="t"))
+        sqlite_file_session.commit()
+
+        task_id = async_sqlite_client.post("/api/review/c0/approve").json()["task_id"]
+        async_sqlite_client.post("/api/review/c1/reject")
+
+        events = [
+            (fields["type"], json.loads(fields["data"]))
+            for _, fields in queue.redis_client.xrange(REVIEW_EVENTS_STREAM)
+        ]
+        assert events == [
+            ("approved", {"candidate_id": "c0", "task_id": task_id}),
+            ("rejected", {"candidate_id": "c1"}),
+        ]
@@ -0,0 +1,38 @@
+"""
+Tests for ingest routing.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.routing import needs_processing, parse_routes
+
+
+class TestRouting:
+    """Tests for parse_routes and needs_processing."""
+
+    def test_parse_routes(self) -> None:
+        """Entries should map sources to routes."""
+        assert parse_routes(" dictation:process, slack:store ") == {
+            "dictation": "process",
+            "slack": "store",
+        }
+
+    @pytest.mark.parametrize("spec", ["slack", "slack:drop", ":store"])
+    def test_invalid_entries(self, spec: str) -> None:
+        """Entries without a source or a known route should be rejected."""
+        with pytest.raises(ValueError):
+            parse_routes(spec)
+
+    def test_default_routes(self) -> None:
+        """Only dictation reaches the worker by default; unknown sources do too."""
+        assert needs_processing("dictation") is True
+        assert needs_processing("slack") is False
+        assert needs_processing("manual") is False
+        assert needs_processing("email") is True
+
+    def test_routes_are_configurable(self) -> None:
+        """Changing the table should change the decision."""
+        with patch.dict("app.core.routing.SOURCE_ROUTES", {"slack": "process"}):
+            assert needs_processing("slack") is True
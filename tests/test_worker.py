@@ -0,0 +1,316 @@
+"""
+Tests for the background worker.
+"""
+
+import itertools
+import queue
+import threading
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.raw_event import RawEvent
+from app.models.summary import Summary
+from app.models.task_candidate import TaskCandidate
+
+
+def make_event(session: Session, source: str = "dictation", text: str = "Call the plumber") -> str:
+    event = RawEvent(source=source, payload=text)
+    session.add(event)
+    session.commit()
+    return event.id
+
+
+class TestProcessEvent:
+    """Tests for process_event."""
+
+    def test_stub_path_creates_summary_and_candidate(self, sqlite_session: Session) -> None:
+        """With AI disabled the stub summarizer should produce one candidate."""
+        from app.worker import process_event
+
+        event_id = make_event(sqlite_session)
+
+        with patch("app.worker.get_shared_suggester", return_value=None):
+            process_event(sqlite_session, event_id)
+
+        assert sqlite_session.get(RawEvent, event_id).processed is True
+        assert sqlite_session.query(Summary).count() == 1
+        candidate = sqlite_session.query(TaskCandidate).one()
+        assert candidate.raw_event_id == event_id
+        assert candidate.ai_suggestion_id is None
+
+    def test_non_dictation_marked_processed_without_candidates(
+        self, sqlite_session: Session
+    ) -> None:
+        """Non-dictation events should be marked processed and produce nothing."""
+        from app.worker import process_event
+
+        event_id = make_event(sqlite_session, source="slack", text="{}")
+
+        process_event(sqlite_session, event_id)
+
+        assert sqlite_session.get(RawEvent, event_id).processed is True
+        assert sqlite_session.query(TaskCandidate).count() == 0
+
+    def test_already_processed_event_is_skipped(self, sqlite_session: Session) -> None:
+        """Processing the same event twice should not duplicate candidates."""
+        from app.worker import process_event
+
+        event_id = make_event(sqlite_session)
+
+        with patch("app.worker.get_shared_suggester", return_value=None):
+            process_event(sqlite_session, event_id)
+            process_event(sqlite_session, event_id)
+
+        assert sqlite_session.query(TaskCandidate).count() == 1
+
+    def test_event_claimed_by_another_worker_is_not_built(
+        self, sqlite_session: Session, fake_redis
+    ) -> None:
+        """A second process should skip the event instead of calling the provider too."""
+        from unittest.mock import MagicMock
+
+        from app.core.queue import EVENT_CLAIM_PREFIX
+        from app.worker import process_event
+
+        event_id = make_event(sqlite_session)
+        fake_redis.set(f"{EVENT_CLAIM_PREFIX}{event_id}", 1)
+        suggester = MagicMock()
+
+        with patch("app.worker.get_shared_suggester", return_value=suggester):
+            process_event(sqlite_session, event_id)
+
+        suggester.suggest.assert_not_called()
+        assert sqlite_session.get(RawEvent, event_id).processed is False
+
+    def test_claim_is_released_after_processing(self, sqlite_session: Session, fake_redis) -> None:
+        """The claim should only last while the event is being built and written."""
+        from app.core.queue import EVENT_CLAIM_PREFIX
+        from app.worker import process_batch
+
+        event_ids = [make_event(sqlite_session, text=f"Task {i}") for i in range(2)]
+
+        with patch("app.worker.get_shared_suggester", return_value=None):
+            assert process_batch(sqlite_session, event_ids) == set()
+
+        assert fake_redis.keys(f"{EVENT_CLAIM_PREFIX}*") == []
+        assert sqlite_session.query(TaskCandidate).count() == 2
+
+
+class TestProcessBatch:
+    """Tests for batched processing with per-event failure isolation."""
+
+    def test_batch_processes_all_events_in_one_transaction(self, sqlite_session: Session) -> None:
+        """Every event in the batch should be written and marked processed."""
+        from app.worker import process_batch
+
+        ids = [make_event(sqlite_session, text=f"Task {i}") for i in range(5)]
+        ids.append(make_event(sqlite_session, source="slack", text="{}"))
+
+        with patch("app.worker.get_shared_suggester", return_value=None):
+            failed = process_batch(sqlite_session, ids + ["missing-id"])
+
+        assert failed == set()
+        assert sqlite_session.query(RawEvent).filter(RawEvent.processed.is_(False)).count() == 0
+        assert sqlite_session.query(TaskCandidate).count() == 5
+        assert sqlite_session.query(Summary).count() == 5
+
+    def test_bad_event_does_not_abort_batch(self, sqlite_session: Session) -> None:
+        """A write failure for one event should only fail that event."""
+        from app import worker
+
+        good = make_event(sqlite_session, text="Good task")
+        bad = make_event(sqlite_session, text="Bad task")
+        real_build = worker.build_event_rows
+
+        def build(event, suggester):
+            rows = real_build(event, suggester)
+            if event.id == bad:
+                # Duplicate primary key forces an IntegrityError for this event only
+                rows.candidates = [dict(rows.candidates[0], id="dup") for _ in range(2)]
+            return rows
+
+        with (
+            patch("app.worker.get_shared_suggester", return_value=None),
+            patch("app.worker.build_event_rows", side_effect=build),
+        ):
+            failed = worker.process_batch(sqlite_session, [good, bad])
+
+        assert failed == {bad}
+        assert sqlite_session.get(RawEvent, good).processed is True
+        assert sqlite_session.get(RawEvent, bad).processed is False
+        assert sqlite_session.query(TaskCandidate).one().raw_event_id == good
+
+    def test_build_failure_only_fails_that_event(self, sqlite_session: Session) -> None:
+        """Rows are built outside any transaction, and one error fails one event."""
+        from app import worker
+
+        good = make_event(sqlite_session, text="Good task")
+        bad = make_event(sqlite_session, text="Bad task")
+        real_build = worker.build_event_rows
+        in_transaction: list[bool] = []
+
+        def build(event, suggester):
+            in_transaction.append(sqlite_session.in_transaction())
+            if event.id == bad:
+                raise RuntimeError("provider exploded")
+            return real_build(event, suggester)
+
+        with (
+            patch("app.worker.get_shared_suggester", return_value=None),
+            patch("app.worker.build_event_rows", side_effect=build),
+        ):
+            failed = worker.process_batch(sqlite_session, [good, bad])
+
+        assert failed == {bad}
+        assert in_transaction == [False, False]
+        assert sqlite_session.get(RawEvent, good).processed is True
+        assert sqlite_session.get(RawEvent, bad).processed is False
+
+
+class TestWorkerPool:
+    """Tests for handle_job and the concurrent run_worker loop."""
+
+    def test_handle_job_skips_event_already_in_flight(self) -> None:
+        """A job for an event another thread holds should be dropped."""
+        from app.worker import handle_job, in_flight
+
+        assert in_flight.claim("busy-event")
+        try:
+            with patch("app.worker.process_event") as mock_process:
+                handle_job({"raw_event_id": "busy-event"})
+            mock_process.assert_not_called()
+        finally:
+            in_flight.release("busy-event")
+
+    def test_handle_job_survives_processing_errors(self) -> None:
+        """An exception in process_event should be logged, not propagated."""
+        from app.worker import handle_job, in_flight
+
+        with (
+            patch("app.worker.SessionLocal"),
+            patch("app.worker.process_event", side_effect=RuntimeError("db down")),
+        ):
+            handle_job({"raw_event_id": "event-1"})
+
+        # Claim was released so a retry can proceed
+        assert in_flight.claim("event-1")
+        in_flight.release("event-1")
+
+    def test_idle_loop_does_not_sleep_after_empty_pop(self) -> None:
+        """An empty pop already blocked on Redis, so the loop should poll again at once."""
+        import time
+
+        from app.worker import _worker_loop
+
+        stop = threading.Event()
+        calls = []
+
+        def empty_pop(timeout: int = 2, worker_id: str = "default"):
+            calls.append(time.monotonic())
+            if len(calls) == 3:
+                stop.set()
+            return None
+
+        with patch("app.worker.pop_raw_event", side_effect=empty_pop):
+            _worker_loop(stop, batch_size=1)
+
+        assert calls[-1] - calls[0] < 0.4
+
+    def test_loop_survives_queue_errors(self) -> None:
+        """A Redis error should be logged and backed off, not kill the thread."""
+        import redis
+
+        from app.worker import _worker_loop
+
+        stop = threading.Event()
+        replies = [redis.ConnectionError("redis down"), {"raw_event_id": "event-1"}]
+
+        def flaky_pop(timeout: int = 2, worker_id: str = "default"):
+            reply = replies.pop(0) if replies else None
+            if isinstance(reply, Exception):
+                raise reply
+            if reply is None:
+                stop.set()
+            return reply
+
+        with (
+            patch("app.worker.WORKER_ERROR_BACKOFF", 0),
+            patch("app.worker.pop_raw_event", side_effect=flaky_pop),
+            patch("app.worker.handle_job") as mock_handle,
+        ):
+            _worker_loop(stop, batch_size=1)
+
+        mock_handle.assert_called_once_with({"raw_event_id": "event-1"})
+
+    def test_run_worker_exits_when_every_worker_thread_dies(self) -> None:
+        """Helper threads should not keep a process that no longer consumes alive."""
+        from app.worker import run_worker
+
+        stop = threading.Event()
+        with (
+            # Worker threads that return while stop is still clear
+            patch("app.worker._worker_loop", return_value=None),
+            patch("app.worker.DB_POOL_LOG_INTERVAL", 1),
+            patch("app.worker.get_shared_suggester", return_value=None),
+        ):
+            status = run_worker(concurrency=2, stop=stop)
+
+        assert status == 1
+        assert stop.is_set()
+
+    def test_run_worker_processes_all_jobs_concurrently(self, tmp_path) -> None:
+        """run_worker should drain the queue with several threads and stop cleanly."""
+        from app.worker import run_worker
+
+        # File-backed database: each worker thread gets its own connection
+        engine = create_engine(f"sqlite:///{tmp_path / 'worker.db'}")
+        for model in (RawEvent, Summary, TaskCandidate):
+            model.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        setup = factory()
+        event_ids = [make_event(setup, text=f"Task {i}") for i in range(20)]
+        setup.close()
+
+        jobs: queue.Queue = queue.Queue()
+        for event_id in event_ids:
+            jobs.put({"raw_event_id": event_id})
+        # Duplicate job for the same event must not create a second candidate
+        jobs.put({"raw_event_id": event_ids[0]})
+
+        stop = threading.Event()
+        thread_names: set[str] = set()
+        # The first two jobs are held until both are out, which only happens
+        # if a second thread pops while the first is still waiting
+        overlap = threading.Barrier(2, timeout=5)
+        handed_out = itertools.count()
+
+        def fake_pop(timeout: int = 2, worker_id: str = "default"):
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                stop.set()
+                return None
+            thread_names.add(threading.current_thread().name)
+            if next(handed_out) < 2:
+                try:
+                    overlap.wait()
+                except threading.BrokenBarrierError:
+                    pass
+            return job
+
+        with (
+            patch("app.worker.pop_raw_event", side_effect=fake_pop),
+            patch("app.worker.SessionLocal", factory),
+            patch("app.worker.get_shared_suggester", return_value=None),
+        ):
+            run_worker(concurrency=4, stop=stop)
+
+        check = factory()
+        assert check.query(RawEvent).filter(RawEvent.processed.is_(True)).count() == 20
+        assert check.query(TaskCandidate).count() == 20
+        check.close()
+        engine.dispose()
+        assert not overlap.broken
+        assert len(thread_names) > 1